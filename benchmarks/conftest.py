@@ -0,0 +1,64 @@
+import pytest
+
+from utils.benchmark import BenchmarkRecorder
+from utils.config import set_base_url
+from utils.local_app import LocalAppServer
+from utils.tracing import tracer
+
+BASELINE_FILE = "benchmarks/baseline.json"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-rounds", type=int, default=5,
+        help="Number of measured rounds per flow, after one warm-up round (default: 5)."
+    )
+    group.addoption(
+        "--benchmark-threshold", type=float, default=0.2,
+        help="Fail the run when a flow's median wall time, command count or memory exceeds "
+             "its baseline by more than this fraction (default: 0.2)."
+    )
+    group.addoption(
+        "--benchmark-baseline", default=BASELINE_FILE,
+        help=f"Baseline file to compare with (default: {BASELINE_FILE})."
+    )
+    group.addoption(
+        "--benchmark-save", action="store_true", default=False,
+        help="Store the medians of this run as the new baseline instead of comparing."
+    )
+    group.addoption(
+        "--benchmark-bootstrap", action="store_true", default=False,
+        help="Add the flows and metrics that have no baseline yet to the baseline instead of failing; "
+             "everything else is still compared."
+    )
+
+
+def pytest_configure(config):
+    # Spans count the WebDriver commands of every round
+    tracer.enable()
+    config.pluginmanager.register(
+        BenchmarkRecorder(
+            config.rootpath / config.getoption("--benchmark-baseline"),
+            config.getoption("--benchmark-threshold"),
+            config.getoption("--benchmark-save"),
+            config.getoption("--benchmark-bootstrap"),
+        ),
+        "benchmark_recorder",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_base_url():
+    """
+    Benchmarks always run against the bundled local app, so network latency does not skew them.
+    """
+    server = LocalAppServer().start()
+    set_base_url(server.url)
+    yield server.url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request):
+    return request.config.pluginmanager.get_plugin("benchmark_recorder")
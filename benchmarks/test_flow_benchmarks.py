@@ -0,0 +1,40 @@
+import pytest
+import allure
+
+from utils.driver_pool import reset_session
+from utils.flows import FLOWS
+from utils.session_seeder import SessionSeeder
+from utils.tracing import tracer
+
+
+@pytest.mark.benchmark
+@allure.epic("Performance")
+@allure.feature("Page Object Benchmarks")
+class TestFlowBenchmarks:
+
+    @allure.title("Benchmark flow: {flow_name}")
+    @pytest.mark.parametrize("flow_name", list(FLOWS))
+    def test_flow(self, flow_name, driver, app_base_url, benchmark_recorder, request):
+        """
+        Runs a core flow once to warm up, then measures wall time, WebDriver commands and the browser's RSS per round.
+        """
+        flow = FLOWS[flow_name]
+        seeder = SessionSeeder(driver, app_base_url)
+        result = benchmark_recorder.result(flow_name)
+        watchdog = request.config.pluginmanager.get_plugin("browser_watchdog")
+
+        flow.run(seeder)
+        for _ in range(request.config.getoption("--benchmark-rounds")):
+            reset_session(driver)
+            with tracer.span(f"flow {flow_name}", "flow") as span:
+                flow.run(seeder)
+            result.wall_ms.append(span.duration / 1e6)
+            result.commands.append(span.commands)
+            # Resident memory of chromedriver, Chrome and its renderers, not just the page's JavaScript heap
+            rss = watchdog.rss(driver)
+            if rss is None:
+                benchmark_recorder.skip_metric(
+                    "rss_kib", "the browser's processes cannot be measured (no /proc; install psutil)"
+                )
+            else:
+                result.rss_kib.append(rss / 1024)
@@ -1,62 +1,658 @@
+import argparse
+import json
 import os
 import pytest
 import allure
 from allure_commons.types import AttachmentType
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+from utils.artifacts import ArtifactPipeline
+from utils.backend import DomBackend
+from utils.browser_profile import LEAN, PROFILE_METRICS_FILE, PROFILES, ProfileReport, drain_transferred_bytes
+from utils.combinatorial import CASE_SETS
+from utils.config import get_base_url, set_base_url
+from utils.driver_factory import create_chrome_driver
+from utils.driver_pool import DriverPool
+from utils.distributed import Coordinator, Worker
+from utils.driver_resolver import resolve_chromedriver
+from utils.element_cache import ElementCache
+from utils.flaky import FLAKY_HISTORY_FILE, FlakyTracker, load_history, quarantined_tests
+from utils.impact import ImpactGraph, item_nodes, select_tests, verify_ref
+from utils.local_app import LocalAppServer
+from utils.logger import LOG_LEVEL_ENV, configure_logging, set_log_context, stop_logging
+from utils.page_metrics import NO_THROTTLING, THROTTLING_PROFILES, apply_throttling, check_budgets, page_metrics
+from utils.results_store import ResultsStore, StoreFileLogger
+from utils.retry import step_retries
+from utils.session_seeder import SessionSeeder
+from utils.tracing import tracer
+from utils.transport import transport_stats
+from utils.visual import BASELINE_DIR, visual
+from utils.watchdog import BrowserWatchdog
+from utils.parallel import DURATIONS_FILE, WORKER_ENV, DurationRecorder, load_durations, lpt_shards, run_shards, strip_option
+
+driver_resolution_key = pytest.StashKey()
+artifact_pipeline_key = pytest.StashKey()
+impact_selection_key = pytest.StashKey()
+results_store_key = pytest.StashKey()
+quarantine_key = pytest.StashKey()
+case_sets_key = pytest.StashKey()
+worker_results_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("browser")
+    group.addoption(
+        "--pool-size", type=int, default=2,
+        help="Number of browser sessions kept warm by the driver pool (default: 2)."
+    )
+    group.addoption(
+        "--pool-max-uses", type=int, default=25,
+        help="Number of tests a pooled browser session serves before it is replaced (default: 25)."
+    )
+    group.addoption(
+        "--chromedriver-path", default=None,
+        help="Use this local chromedriver binary instead of resolving one (works offline). "
+             "Defaults to the CHROMEDRIVER_PATH environment variable."
+    )
+    group.addoption(
+        "--browser-profile", choices=sorted(PROFILES), default="full",
+        help="Browser profile: 'full' (headed, maximized, loads everything) or 'lean' "
+             "(headless, fixed viewport, images/fonts/analytics blocked). Default: full."
+    )
+    group.addoption(
+        "--profile-metrics", action="store_true", default=False,
+        help=f"Record each test's time and downloaded bytes in {PROFILE_METRICS_FILE} "
+             f"(always on with --browser-profile=lean)."
+    )
+    group.addoption(
+        "--backend", choices=("selenium", "dom"), default="selenium",
+        help="'dom' runs tests marked `browserless` in the in-process DOM backend against the bundled replica "
+             "(whatever --app-url says) and everything else in Chrome; 'selenium' runs every test in Chrome "
+             "against the shop under test. Default: selenium."
+    )
+
+    group = parser.getgroup("watchdog")
+    group.addoption(
+        "--browser-max-rss", type=int, default=2048,
+        help="Recycle a browser session whose process tree uses more than this many MiB of memory; "
+             "0 disables the cap (default: 2048)."
+    )
+    group.addoption(
+        "--browser-max-cpu", type=float, default=200,
+        help="Recycle a browser session whose process tree stays above this CPU usage (percent of one core) "
+             "for several samples; 0 disables the cap (default: 200)."
+    )
+    group.addoption(
+        "--watchdog-interval", type=float, default=1.0,
+        help="Seconds between two samples of the browser processes (default: 1.0)."
+    )
+
+    group = parser.getgroup("application")
+    group.addoption(
+        "--app-url", default=None,
+        help="Base URL of the shop under test. Defaults to the SAUCEDEMO_BASE_URL environment variable "
+             "or https://www.saucedemo.com/."
+    )
+    group.addoption(
+        "--local-app", action="store_true", default=False,
+        help="Serve the bundled replica of the shop on an ephemeral local port and test against it."
+    )
+
+    group = parser.getgroup("logging")
+    group.addoption(
+        "--page-log-level", default=None, type=str.upper,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help=f"Level of the page object and helper loggers. Defaults to the {LOG_LEVEL_ENV} "
+             "environment variable or INFO; WARNING skips the per-action messages entirely."
+    )
+    group.addoption(
+        "--json-log-dir", default="logs",
+        help="Directory for the structured JSON lines log, one file per worker (default: logs)."
+    )
+
+    group = parser.getgroup("allure")
+    group.addoption(
+        "--results-store", default=None, metavar="DIR",
+        help="Write Allure results into a content-addressed store in DIR (deduplicated, large text "
+             "gzip-compressed) and export only new or changed files to --alluredir at the end of the run."
+    )
+
+    group = parser.getgroup("page metrics")
+    group.addoption(
+        "--page-metrics", action="store_true", default=False,
+        help="Collect Navigation Timing, paint/LCP and resource metrics after every page load and attach "
+             "them to Allure. Always on for tests marked with latency_budget."
+    )
+    group.addoption(
+        "--throttling", choices=sorted(THROTTLING_PROFILES), default="none",
+        help="Network and CPU throttling profile emulated through CDP for every browser test, unless its "
+             "latency_budget marker names another one (default: none)."
+    )
+
+    group = parser.getgroup("visual")
+    group.addoption(
+        "--visual-baselines", default=BASELINE_DIR,
+        help=f"Directory of the baseline screenshots, one subdirectory per browser profile (default: {BASELINE_DIR})."
+    )
+    group.addoption(
+        "--update-visual-baselines", action="store_true", default=False,
+        help="Store the current screenshots as the new baselines instead of comparing."
+    )
+    group.addoption(
+        "--visual-threshold", type=float, default=0.1,
+        help="Perceptual color difference (0-1) from which a pixel counts as changed (default: 0.1)."
+    )
+    group.addoption(
+        "--visual-max-diff", type=float, default=0.001,
+        help="Share of changed pixels from which a visual check fails (default: 0.001)."
+    )
+
+    group = parser.getgroup("tracing")
+    group.addoption(
+        "--trace-file", default=None,
+        help="Record timed spans of every page object method and BasePage primitive and write them to this "
+             "file as Chrome trace-event JSON (one file per worker). Prints p50/p95/max per method."
+    )
+
+    group.addoption(
+        "--command-stats", action="store_true", default=False,
+        help="Attach the WebDriver commands, bytes and round-trip time of every test to Allure and print the "
+             "chattiest page object methods and tests."
+    )
+
+    group = parser.getgroup("selection")
+    group.addoption(
+        "--changed-since", default=None, metavar="REF",
+        help="Run only the tests whose code (test, fixtures, page objects, utils) changed since "
+             "this git ref, including uncommitted changes."
+    )
+
+    group = parser.getgroup("flaky")
+    group.addoption(
+        "--quarantine", choices=["include", "exclude", "only"], default="include",
+        help="What to do with the tests the failure history marks as flaky: run them as usual (include), "
+             "leave them out (exclude) or run only them (only). Default: include."
+    )
+    group.addoption(
+        "--flaky-history", default=FLAKY_HISTORY_FILE,
+        help=f"File with the recent results of every test (default: {FLAKY_HISTORY_FILE})."
+    )
+    group.addoption(
+        "--flaky-threshold", type=float, default=0.2,
+        help="Share of failed or retried recent runs from which a test that also passes is quarantined (default: 0.2)."
+    )
+
+    group = parser.getgroup("parallel")
+    group.addoption(
+        "--workers", type=int, default=1,
+        help="Run the suite on this many worker processes, balanced by recorded test durations (default: 1)."
+    )
+    group.addoption(
+        "--coordinator", default=None, metavar="HOST:PORT",
+        help="Serve the collected tests to distributed workers on this address (port 0 picks a free one)."
+    )
+    group.addoption(
+        "--connect", default=None, metavar="HOST:PORT",
+        help="Run as a distributed worker: pull tests from the coordinator at this address."
+    )
+    group.addoption(
+        "--spawn-workers", type=int, default=0,
+        help="With --coordinator, also start this many local workers (default: 0)."
+    )
+    group.addoption(
+        "--coordinator-timeout", type=float, default=300.0,
+        help="Seconds the coordinator waits without any connected worker before failing the "
+             "remaining tests (default: 300)."
+    )
+    group.addoption("--shard-file", default=None, help=argparse.SUPPRESS)
+    group.addoption("--shard-result", default=None, help=argparse.SUPPRESS)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    if config.getoption("--backend") == "dom" and not DomBackend.available():
+        raise pytest.UsageError("--backend=dom needs mini-racer: pip install mini-racer")
+    if config.getoption("--changed-since"):
+        try:
+            verify_ref(config.rootpath, config.getoption("--changed-since"))
+        except ValueError as e:
+            raise pytest.UsageError(f"--changed-since: {e}")
+    distributed = config.getoption("--coordinator") or config.getoption("--connect")
+    if distributed and config.getoption("--workers") > 1:
+        raise pytest.UsageError("--workers cannot be combined with --coordinator or --connect")
+    configure_logging(
+        config.getoption("--page-log-level"),
+        config.rootpath / config.getoption("--json-log-dir") / f"worker-{os.environ.get(WORKER_ENV, 'main')}.jsonl",
+    )
+    listener = config.pluginmanager.get_plugin("allure_listener")
+    if listener is not None and config.getoption("--results-store") and not config.getoption("--connect"):
+        # Distributed workers stream their files to the coordinator; --workers shards share the
+        # parent's store and only append to its manifest, which the parent resets and exports
+        store = ResultsStore(config.rootpath / config.getoption("--results-store"))
+        if config.option.clean_alluredir and not config.getoption("--shard-file"):
+            store.reset_manifest()
+        config.stash[results_store_key] = StoreFileLogger(store).install()
+    if config.getoption("--coordinator"):
+        config.pluginmanager.register(
+            Coordinator(
+                config, config.getoption("--coordinator"), config.getoption("--spawn-workers"),
+                config.getoption("--coordinator-timeout"), load_durations(config.rootpath / DURATIONS_FILE),
+                config.stash.get(results_store_key, None),
+            ),
+            "coordinator",
+        )
+    if config.getoption("--connect"):
+        # Durations are recorded by the coordinator, which receives every report
+        config.pluginmanager.register(Worker(config, config.getoption("--connect")), "distributed_worker")
+    else:
+        config.pluginmanager.register(
+            DurationRecorder(config.rootpath / DURATIONS_FILE, config.getoption("--shard-result"),
+                             partial(config.hook.pytest_report_to_serializable, config=config)),
+            "duration_recorder",
+        )
+    if not config.getoption("--connect") and not config.getoption("--shard-file"):
+        # The coordinator or parent process records the history for its workers
+        config.pluginmanager.register(FlakyTracker(config, config.rootpath / config.getoption("--flaky-history")),
+                                      "flaky_tracker")
+    config.pluginmanager.register(
+        BrowserWatchdog(
+            config.getoption("--browser-max-rss"), config.getoption("--browser-max-cpu"),
+            config.getoption("--watchdog-interval"),
+        ),
+        "browser_watchdog",
+    )
+    config.pluginmanager.register(
+        ProfileReport(
+            PROFILES[config.getoption("--browser-profile")], config.rootpath / PROFILE_METRICS_FILE,
+            config.getoption("--profile-metrics") or config.getoption("--browser-profile") == LEAN.name,
+            os.environ.get(WORKER_ENV),
+        ),
+        "profile_report",
+    )
+    visual.configure(
+        config.rootpath / config.getoption("--visual-baselines") / config.getoption("--browser-profile"),
+        config.getoption("--update-visual-baselines"),
+        config.getoption("--visual-threshold"),
+        config.getoption("--visual-max-diff"),
+    )
+    if config.getoption("--trace-file") or config.getoption("--command-stats"):
+        # Open page object spans tell the transport which method sent a command
+        tracer.enable()
+    listener = config.pluginmanager.get_plugin("allure_listener")
+    config.stash[artifact_pipeline_key] = ArtifactPipeline(listener.allure_logger if listener else None)
+
+
+def pytest_unconfigure(config):
+    pipeline = config.stash.get(artifact_pipeline_key, None)
+    if pipeline is not None:
+        pipeline.shutdown()
+    store_logger = config.stash.get(results_store_key, None)
+    if store_logger is not None:
+        store_logger.uninstall()
+        if not config.getoption("--shard-file"):
+            store_logger.store.export(Path(config.invocation_params.dir, config.option.allure_report_dir),
+                                      clean=config.option.clean_alluredir)
+    stop_logging()
+
+
+def pytest_runtest_logstart(nodeid, location):
+    set_log_context(nodeid)
+    tracer.test_id = nodeid
+    step_retries.reset()
+    transport_stats.start_test(nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    set_log_context(None)
+    tracer.test_id = None
+    transport_stats.stop_test()
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Deselects the tests not affected by `--changed-since`, applies `--quarantine` and restricts a worker process
+    to the tests of its shard.
+    """
+    ref = config.getoption("--changed-since")
+    if ref:
+        graph = ImpactGraph(config.rootpath)
+        selected = select_tests(graph, ref, {item.nodeid: item_nodes(item, graph) for item in items})
+        config.stash[impact_selection_key] = (ref, len(items), selected)
+        if selected is not None:
+            deselected = [item for item in items if item.nodeid not in selected]
+            items[:] = [item for item in items if item.nodeid in selected]
+            config.hook.pytest_deselected(items=deselected)
+
+    quarantine = config.getoption("--quarantine")
+    shard_file = config.getoption("--shard-file")
+    if quarantine != "include" and not shard_file:
+        history = load_history(config.rootpath / config.getoption("--flaky-history"))
+        flaky = quarantined_tests(history, config.getoption("--flaky-threshold"))
+        config.stash[quarantine_key] = (quarantine, flaky)
+        keep = (lambda item: item.nodeid not in flaky) if quarantine == "exclude" else (lambda item: item.nodeid in flaky)
+        deselected = [item for item in items if not keep(item)]
+        if deselected:
+            items[:] = [item for item in items if keep(item)]
+            config.hook.pytest_deselected(items=deselected)
+
+    if not shard_file:
+        return
+    with open(shard_file, encoding="utf-8") as f:
+        shard = set(json.load(f))
+    deselected = [item for item in items if item.nodeid not in shard]
+    if deselected:
+        items[:] = [item for item in items if item.nodeid in shard]
+        config.hook.pytest_deselected(items=deselected)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """
+    Distributes the collected tests over worker processes when `--workers` is greater than 1.
+
+    The workers' reports are replayed here, as if the tests had run in this process, so the
+    terminal summary, the exit status, the durations and the flaky history cover them.
+    """
+    config = session.config
+    workers = config.getoption("--workers")
+    if workers <= 1 or config.getoption("--shard-file") or config.option.collectonly or not session.items:
+        return None
+
+    recorder = config.pluginmanager.get_plugin("duration_recorder")
+    shards = lpt_shards([item.nodeid for item in session.items], load_durations(recorder.durations_file), workers)
+    args = strip_option(list(config.invocation_params.args), "--workers")
+    args = strip_option(args, "--clean-alluredir", takes_value=False)
+    results = run_shards(shards, args, config.invocation_params.dir, config.getoption("--alluredir"))
+
+    for result in results:
+        failed = False
+        for data in result["reports"]:
+            report = config.hook.pytest_report_from_serializable(config=config, data=data)
+            report.location = tuple(report.location)
+            if report.when == "setup":
+                config.hook.pytest_runtest_logstart(nodeid=report.nodeid, location=report.location)
+            config.hook.pytest_runtest_logreport(report=report)
+            if report.when == "teardown":
+                config.hook.pytest_runtest_logfinish(nodeid=report.nodeid, location=report.location)
+            failed = failed or report.failed
+        if result["exit_code"] not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED) and not failed:
+            # The worker died without reporting a failure, e.g. in a session fixture
+            session.testsfailed += 1
+    config.stash[worker_results_key] = results
+    return True
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_base_url(request):
+    """
+    Points the page objects at the shop under test, starting the bundled local app if requested.
+    """
+    if request.config.getoption("--local-app"):
+        server = LocalAppServer().start()
+        set_base_url(server.url)
+        yield server.url
+        server.stop()
+        return
+
+    if request.config.getoption("--app-url"):
+        set_base_url(request.config.getoption("--app-url"))
+    yield get_base_url()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def page_trace(request):
+    """
+    Exports the recorded spans at the end of the session and attaches the latency summary to Allure.
+    """
+    yield tracer
+    trace_file = request.config.getoption("--trace-file")
+    if not trace_file or not tracer.enabled or not tracer.spans:
+        return
+    worker = os.environ.get(WORKER_ENV)
+    if worker is not None:
+        root, extension = os.path.splitext(trace_file)
+        trace_file = f"{root}.worker-{worker}{extension}"
+    tracer.export_chrome_trace(request.config.rootpath / trace_file)
+    allure.attach(tracer.format_summary(), name="page action latency", attachment_type=AttachmentType.TEXT)
+    allure.attach(json.dumps(tracer.summary(), indent=2), name="page action latency (json)",
+                  attachment_type=AttachmentType.JSON)
+
+
+@pytest.fixture(scope="session")
+def chromedriver_path(request):
+    """
+    Resolves the chromedriver executable once per session.
+    """
+    resolution = resolve_chromedriver(request.config.getoption("--chromedriver-path"))
+    request.config.stash[driver_resolution_key] = resolution
+    return resolution.path
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, chromedriver_path):
+    """
+    Session-wide pool of warm browser sessions shared by the `driver` fixture.
+    """
+    profile_report = request.config.pluginmanager.get_plugin("profile_report")
+    pool = DriverPool(
+        partial(create_chrome_driver, chromedriver_path, profile_report.profile, profile_report.measure),
+        size=request.config.getoption("--pool-size"),
+        max_uses=request.config.getoption("--pool-max-uses"),
+        watchdog=request.config.pluginmanager.get_plugin("browser_watchdog"),
+    ).start()
+    yield pool
+    pool.close()
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(request):
     """
-    Pytest fixture to initialize and quit WebDriver for each test function.
+    Pytest fixture that provides a clean WebDriver session for each test function.
+
+    Sessions come from the warm `driver_pool`. Tests marked with `fresh_browser`
+    get a dedicated browser process that is quit after the test. Tests marked with
+    `browserless` run against the bundled app in the in-process DOM backend with `--backend=dom`.
     """
-    chrome_options = ChromeOptions()
-    chrome_options.add_experimental_option(
-        "prefs", {"credentials_enable_service": False, "profile.password_manager_enabled": False}
-    )
+    if _runs_browserless(request):
+        driver = DomBackend()
+        yield driver
+        driver.quit()
+        return
 
-    base_driver_path = ChromeDriverManager().install()
-    # Correct the path if it points to THIRD_PARTY_NOTICES.chromedriver
-    if "THIRD_PARTY_NOTICES.chromedriver" in base_driver_path:
-        driver_dir = os.path.dirname(base_driver_path)
-        driver_executable_path = os.path.join(driver_dir, "chromedriver")
-    else:
-        driver_executable_path = base_driver_path
+    profile_report = request.config.pluginmanager.get_plugin("profile_report")
+    watchdog = request.config.pluginmanager.get_plugin("browser_watchdog")
+    if request.node.get_closest_marker("fresh_browser"):
+        driver = create_chrome_driver(request.getfixturevalue("chromedriver_path"), profile_report.profile,
+                                      profile_report.measure)
+        watchdog.track(driver)
+        watchdog.start_test(driver)
+        yield driver
+        try:
+            watchdog.stop_test(request.node.nodeid, driver)
+            if profile_report.measure:
+                profile_report.record_bytes(request.node.nodeid, drain_transferred_bytes(driver))
+        finally:
+            try:
+                driver.quit()
+            finally:
+                watchdog.untrack(driver)
+        return
 
-    print(f"DEBUG: Using driver executable path: {driver_executable_path}")
-    service = ChromeService(executable_path=driver_executable_path)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.implicitly_wait(5)  # Implicit wait
-    driver.maximize_window()
+    pool = request.getfixturevalue("driver_pool")
+    driver = pool.acquire()
+    if profile_report.measure:
+        # Drops what the previous test left in the log
+        drain_transferred_bytes(driver)
+    watchdog.start_test(driver)
     yield driver
-    driver.quit()
+    try:
+        watchdog.stop_test(request.node.nodeid, driver)
+        if profile_report.measure:
+            profile_report.record_bytes(request.node.nodeid, drain_transferred_bytes(driver))
+    finally:
+        # A session that died during the test is replaced by the pool, so the slot is never lost
+        pool.release(driver)
+
+
+def _runs_browserless(request) -> bool:
+    return request.config.getoption("--backend") == "dom" and request.node.get_closest_marker("browserless") is not None
+
+
+@pytest.fixture(scope="function", autouse=True)
+def page_performance(request):
+    """
+    Applies the throttling profile and collects page load metrics for tests that use the browser.
+    """
+    marker = request.node.get_closest_marker("latency_budget")
+    if "driver" not in request.fixturenames or _runs_browserless(request):
+        # The DOM backend has no network to throttle and no paint to time
+        page_metrics.start_test(False, NO_THROTTLING)
+        yield page_metrics
+        return
+    throttling = request.config.getoption("--throttling")
+    if marker is not None:
+        throttling = marker.kwargs.get("throttling", throttling)
+    if throttling not in THROTTLING_PROFILES:
+        raise pytest.UsageError(f"Unknown throttling profile '{throttling}' in {request.node.nodeid}")
+    profile = THROTTLING_PROFILES[throttling]
+    driver = request.getfixturevalue("driver")
+    if profile is not NO_THROTTLING:
+        apply_throttling(driver, profile)
+    page_metrics.start_test(request.config.getoption("--page-metrics") or marker is not None, profile)
+    yield page_metrics
+    page_metrics.start_test(False, NO_THROTTLING)
+    if profile is not NO_THROTTLING:
+        # Pooled sessions serve the next test unthrottled
+        apply_throttling(driver, NO_THROTTLING)
+
+
+def pytest_runtest_setup(item):
+    """
+    Skips visual tests under another browser profile than their baselines, or before any are recorded.
+    """
+    marker = item.get_closest_marker("visual_baselines")
+    if marker is None:
+        return
+    profile, = marker.args
+    if item.config.getoption("--browser-profile") != profile:
+        pytest.skip(f"visual baselines are recorded with --browser-profile={profile}")
+    if not visual.update and not visual.baseline_dir.is_dir():
+        pytest.skip(f"no visual baselines in {visual.baseline_dir}; record them with --update-visual-baselines")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Attaches the page metrics (and WebDriver command counters) of a test to Allure and fails it when a page
+    exceeded its `latency_budget`.
+    """
+    try:
+        result = yield
+    finally:
+        if page_metrics.measurements:
+            allure.attach(json.dumps(page_metrics.measurements, indent=2), name="page metrics",
+                          attachment_type=AttachmentType.JSON)
+        if item.config.getoption("--command-stats") and transport_stats.test.commands:
+            allure.attach(json.dumps(transport_stats.test.as_dict(), indent=2), name="webdriver commands",
+                          attachment_type=AttachmentType.JSON)
+    marker = item.get_closest_marker("latency_budget")
+    if marker is not None:
+        page, = marker.args
+        budgets = {metric: limit for metric, limit in marker.kwargs.items() if metric != "throttling"}
+        violations = check_budgets(page_metrics.measurements, page, budgets)
+        if violations:
+            raise AssertionError(f"Latency budget check failed under '{page_metrics.throttling.name}' throttling:\n"
+                                 + "\n".join(violations))
+    return result
+
+
+@pytest.fixture(scope="function")
+def session_seeder(driver, app_base_url):
+    """
+    Opens application pages in a logged-in state without going through the login UI.
+    """
+    return SessionSeeder(driver, app_base_url)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Hook to take screenshot on test failure and attach to Allure report.
+    Hook to capture failure artifacts (screenshot, page source, URL, console log, cookies) and attach them to Allure.
+
+    Only the capture runs here; encoding and writing the attachments happen in the background.
+    The number of retried page object steps is added to the report for the flaky-test tracker.
     """
     # Execute all other hooks to obtain the report object
     outcome = yield
     report = outcome.get_result()
 
+    marker = item.get_closest_marker("combinatorial")
+    if report.when == 'setup' and marker is not None:
+        item.config.stash.setdefault(case_sets_key, set()).add(marker.args[0])
+
+    if report.when == 'call' and step_retries.count:
+        report.user_properties.append(("step_retries", step_retries.count))
+
     if report.when == 'call' and report.failed:
         try:
             # Access the 'driver' fixture from the test item
             driver_instance = item.funcargs['driver']
             # Create a unique name for the screenshot
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            screenshot_name = f"failed_test_{item.name}_{timestamp}.png"
-            # Take screenshot and attach to Allure
-            allure.attach(
-                driver_instance.get_screenshot_as_png(),
-                name=screenshot_name,
-                attachment_type=AttachmentType.PNG
-            )
+            screenshot_name = f"failed_test_{item.name}_{timestamp}"
+            pipeline = item.config.stash[artifact_pipeline_key]
+            pipeline.submit(pipeline.capture(driver_instance, screenshot_name))
         except Exception as e:
-            print(f"Failed to take screenshot: {e}")
+            print(f"Failed to capture failure artifacts: {e}")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Reports the exit code and log of every `--workers` process, how many tests `--changed-since` selected,
+    which tests are quarantined, how many cases the pairwise test data saved, where chromedriver came from, how long resolving it took, how effective the element cache was
+    and, with `--trace-file`, the latency of every traced page object method. `--command-stats` adds the
+    chattiest page object methods and tests.
+    """
+    for result in config.stash.get(worker_results_key, []):
+        terminalreporter.write_line(f"worker {result['worker']}: exit code {result['exit_code']}, log: {result['log']}")
+    impact = config.stash.get(impact_selection_key, None)
+    if impact is not None:
+        ref, total, selected = impact
+        if selected is None:
+            terminalreporter.write_line(f"impact selection: changes since {ref} affect every test")
+        else:
+            terminalreporter.write_line(f"impact selection: {len(selected)} of {total} test(s) affected by changes since {ref}")
+    quarantine = config.stash.get(quarantine_key, None)
+    if quarantine is not None:
+        mode, flaky = quarantine
+        action = "excluded from this run" if mode == "exclude" else "run on their own"
+        terminalreporter.write_line(f"flaky quarantine: {len(flaky)} test(s) {action}")
+        for nodeid, share in sorted(flaky.items(), key=lambda entry: entry[1], reverse=True):
+            terminalreporter.write_line(f"  {nodeid} (unstable in {share:.0%} of recent runs)")
+    ran = config.stash.get(case_sets_key, set())
+    for case_set in (case_set for name, case_set in CASE_SETS.items() if name in ran):
+        terminalreporter.write_line(
+            f"combinatorial data '{case_set.name}': {len(case_set.cases)} of {case_set.full_size} case(s) "
+            f"({case_set.strength}-wise, {case_set.reduction:.0%} fewer than all combinations)"
+        )
+    resolution = config.stash.get(driver_resolution_key, None)
+    if resolution is not None:
+        terminalreporter.write_line(
+            f"chromedriver resolved from {resolution.source} in {resolution.elapsed:.3f}s: {resolution.path}"
+        )
+    cache = ElementCache.totals
+    if cache["hits"] or cache["misses"]:
+        terminalreporter.write_line(
+            f"element cache: {cache['hits']} hits, {cache['misses']} misses, {cache['stale']} stale "
+            f"({cache['hits']} element lookups saved)"
+        )
+    if tracer.enabled and tracer.spans:
+        terminalreporter.section("page action latency")
+        for line in tracer.format_summary().splitlines():
+            terminalreporter.write_line(line)
+    if config.getoption("--command-stats") and transport_stats.by_test:
+        terminalreporter.section("webdriver commands")
+        for line in transport_stats.format_summary().splitlines():
+            terminalreporter.write_line(line)
@@ -2,7 +2,7 @@ from selenium.webdriver.common.by import By
 from utils.base_page import BasePage
 from utils.logger import get_logger
 import allure
-from selenium.webdriver.support import expected_conditions as EC
+from utils import dom_wait as EC
 
 logger = get_logger(__name__)
 
@@ -14,12 +14,20 @@ class CartPage(BasePage):
     # Locators
     CART_ITEMS = (By.CLASS_NAME, "cart_item")
     CHECKOUT_BUTTON = (By.ID, "checkout")
+    CATALOG_SELECTORS = (".cart_list", ".cart_item")
 
     def get_remove_button_for_item(self, item_name: str):
         """Returns the locator for the 'Remove' button of a specific item in the cart."""
-        # Convert item name to a slug format, e.g., "Sauce Labs Backpack" -> "remove-sauce-labs-backpack"
-        data_test_value = f"remove-{item_name.lower().replace(' ', '-')}"
-        return (By.CSS_SELECTOR, f"[data-test='{data_test_value}']")
+        return self.catalog.item(item_name).button_locator(in_cart=True)
+
+    @allure.step("Get the price of item '{item_name}' in the cart")
+    def get_item_price(self, item_name: str) -> float:
+        """
+        Gets the price of a specific item in the cart.
+        """
+        price = self.catalog.item(item_name).price
+        logger.info("Price of item '%s' in the cart is %.2f", item_name, price)
+        return price
 
     @allure.step("Get the number of items in the cart")
     def get_cart_items_count(self) -> int:
@@ -27,26 +35,35 @@ class CartPage(BasePage):
         Counts the number of items listed in the cart.
         """
         logger.info("Getting number of items in the cart")
-        try:
-            items = self.find_elements(*self.CART_ITEMS)
-            count = len(items)
-            logger.info(f"Found {count} items in the cart")
-            return count
-        except Exception:
-            logger.info("No items found in the cart")
-            return 0
+        # An empty cart still renders its list, so no wait for a first item is needed
+        count = len(self.catalog.items)
+        logger.info("Found %s items in the cart", count)
+        return count
 
     @allure.step("Remove item '{item_name}' from the cart")
     def remove_item(self, item_name: str):
         """
         Clicks the 'Remove' button for a specific item in the cart.
         """
-        logger.info(f"Removing item '{item_name}' from the cart")
+        logger.info("Removing item '%s' from the cart", item_name)
         button_locator = self.get_remove_button_for_item(item_name)
         self.js_click(*button_locator)
-        logger.info(f"Clicked 'Remove' for item '{item_name}'")
+        self.catalog.invalidate()
+        logger.info("Clicked 'Remove' for item '%s'", item_name)
         return self
 
+    @allure.step("Remove items {item_names} from the cart")
+    def remove_items(self, item_names: list[str]) -> dict:
+        """
+        Removes several items from the cart in a single browser round-trip.
+        Returns a mapping of item name to result; raises TimeoutException if an item is missing.
+        """
+        logger.info("Removing items %s from the cart", item_names)
+        results = self.click_item_buttons(item_names, ".cart_item", "Remove", None)
+        self.catalog.invalidate()
+        logger.info("Removed %s item(s) from the cart", len(results))
+        return {name: "removed" for name in results}
+
     @allure.step("Proceed to checkout")
     def go_to_checkout(self):
         """
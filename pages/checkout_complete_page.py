@@ -21,7 +21,7 @@ class CheckoutCompletePage(BasePage):
         """
         logger.info("Getting checkout complete page title")
         title = self.get_text(*self.PAGE_TITLE)
-        logger.info(f"Checkout complete page title is: '{title}'")
+        logger.info("Checkout complete page title is: '%s'", title)
         return title
 
     @allure.step("Get completion message header")
@@ -31,5 +31,5 @@ class CheckoutCompletePage(BasePage):
         """
         logger.info("Getting checkout completion header text")
         header_text = self.get_text(*self.COMPLETE_HEADER)
-        logger.info(f"Completion header text is: '{header_text}'")
+        logger.info("Completion header text is: '%s'", header_text)
         return header_text
@@ -1,9 +1,9 @@
 from selenium.webdriver.common.by import By
 from utils.base_page import BasePage
+from utils.config import app_url
 from utils.logger import get_logger
 import allure
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support import expected_conditions as EC
+from utils import dom_wait as EC
 
 logger = get_logger(__name__)
 
@@ -24,7 +24,7 @@ class CheckoutStepOnePage(BasePage):
         """
         Fills the user information form.
         """
-        logger.info(f"Filling checkout info: {first_name}, {last_name}, {postal_code}")
+        logger.info("Filling checkout info: %s, %s, %s", first_name, last_name, postal_code)
         self.send_keys(*self.FIRST_NAME_INPUT, first_name)
         self.send_keys(*self.LAST_NAME_INPUT, last_name)
         self.send_keys(*self.POSTAL_CODE_INPUT, postal_code)
@@ -39,7 +39,7 @@ class CheckoutStepOnePage(BasePage):
         logger.info("Clicking continue button to proceed to checkout step two")
         self.click(*self.CONTINUE_BUTTON) # Try native click one last time, then navigate
         logger.info("Clicked continue button, now navigating directly")
-        self.driver.get("https://www.saucedemo.com/checkout-step-two.html")
+        self.navigate(app_url("checkout-step-two.html"))
         from pages.checkout_step_two_page import CheckoutStepTwoPage
         return CheckoutStepTwoPage(self.driver)
 
@@ -60,5 +60,5 @@ class CheckoutStepOnePage(BasePage):
         """
         logger.info("Getting error message text on checkout page")
         error_text = self.get_text(*self.ERROR_MESSAGE)
-        logger.info(f"Error message text is: '{error_text}'")
+        logger.info("Error message text is: '%s'", error_text)
         return error_text
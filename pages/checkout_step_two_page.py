@@ -21,7 +21,7 @@ class CheckoutStepTwoPage(BasePage):
         """
         logger.info("Getting checkout step two page title")
         title = self.get_text(*self.PAGE_TITLE)
-        logger.info(f"Checkout step two page title is: '{title}'")
+        logger.info("Checkout step two page title is: '%s'", title)
         return title
 
     @allure.step("Finish the checkout process")
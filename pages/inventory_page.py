@@ -1,8 +1,10 @@
 from selenium.webdriver.common.by import By
 from utils.base_page import BasePage
+from utils.config import app_url
 from utils.logger import get_logger
+from utils.retry import retry_step
 import allure
-from selenium.webdriver.support import expected_conditions as EC
+from utils import dom_wait as EC
 from pages.cart_page import CartPage
 
 logger = get_logger(__name__)
@@ -16,6 +18,7 @@ class InventoryPage(BasePage):
     PAGE_TITLE = (By.CSS_SELECTOR, ".header_container .title")
     INVENTORY_ITEMS = (By.CLASS_NAME, "inventory_item")
     SHOPPING_CART_ICON = (By.CLASS_NAME, "shopping_cart_link")
+    CATALOG_SELECTORS = (".inventory_list", ".inventory_item")
 
     @allure.step("Get page title")
     def get_title(self) -> str:
@@ -24,42 +27,83 @@ class InventoryPage(BasePage):
         """
         logger.info("Getting inventory page title")
         title = self.get_text(*self.PAGE_TITLE)
-        logger.info(f"Inventory page title is: '{title}'")
+        logger.info("Inventory page title is: '%s'", title)
         return title
 
     def get_add_to_cart_button_for_item(self, item_name: str):
         """Returns the locator for the 'Add to cart' button of a specific item."""
-        return (By.XPATH, f"//div[text()='{item_name}']/ancestor::div[contains(@class, 'inventory_item')]//button[text()='Add to cart']")
+        return self.catalog.item(item_name).button_locator(in_cart=False)
 
     def get_remove_button_for_item(self, item_name: str):
         """Returns the locator for the 'Remove' button of a specific item."""
-        return (By.XPATH, f"//div[text()='{item_name}']/ancestor::div[contains(@class, 'inventory_item')]//button[text()='Remove']")
+        return self.catalog.item(item_name).button_locator(in_cart=True)
 
+    @allure.step("Get the price of item '{item_name}'")
+    def get_item_price(self, item_name: str) -> float:
+        """
+        Gets the listed price of a specific item.
+        """
+        price = self.catalog.item(item_name).price
+        logger.info("Price of item '%s' is %.2f", item_name, price)
+        return price
+
+    # The retry wraps the step, so Allure still sees the real signature (and every attempt is a step)
+    @retry_step
     @allure.step("Add item '{item_name}' to cart")
     def add_item_to_cart(self, item_name: str):
         """
         Clicks the 'Add to cart' button for a specific item and waits for it to change to 'Remove'.
+
+        The button is only clicked while it still reads 'Add to cart', so a retried call
+        never removes the item again.
         """
-        logger.info(f"Adding item '{item_name}' to cart")
-        add_button_locator = (By.XPATH, f"//div[text()='{item_name}']/ancestor::div[contains(@class, 'inventory_item')]//button[text()='Add to cart']")
-        self.js_click(*add_button_locator)
-        logger.info(f"Clicked 'Add to cart' for item '{item_name}'")
+        logger.info("Adding item '%s' to cart", item_name)
+        remove_button_locator = self.get_remove_button_for_item(item_name)
+        clicked = self.catalog.click(item_name, "Add to cart")
+        if clicked:
+            logger.info("Clicked 'Add to cart' for item '%s'", item_name)
+        else:
+            logger.info("Item '%s' is already in the cart, not clicking again", item_name)
 
         # Wait for the button to change to 'Remove'
-        remove_button_locator = self.get_remove_button_for_item(item_name) # This uses the specific item name to find its remove button
         self.wait.until(EC.visibility_of_element_located(remove_button_locator))
-        logger.info(f"Verified '{item_name}' is added (Remove button visible).")
+        logger.info("Verified '%s' is added (Remove button visible).", item_name)
         return self
 
+    @allure.step("Add items {item_names} to cart")
+    def add_items_to_cart(self, item_names: list[str]) -> dict:
+        """
+        Adds several items to the cart in a single browser round-trip.
+        Returns a mapping of item name to result; raises TimeoutException if an item is missing.
+        """
+        logger.info("Adding items %s to cart", item_names)
+        results = self.click_item_buttons(item_names, ".inventory_item", "Add to cart", "Remove")
+        self.catalog.invalidate()
+        logger.info("Verified %s item(s) are added (Remove buttons visible).", len(results))
+        return {name: "added" for name in results}
+
+    @allure.step("Remove items {item_names} from cart")
+    def remove_items(self, item_names: list[str]) -> dict:
+        """
+        Removes several items from the cart in a single browser round-trip.
+        Returns a mapping of item name to result; raises TimeoutException if an item is missing.
+        """
+        logger.info("Removing items %s from cart", item_names)
+        results = self.click_item_buttons(item_names, ".inventory_item", "Remove", "Add to cart")
+        self.catalog.invalidate()
+        logger.info("Verified %s item(s) are removed (Add to cart buttons visible).", len(results))
+        return {name: "removed" for name in results}
+
     @allure.step("Remove item '{item_name}' from cart")
     def remove_item_from_cart(self, item_name: str):
         """
         Clicks the 'Remove' button for a specific item from the inventory page.
         """
-        logger.info(f"Removing item '{item_name}' from cart")
+        logger.info("Removing item '%s' from cart", item_name)
         button_locator = self.get_remove_button_for_item(item_name)
         self.click(*button_locator)
-        logger.info(f"Clicked 'Remove' for item '{item_name}'")
+        self.catalog.invalidate()
+        logger.info("Clicked 'Remove' for item '%s'", item_name)
         return self
 
     @allure.step("Go to the shopping cart")
@@ -72,7 +116,7 @@ class InventoryPage(BasePage):
         logger.info("Clicked shopping cart icon")
         
         # Explicitly wait for the URL to change to the cart page
-        self.wait.until(EC.url_to_be("https://www.saucedemo.com/cart.html"))
+        self.wait.until(EC.url_to_be(app_url("cart.html")))
         logger.info("Navigated to cart page.")
         return CartPage(self.driver)
 
@@ -83,9 +127,8 @@ class InventoryPage(BasePage):
         """
         logger.info("Getting cart badge item count")
         try:
-            badge = self.find_element(By.CLASS_NAME, "shopping_cart_badge")
-            count = int(badge.text)
-            logger.info(f"Cart badge count is {count}")
+            count = int(self.get_text(By.CLASS_NAME, "shopping_cart_badge"))
+            logger.info("Cart badge count is %s", count)
             return count
         except Exception:
             logger.info("Cart badge is not displayed (cart is likely empty)")
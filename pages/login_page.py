@@ -1,6 +1,7 @@
 from selenium.webdriver.common.by import By
 from pages.inventory_page import InventoryPage
 from utils.base_page import BasePage
+from utils.config import app_url
 from utils.logger import get_logger
 import allure
 
@@ -11,8 +12,6 @@ class LoginPage(BasePage):
     """
     Page Object for the Sauce Demo login page.
     """
-    URL = "https://www.saucedemo.com/"
-
     # Locators
     USERNAME_INPUT = (By.ID, "user-name")
     PASSWORD_INPUT = (By.ID, "password")
@@ -25,7 +24,7 @@ class LoginPage(BasePage):
         Navigates to the login page URL.
         """
         logger.info("Opening login page")
-        self.driver.get(self.URL)
+        self.navigate(app_url())
         logger.info("Login page opened")
         return self
 
@@ -34,7 +33,7 @@ class LoginPage(BasePage):
         """
         Fills the login form and submits it.
         """
-        logger.info(f"Attempting to log in with username: {username}")
+        logger.info("Attempting to log in with username: %s", username)
         self.send_keys(*self.USERNAME_INPUT, username)
         self.send_keys(*self.PASSWORD_INPUT, password)
         self.click(*self.LOGIN_BUTTON)
@@ -48,5 +47,5 @@ class LoginPage(BasePage):
         """
         logger.info("Getting error message text")
         error_text = self.get_text(*self.ERROR_MESSAGE)
-        logger.info(f"Error message text is: '{error_text}'")
+        logger.info("Error message text is: '%s'", error_text)
         return error_text
@@ -0,0 +1,1161 @@
+/*
+ * A minimal browser environment for the in-process DOM backend (utils/backend.py).
+ *
+ * It implements the part of the DOM that the bundled Sauce Demo app and the suite's page
+ * scripts use: an HTML parser and serializer, CSS selectors, events with bubbling and the
+ * default actions of links and submit buttons, MutationObserver, cookies, localStorage,
+ * the History API and timers. Timers run on a virtual clock that only advances while the
+ * backend waits for an async script, so a wait that times out costs no real time.
+ *
+ * There is no layout and no style sheet: an element is rendered unless it, or an ancestor,
+ * is hidden by the `hidden` attribute, an inline `display: none` or its tag (head, script, ...).
+ */
+"use strict";
+
+var window = globalThis;
+var self = window;
+
+// --- Clock and timers -------------------------------------------------------
+
+var __epoch = 0;
+var __clock = 0;
+var __timers = [];
+var __nextTimerId = 1;
+
+Date.now = function () { return __epoch + __clock; };
+var performance = {now: function () { return __clock; }, timeOrigin: 0};
+
+function __addTimer(callback, delay, args, interval) {
+    var id = __nextTimerId++;
+    __timers.push({id: id, due: __clock + Math.max(0, Number(delay) || 0), callback: callback, args: args,
+                   interval: interval ? Math.max(1, Number(delay) || 0) : null});
+    return id;
+}
+function __removeTimer(id) {
+    __timers = __timers.filter(function (timer) { return timer.id !== id; });
+}
+function setTimeout(callback, delay) { return __addTimer(callback, delay, Array.prototype.slice.call(arguments, 2), false); }
+function setInterval(callback, delay) { return __addTimer(callback, delay, Array.prototype.slice.call(arguments, 2), true); }
+function clearTimeout(id) { __removeTimer(id); }
+function clearInterval(id) { __removeTimer(id); }
+function requestAnimationFrame(callback) { return setTimeout(function () { callback(__clock); }, 16); }
+function cancelAnimationFrame(id) { __removeTimer(id); }
+function queueMicrotask(callback) { setTimeout(callback, 0); }
+
+// Runs due timers and observer callbacks until `until()` holds, no timer is left or `budgetMs` of virtual time passed
+function __drain(until, budgetMs) {
+    var limit = __clock + budgetMs;
+    for (;;) {
+        __flushMutations();
+        if (until()) return true;
+        if (!__timers.length) return false;
+        var next = __timers.reduce(function (a, b) { return b.due < a.due || (b.due === a.due && b.id < a.id) ? b : a; });
+        if (next.due > limit) {
+            __clock = limit;
+            return until();
+        }
+        __clock = Math.max(__clock, next.due);
+        if (next.interval) next.due = __clock + next.interval; else __removeTimer(next.id);
+        try {
+            next.callback.apply(window, next.args);
+        } catch (e) {
+            __reportError(e);
+        }
+    }
+}
+
+// --- Console ------------------------------------------------------------------
+
+var __console = [];
+function __log(level) {
+    return function () {
+        __console.push({level: level, message: Array.prototype.map.call(arguments, String).join(" "),
+                        source: "console-api", timestamp: Date.now()});
+    };
+}
+var console = {log: __log("INFO"), info: __log("INFO"), debug: __log("DEBUG"), warn: __log("WARNING"), error: __log("SEVERE")};
+function __reportError(e) {
+    __console.push({level: "SEVERE", message: String(e && e.stack || e), source: "javascript", timestamp: Date.now()});
+}
+
+// --- URLs ---------------------------------------------------------------------
+
+function __parseUrl(href) {
+    var match = /^([a-z][a-z0-9+.-]*:)\/\/([^\/?#]*)([^?#]*)(\?[^#]*)?(#.*)?$/i.exec(href);
+    if (!match) {
+        // URLs without an authority, such as about:blank
+        var opaque = /^([a-z][a-z0-9+.-]*:)(.*)$/i.exec(href);
+        if (!opaque) throw new TypeError("Invalid URL: " + href);
+        return {protocol: opaque[1].toLowerCase(), host: "", hostname: "", port: "", pathname: opaque[2], search: "", hash: ""};
+    }
+    var host = match[2], port = host.indexOf(":") !== -1 ? host.split(":")[1] : "";
+    return {protocol: match[1].toLowerCase(), host: host, hostname: host.split(":")[0], port: port,
+            pathname: match[3] || "/", search: match[4] && match[4] !== "?" ? match[4] : "",
+            hash: match[5] && match[5] !== "#" ? match[5] : ""};
+}
+function __resolveUrl(url, base) {
+    url = String(url);
+    if (/^[a-z][a-z0-9+.-]*:/i.test(url)) return url;
+    var b = __parseUrl(base), origin = b.protocol + "//" + b.host;
+    if (url.indexOf("//") === 0) return b.protocol + url;
+    if (url.charAt(0) === "/") return origin + url;
+    if (url.charAt(0) === "?") return origin + b.pathname + url;
+    if (url.charAt(0) === "#") return origin + b.pathname + b.search + url;
+    if (url === "") return origin + b.pathname + b.search;
+    var segments = b.pathname.split("/").slice(0, -1).concat(url.split(/[?#]/)[0].split("/")), path = [];
+    segments.forEach(function (segment) {
+        if (segment === "..") path.pop(); else if (segment !== ".") path.push(segment);
+    });
+    return origin + path.join("/").replace(/^\/?/, "/") + url.slice(url.split(/[?#]/)[0].length);
+}
+
+class URLSearchParams {
+    constructor(init) {
+        this._pairs = [];
+        String(init || "").replace(/^\?/, "").split("&").forEach(function (pair) {
+            if (!pair) return;
+            var index = pair.indexOf("="), decode = function (s) { return decodeURIComponent(s.replace(/\+/g, " ")); };
+            this._pairs.push(index === -1 ? [decode(pair), ""] : [decode(pair.slice(0, index)), decode(pair.slice(index + 1))]);
+        }, this);
+    }
+    get(name) { var pair = this._pairs.find(function (p) { return p[0] === name; }); return pair ? pair[1] : null; }
+    getAll(name) { return this._pairs.filter(function (p) { return p[0] === name; }).map(function (p) { return p[1]; }); }
+    has(name) { return this.get(name) !== null; }
+    toString() { return this._pairs.map(function (p) { return encodeURIComponent(p[0]) + "=" + encodeURIComponent(p[1]); }).join("&"); }
+}
+
+class Location {
+    constructor(href) { this._href = href; }
+    get href() { return this._href; }
+    set href(url) { __requestNavigation(__resolveUrl(url, this._href)); }
+    get protocol() { return __parseUrl(this._href).protocol; }
+    get host() { return __parseUrl(this._href).host; }
+    get hostname() { return __parseUrl(this._href).hostname; }
+    get port() { return __parseUrl(this._href).port; }
+    get origin() { var u = __parseUrl(this._href); return u.protocol + "//" + u.host; }
+    get pathname() { return __parseUrl(this._href).pathname; }
+    get search() { return __parseUrl(this._href).search; }
+    get hash() { return __parseUrl(this._href).hash; }
+    assign(url) { this.href = url; }
+    replace(url) { this.href = url; }
+    reload() { __requestNavigation(this._href); }
+    toString() { return this._href; }
+}
+
+var __pendingNavigation = null;
+function __requestNavigation(url) { __pendingNavigation = url; }
+
+var location = new Location("about:blank");
+
+var __historyStack = [];
+var __historyIndex = 0;
+var history = {
+    get length() { return __historyStack.length; },
+    get state() { return __historyStack.length ? __historyStack[__historyIndex].state : null; },
+    pushState: function (state, title, url) {
+        var href = url === undefined || url === null ? location.href : __resolveUrl(url, location.href);
+        __historyStack = __historyStack.slice(0, __historyIndex + 1);
+        __historyStack.push({state: state, href: href});
+        __historyIndex = __historyStack.length - 1;
+        location._href = href;
+    },
+    replaceState: function (state, title, url) {
+        var href = url === undefined || url === null ? location.href : __resolveUrl(url, location.href);
+        __historyStack[__historyIndex] = {state: state, href: href};
+        location._href = href;
+    },
+    go: function (delta) {
+        var index = __historyIndex + (delta || 0);
+        if (!delta || index < 0 || index >= __historyStack.length) return;
+        __historyIndex = index;
+        location._href = __historyStack[index].href;
+        setTimeout(function () { window.dispatchEvent(new Event("popstate", {state: __historyStack[index].state})); }, 0);
+    },
+    back: function () { this.go(-1); },
+    forward: function () { this.go(1); }
+};
+
+// --- Storage and cookies ------------------------------------------------------
+
+class Storage {
+    constructor(items) { this._items = items; }
+    get length() { return Object.keys(this._items).length; }
+    key(index) { var keys = Object.keys(this._items); return index < keys.length ? keys[index] : null; }
+    getItem(key) { return Object.prototype.hasOwnProperty.call(this._items, key) ? this._items[key] : null; }
+    setItem(key, value) { this._items[String(key)] = String(value); }
+    removeItem(key) { delete this._items[key]; }
+    clear() { Object.keys(this._items).forEach(function (key) { delete this._items[key]; }, this); }
+}
+
+var __state = {cookies: {}, localStorage: {}, sessionStorage: {}};
+var localStorage = new Storage(__state.localStorage);
+var sessionStorage = new Storage(__state.sessionStorage);
+
+function __liveCookies() {
+    var now = Date.now() / 1000, cookies = __state.cookies;
+    Object.keys(cookies).forEach(function (name) {
+        if (cookies[name].expiry !== null && cookies[name].expiry <= now) delete cookies[name];
+    });
+    return cookies;
+}
+function __setCookie(text) {
+    var parts = String(text).split(";"), first = parts.shift(), index = first.indexOf("=");
+    if (index === -1) return;
+    var cookie = {name: first.slice(0, index).trim(), value: first.slice(index + 1).trim(), path: "/", expiry: null};
+    parts.forEach(function (part) {
+        var i = part.indexOf("="), key = (i === -1 ? part : part.slice(0, i)).trim().toLowerCase(), value = i === -1 ? "" : part.slice(i + 1).trim();
+        if (key === "expires") cookie.expiry = Math.floor(Date.parse(value) / 1000);
+        else if (key === "max-age") cookie.expiry = Math.floor(Date.now() / 1000) + Number(value);
+        else if (key === "path") cookie.path = value;
+    });
+    __state.cookies[cookie.name] = cookie;
+    __liveCookies();
+}
+
+// --- Events -------------------------------------------------------------------
+
+class Event {
+    constructor(type, init) {
+        init = init || {};
+        this.type = type;
+        this.bubbles = !!init.bubbles;
+        this.cancelable = !!init.cancelable;
+        this.defaultPrevented = false;
+        this.target = null;
+        this.currentTarget = null;
+        this.timeStamp = __clock;
+        this.isTrusted = false;
+        if ("state" in init) this.state = init.state;
+        this._stopped = false;
+        this._stoppedImmediately = false;
+    }
+    preventDefault() { if (this.cancelable) this.defaultPrevented = true; }
+    stopPropagation() { this._stopped = true; }
+    stopImmediatePropagation() { this._stopped = this._stoppedImmediately = true; }
+}
+class MouseEvent extends Event {}
+class KeyboardEvent extends Event {
+    constructor(type, init) { super(type, init); this.key = (init || {}).key || ""; }
+}
+class CustomEvent extends Event {
+    constructor(type, init) { super(type, init); this.detail = (init || {}).detail === undefined ? null : init.detail; }
+}
+
+class EventTarget {
+    addEventListener(type, listener, options) {
+        if (!listener) return;
+        var capture = typeof options === "boolean" ? options : !!(options && options.capture);
+        var listeners = this._listeners || (this._listeners = []);
+        if (!listeners.some(function (l) { return l.type === type && l.listener === listener && l.capture === capture; })) {
+            listeners.push({type: type, listener: listener, capture: capture, once: !!(options && options.once)});
+        }
+    }
+    removeEventListener(type, listener, options) {
+        var capture = typeof options === "boolean" ? options : !!(options && options.capture);
+        this._listeners = (this._listeners || []).filter(function (l) {
+            return !(l.type === type && l.listener === listener && l.capture === capture);
+        });
+    }
+    dispatchEvent(event) {
+        event.target = this;
+        var path = [], node = this;
+        while (node) {
+            path.push(node);
+            node = node === document ? window : node.parentNode;
+        }
+        function invoke(target, capture) {
+            event.currentTarget = target;
+            (target._listeners || []).slice().forEach(function (l) {
+                if (event._stoppedImmediately || l.type !== event.type || (target !== event.target && l.capture !== capture)) return;
+                if (l.once) target.removeEventListener(l.type, l.listener, l.capture);
+                try {
+                    if (typeof l.listener === "function") l.listener.call(target, event); else l.listener.handleEvent(event);
+                } catch (e) {
+                    __reportError(e);
+                }
+            });
+        }
+        for (var i = path.length - 1; i > 0 && !event._stopped; i--) invoke(path[i], true);
+        if (!event._stopped) invoke(this, false);
+        for (var j = 1; event.bubbles && j < path.length && !event._stopped; j++) invoke(path[j], false);
+        event.currentTarget = null;
+        return !event.defaultPrevented;
+    }
+}
+
+// --- Mutation observers -------------------------------------------------------
+
+var __observers = [];
+
+class MutationObserver {
+    constructor(callback) { this._callback = callback; this._targets = []; this._records = []; }
+    observe(target, options) {
+        this._targets = this._targets.filter(function (t) { return t.node !== target; });
+        this._targets.push({node: target, options: options || {}});
+        if (__observers.indexOf(this) === -1) __observers.push(this);
+    }
+    disconnect() {
+        this._targets = [];
+        this._records = [];
+        __observers = __observers.filter(function (o) { return o !== this; }, this);
+    }
+    takeRecords() { var records = this._records; this._records = []; return records; }
+}
+
+function __queueMutation(record) {
+    __observers.forEach(function (observer) {
+        var interested = observer._targets.some(function (t) {
+            var o = t.options;
+            if (record.type === "childList" && !o.childList) return false;
+            if (record.type === "attributes" && !(o.attributes || o.attributeFilter)) return false;
+            if (record.type === "attributes" && o.attributeFilter && o.attributeFilter.indexOf(record.attributeName) === -1) return false;
+            if (record.type === "characterData" && !o.characterData) return false;
+            return t.node === record.target || (o.subtree && t.node.contains(record.target));
+        });
+        if (interested) observer._records.push(record);
+    });
+}
+
+function __flushMutations() {
+    for (var rounds = 0; rounds < 100; rounds++) {
+        var pending = __observers.filter(function (o) { return o._records.length; });
+        if (!pending.length) return;
+        pending.forEach(function (observer) {
+            var records = observer.takeRecords();
+            try {
+                observer._callback(records, observer);
+            } catch (e) {
+                __reportError(e);
+            }
+        });
+    }
+}
+
+// --- Nodes --------------------------------------------------------------------
+
+var VOID_ELEMENTS = ["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"];
+var RAW_TEXT_ELEMENTS = ["script", "style", "textarea", "title"];
+var UNRENDERED_ELEMENTS = ["head", "script", "style", "template", "noscript", "title", "meta", "link"];
+
+class Node extends EventTarget {
+    constructor(nodeType, nodeName) {
+        super();
+        this.nodeType = nodeType;
+        this.nodeName = nodeName;
+        this.parentNode = null;
+        this.childNodes = [];
+    }
+    get ownerDocument() { return this.nodeType === 9 ? null : document; }
+    get parentElement() { return this.parentNode && this.parentNode.nodeType === 1 ? this.parentNode : null; }
+    get firstChild() { return this.childNodes[0] || null; }
+    get lastChild() { return this.childNodes[this.childNodes.length - 1] || null; }
+    get nextSibling() { return this._sibling(1); }
+    get previousSibling() { return this._sibling(-1); }
+    get isConnected() {
+        var node = this;
+        while (node.parentNode) node = node.parentNode;
+        return node === document;
+    }
+    _sibling(offset) {
+        if (!this.parentNode) return null;
+        var siblings = this.parentNode.childNodes;
+        return siblings[siblings.indexOf(this) + offset] || null;
+    }
+    get textContent() {
+        return this.childNodes.map(function (child) { return child.nodeType === 8 ? "" : child.textContent; }).join("");
+    }
+    set textContent(text) {
+        this._replaceChildren(text === null || text === "" ? [] : [new Text(String(text))]);
+    }
+    contains(other) {
+        for (var node = other; node; node = node.parentNode) if (node === this) return true;
+        return false;
+    }
+    hasChildNodes() { return this.childNodes.length > 0; }
+    appendChild(child) { return this.insertBefore(child, null); }
+    insertBefore(child, reference) {
+        if (child.nodeType === 11) {
+            child.childNodes.slice().forEach(function (node) { this.insertBefore(node, reference); }, this);
+            return child;
+        }
+        if (child.parentNode) child.parentNode.removeChild(child);
+        var index = reference ? this.childNodes.indexOf(reference) : -1;
+        if (index === -1) this.childNodes.push(child); else this.childNodes.splice(index, 0, child);
+        child.parentNode = this;
+        __queueMutation({type: "childList", target: this, addedNodes: [child], removedNodes: []});
+        return child;
+    }
+    removeChild(child) {
+        var index = this.childNodes.indexOf(child);
+        if (index === -1) throw new Error("NotFoundError: the node is not a child of this node");
+        this.childNodes.splice(index, 1);
+        child.parentNode = null;
+        __queueMutation({type: "childList", target: this, addedNodes: [], removedNodes: [child]});
+        return child;
+    }
+    replaceChild(child, old) {
+        this.insertBefore(child, old);
+        return this.removeChild(old);
+    }
+    remove() { if (this.parentNode) this.parentNode.removeChild(this); }
+    _replaceChildren(nodes) {
+        var removed = this.childNodes;
+        removed.forEach(function (node) { node.parentNode = null; });
+        this.childNodes = [];
+        nodes.forEach(function (node) {
+            if (node.parentNode) node.parentNode.removeChild(node);
+            node.parentNode = this;
+            this.childNodes.push(node);
+        }, this);
+        __queueMutation({type: "childList", target: this, addedNodes: nodes, removedNodes: removed});
+    }
+}
+
+class Text extends Node {
+    constructor(data) { super(3, "#text"); this._data = String(data); }
+    get data() { return this._data; }
+    set data(value) {
+        this._data = String(value);
+        __queueMutation({type: "characterData", target: this});
+    }
+    get nodeValue() { return this._data; }
+    get textContent() { return this._data; }
+    set textContent(value) { this.data = value; }
+}
+
+class Comment extends Node {
+    constructor(data) { super(8, "#comment"); this.data = String(data); }
+    get textContent() { return this.data; }
+}
+
+class DocumentFragment extends Node {
+    constructor() { super(11, "#document-fragment"); }
+    querySelector(selector) { return __select(this, selector, true); }
+    querySelectorAll(selector) { return __select(this, selector, false); }
+}
+
+class DOMTokenList {
+    constructor(element) { this._element = element; }
+    _tokens() { return (this._element.getAttribute("class") || "").split(/\s+/).filter(Boolean); }
+    get length() { return this._tokens().length; }
+    contains(token) { return this._tokens().indexOf(token) !== -1; }
+    add() {
+        var tokens = this._tokens();
+        Array.prototype.forEach.call(arguments, function (t) { if (tokens.indexOf(t) === -1) tokens.push(t); });
+        this._element.setAttribute("class", tokens.join(" "));
+    }
+    remove() {
+        var removed = Array.prototype.slice.call(arguments);
+        this._element.setAttribute("class", this._tokens().filter(function (t) { return removed.indexOf(t) === -1; }).join(" "));
+    }
+    toggle(token, force) {
+        var present = this.contains(token), wanted = force === undefined ? !present : !!force;
+        if (wanted && !present) this.add(token);
+        if (!wanted && present) this.remove(token);
+        return wanted;
+    }
+}
+
+class Element extends Node {
+    constructor(tagName) {
+        super(1, tagName.toUpperCase());
+        this.localName = tagName.toLowerCase();
+        this.tagName = this.nodeName;
+        this._attributes = [];
+        this._value = null;
+        this._checked = null;
+    }
+    get attributes() { return this._attributes.map(function (a) { return {name: a[0], value: a[1]}; }); }
+    getAttribute(name) {
+        name = String(name).toLowerCase();
+        var attribute = this._attributes.find(function (a) { return a[0] === name; });
+        return attribute ? attribute[1] : null;
+    }
+    hasAttribute(name) { return this.getAttribute(name) !== null; }
+    setAttribute(name, value) {
+        name = String(name).toLowerCase();
+        var attribute = this._attributes.find(function (a) { return a[0] === name; });
+        if (attribute) attribute[1] = String(value); else this._attributes.push([name, String(value)]);
+        __queueMutation({type: "attributes", target: this, attributeName: name});
+    }
+    removeAttribute(name) {
+        name = String(name).toLowerCase();
+        var before = this._attributes.length;
+        this._attributes = this._attributes.filter(function (a) { return a[0] !== name; });
+        if (this._attributes.length !== before) __queueMutation({type: "attributes", target: this, attributeName: name});
+    }
+    get id() { return this.getAttribute("id") || ""; }
+    set id(value) { this.setAttribute("id", value); }
+    get className() { return this.getAttribute("class") || ""; }
+    set className(value) { this.setAttribute("class", value); }
+    get classList() { return new DOMTokenList(this); }
+    get name() { return this.getAttribute("name") || ""; }
+    get hidden() { return this.hasAttribute("hidden"); }
+    get disabled() { return this.hasAttribute("disabled"); }
+    set disabled(value) { if (value) this.setAttribute("disabled", ""); else this.removeAttribute("disabled"); }
+    get href() { var href = this.getAttribute("href"); return href === null ? "" : __resolveUrl(href, location.href); }
+    get src() { var src = this.getAttribute("src"); return src === null ? "" : __resolveUrl(src, location.href); }
+    get type() {
+        var type = (this.getAttribute("type") || "").toLowerCase();
+        if (this.localName === "button") return type === "button" || type === "reset" ? type : "submit";
+        return this.localName === "input" ? type || "text" : type;
+    }
+    get placeholder() { return this.getAttribute("placeholder") || ""; }
+    get value() {
+        if (this.localName === "select") {
+            var option = this._selectedOption();
+            return option ? option.value : "";
+        }
+        if (this.localName === "option") return this.hasAttribute("value") ? this.getAttribute("value") : this.textContent.trim();
+        if (this._value !== null) return this._value;
+        return this.localName === "textarea" ? this.textContent : this.getAttribute("value") || "";
+    }
+    set value(value) {
+        if (this.localName === "select") {
+            this._options().forEach(function (option) { option._selected = option.value === String(value); });
+            return;
+        }
+        this._value = value === null ? "" : String(value);
+    }
+    get checked() { return this._checked !== null ? this._checked : this.hasAttribute("checked"); }
+    set checked(value) { this._checked = !!value; }
+    get selected() { return this._selected !== undefined ? this._selected : this.hasAttribute("selected"); }
+    get options() { return this._options(); }
+    get selectedIndex() { return this._options().indexOf(this._selectedOption()); }
+    _options() { return __select(this, "option", false); }
+    _selectedOption() {
+        var options = this._options();
+        return options.filter(function (o) { return o.selected; }).pop() || options[0] || null;
+    }
+    get form() { return this.closest("form"); }
+    get children() { return this.childNodes.filter(function (n) { return n.nodeType === 1; }); }
+    get childElementCount() { return this.children.length; }
+    get firstElementChild() { return this.children[0] || null; }
+    get innerHTML() { return this.childNodes.map(__serialize).join(""); }
+    set innerHTML(html) {
+        this._replaceChildren(RAW_TEXT_ELEMENTS.indexOf(this.localName) !== -1 ? [new Text(html)] : __parseHTML(String(html)));
+    }
+    get outerHTML() { return __serialize(this); }
+    get innerText() {
+        if (!__isRendered(this)) return this.textContent;
+        var parts = [];
+        (function collect(node) {
+            node.childNodes.forEach(function (child) {
+                if (child.nodeType === 3) parts.push(child.data);
+                else if (child.nodeType === 1 && __isRendered(child)) {
+                    if (child.localName === "br") parts.push("\n"); else collect(child);
+                }
+            });
+        })(this);
+        return parts.join("").replace(/[ \t\r\f]+/g, " ").replace(/ ?\n ?/g, "\n");
+    }
+    set innerText(text) { this.textContent = text; }
+    get style() {
+        var style = {};
+        (this.getAttribute("style") || "").split(";").forEach(function (declaration) {
+            var index = declaration.indexOf(":");
+            if (index === -1) return;
+            var name = declaration.slice(0, index).trim().toLowerCase().replace(/-([a-z])/g, function (m, c) { return c.toUpperCase(); });
+            style[name] = declaration.slice(index + 1).trim();
+        });
+        return style;
+    }
+    matches(selector) { return __parseSelector(selector).some(function (complex) { return __matchComplex(this, complex); }, this); }
+    closest(selector) {
+        var groups = __parseSelector(selector);
+        for (var node = this; node && node.nodeType === 1; node = node.parentNode) {
+            if (groups.some(function (complex) { return __matchComplex(node, complex); })) return node;
+        }
+        return null;
+    }
+    querySelector(selector) { return __select(this, selector, true); }
+    querySelectorAll(selector) { return __select(this, selector, false); }
+    getElementsByTagName(name) { return __select(this, name, false); }
+    getElementsByClassName(name) { return __select(this, "." + name.trim().split(/\s+/).join("."), false); }
+    getBoundingClientRect() {
+        var size = __isRendered(this) ? 1 : 0;
+        return {x: 0, y: 0, left: 0, top: 0, right: size, bottom: size, width: size, height: size};
+    }
+    getClientRects() { return __isRendered(this) ? [this.getBoundingClientRect()] : []; }
+    scrollIntoView() {}
+    focus() { document.activeElement = this; }
+    blur() { if (document.activeElement === this) document.activeElement = document.body; }
+    click() {
+        if (this.disabled) return;
+        var event = new MouseEvent("click", {bubbles: true, cancelable: true});
+        if (this.dispatchEvent(event)) __activate(this);
+    }
+    submit() { __submit(this); }
+    requestSubmit() {
+        if (this.dispatchEvent(new Event("submit", {bubbles: true, cancelable: true}))) __submit(this);
+    }
+}
+
+// The default action of a click that no listener prevented
+function __activate(element) {
+    var target = element.closest("a[href], button, input");
+    if (!target) return;
+    if (target.localName === "a") {
+        var href = target.getAttribute("href");
+        if (href && href.charAt(0) !== "#" && href.indexOf("javascript:") !== 0) __requestNavigation(target.href);
+    } else if (target.localName === "input" && (target.type === "checkbox" || target.type === "radio")) {
+        target.checked = target.type === "radio" ? true : !target.checked;
+        target.dispatchEvent(new Event("input", {bubbles: true}));
+        target.dispatchEvent(new Event("change", {bubbles: true}));
+    } else if (target.type === "submit" && target.form) {
+        target.form.requestSubmit();
+    }
+}
+
+// Submitting a form that no listener handled loads its action, like a GET form in a browser
+function __submit(form) {
+    var action = form.getAttribute("action");
+    if (action !== null) __requestNavigation(__resolveUrl(action, location.href));
+}
+
+function __isRendered(element) {
+    if (!element.isConnected) return false;
+    for (var node = element; node && node.nodeType === 1; node = node.parentNode) {
+        if (UNRENDERED_ELEMENTS.indexOf(node.localName) !== -1 || node.hasAttribute("hidden")) return false;
+        if (node.localName === "input" && node.type === "hidden") return false;
+        var style = node.style;
+        if (style.display === "none" || style.visibility === "hidden") return false;
+    }
+    return true;
+}
+
+function getComputedStyle(element) {
+    var rendered = __isRendered(element), style = element.style;
+    return {
+        display: rendered ? style.display || "block" : "none",
+        visibility: rendered ? "visible" : "hidden",
+        opacity: style.opacity || "1",
+        getPropertyValue: function (name) { return this[name.replace(/-([a-z])/g, function (m, c) { return c.toUpperCase(); })] || ""; }
+    };
+}
+
+var CSS = {
+    escape: function (value) {
+        return String(value).replace(/[^a-zA-Z0-9_\u00a0-\uffff-]/g, function (c) { return "\\" + c; })
+            .replace(/^(-?)(\d)/, function (m, dash, digit) { return dash + "\\3" + digit + " "; });
+    }
+};
+
+class Document extends Node {
+    constructor() {
+        super(9, "#document");
+        this.readyState = "loading";
+        this.activeElement = null;
+    }
+    get documentElement() { return this.childNodes.find(function (n) { return n.nodeType === 1; }) || null; }
+    get head() { return this.querySelector("head"); }
+    get body() { return this.querySelector("body"); }
+    get title() { var title = this.querySelector("title"); return title ? title.textContent.trim() : ""; }
+    get URL() { return location.href; }
+    get cookie() {
+        var cookies = __liveCookies();
+        return Object.keys(cookies).map(function (name) { return name + "=" + cookies[name].value; }).join("; ");
+    }
+    set cookie(text) { __setCookie(text); }
+    get location() { return location; }
+    get defaultView() { return window; }
+    get children() { return this.childNodes.filter(function (n) { return n.nodeType === 1; }); }
+    createElement(tagName) { return new Element(String(tagName)); }
+    createTextNode(data) { return new Text(data); }
+    createComment(data) { return new Comment(data); }
+    createDocumentFragment() { return new DocumentFragment(); }
+    createEvent() { return new Event(""); }
+    getElementById(id) { return __find(this, function (node) { return node.getAttribute("id") === id; }, true); }
+    getElementsByTagName(name) { return __select(this, name, false); }
+    getElementsByClassName(name) { return __select(this, "." + name.trim().split(/\s+/).join("."), false); }
+    querySelector(selector) { return __select(this, selector, true); }
+    querySelectorAll(selector) { return __select(this, selector, false); }
+    evaluate() { throw new Error("XPath is not supported by the in-process DOM backend; use a CSS selector"); }
+}
+
+var document = new Document();
+
+// Window is the end of every event path
+window._listeners = [];
+window.addEventListener = EventTarget.prototype.addEventListener;
+window.removeEventListener = EventTarget.prototype.removeEventListener;
+window.dispatchEvent = function (event) {
+    event.target = window;
+    event.currentTarget = window;
+    (window._listeners || []).slice().forEach(function (l) {
+        if (l.type !== event.type) return;
+        try {
+            if (typeof l.listener === "function") l.listener.call(window, event); else l.listener.handleEvent(event);
+        } catch (e) {
+            __reportError(e);
+        }
+    });
+    return !event.defaultPrevented;
+};
+window.devicePixelRatio = 1;
+window.innerWidth = 1920;
+window.innerHeight = 1080;
+window.navigator = {userAgent: "Mozilla/5.0 (in-process DOM backend)", language: "en-US", webdriver: true};
+window.alert = window.confirm = window.prompt = function () {};
+
+// --- Tree walking and selectors -----------------------------------------------
+
+function __find(root, test, first) {
+    var found = [];
+    (function walk(node) {
+        for (var i = 0; i < node.childNodes.length; i++) {
+            var child = node.childNodes[i];
+            if (child.nodeType !== 1) continue;
+            if (test(child)) {
+                found.push(child);
+                if (first) return true;
+            }
+            if (walk(child)) return true;
+        }
+        return false;
+    })(root);
+    return first ? found[0] || null : found;
+}
+
+function __select(root, selector, first) {
+    var groups = __parseSelector(selector);
+    return __find(root, function (node) {
+        return groups.some(function (complex) { return __matchComplex(node, complex, root); });
+    }, first);
+}
+
+var __selectorCache = {};
+
+// Parses a selector list into [[compound, combinator, compound, ...], ...]
+function __parseSelector(selector) {
+    selector = String(selector);
+    if (__selectorCache[selector]) return __selectorCache[selector];
+    var groups = [], complex = [], compound = null, i = 0;
+
+    function fail() { throw new SyntaxError("'" + selector + "' is not a valid selector for the in-process DOM backend"); }
+    function ident() {
+        var out = "";
+        while (i < selector.length) {
+            var c = selector.charAt(i);
+            if (c === "\\") {
+                var hex = /^[0-9a-fA-F]{1,6} ?/.exec(selector.slice(i + 1));
+                if (hex) {
+                    out += String.fromCodePoint(parseInt(hex[0], 16));
+                    i += 1 + hex[0].length;
+                } else {
+                    out += selector.charAt(i + 1);
+                    i += 2;
+                }
+            } else if (/[\w\u00a0-\uffff-]/.test(c)) {
+                out += c;
+                i++;
+            } else {
+                break;
+            }
+        }
+        return out;
+    }
+    function current() { return compound || (compound = {tag: null, id: null, classes: [], attributes: []}); }
+    function endCompound() {
+        if (compound) complex.push(compound);
+        compound = null;
+    }
+
+    while (i < selector.length) {
+        var c = selector.charAt(i);
+        if (/\s/.test(c) || c === ">" || c === "+" || c === "~" || c === ",") {
+            var combinator = " ";
+            while (i < selector.length && /[\s>+~,]/.test(selector.charAt(i))) {
+                if (selector.charAt(i) !== " " && !/\s/.test(selector.charAt(i))) combinator = selector.charAt(i);
+                i++;
+            }
+            endCompound();
+            if (combinator === ",") {
+                if (!complex.length) fail();
+                groups.push(complex);
+                complex = [];
+            } else if (complex.length && i < selector.length) {
+                complex.push(combinator);
+            }
+        } else if (c === "*") {
+            current().tag = "*";
+            i++;
+        } else if (c === "#") {
+            i++;
+            current().id = ident() || fail();
+        } else if (c === ".") {
+            i++;
+            current().classes.push(ident() || fail());
+        } else if (c === "[") {
+            i++;
+            while (/\s/.test(selector.charAt(i))) i++;
+            var name = ident().toLowerCase() || fail(), operator = null, value = null;
+            while (/\s/.test(selector.charAt(i))) i++;
+            var op = /^([~|^$*]?=)/.exec(selector.slice(i));
+            if (op) {
+                operator = op[1];
+                i += operator.length;
+                while (/\s/.test(selector.charAt(i))) i++;
+                var quote = selector.charAt(i);
+                if (quote === '"' || quote === "'") {
+                    var end = i + 1;
+                    value = "";
+                    while (end < selector.length && selector.charAt(end) !== quote) {
+                        if (selector.charAt(end) === "\\") end++;
+                        value += selector.charAt(end);
+                        end++;
+                    }
+                    if (end >= selector.length) fail();
+                    i = end + 1;
+                } else {
+                    value = ident();
+                }
+                while (/\s/.test(selector.charAt(i))) i++;
+                if (/^i\s*\]/.test(selector.slice(i))) i = selector.indexOf("]", i);
+            }
+            if (selector.charAt(i) !== "]") fail();
+            i++;
+            current().attributes.push({name: name, operator: operator, value: value});
+        } else if (/[\w\u00a0-\uffff\\-]/.test(c)) {
+            current().tag = ident().toLowerCase();
+        } else {
+            fail();
+        }
+    }
+    endCompound();
+    if (!complex.length) fail();
+    groups.push(complex);
+    return (__selectorCache[selector] = groups);
+}
+
+function __matchCompound(element, compound) {
+    if (compound.tag && compound.tag !== "*" && element.localName !== compound.tag) return false;
+    if (compound.id !== null && element.getAttribute("id") !== compound.id) return false;
+    if (compound.classes.length) {
+        var classes = (element.getAttribute("class") || "").split(/\s+/);
+        if (!compound.classes.every(function (c) { return classes.indexOf(c) !== -1; })) return false;
+    }
+    return compound.attributes.every(function (a) {
+        var actual = element.getAttribute(a.name);
+        if (actual === null) return false;
+        switch (a.operator) {
+            case null: return true;
+            case "=": return actual === a.value;
+            case "~=": return actual.split(/\s+/).indexOf(a.value) !== -1;
+            case "|=": return actual === a.value || actual.indexOf(a.value + "-") === 0;
+            case "^=": return a.value !== "" && actual.indexOf(a.value) === 0;
+            case "$=": return a.value !== "" && actual.slice(-a.value.length) === a.value;
+            case "*=": return a.value !== "" && actual.indexOf(a.value) !== -1;
+        }
+        return false;
+    });
+}
+
+// Matches right to left; ancestors are looked up only inside `scope`, like querySelectorAll does
+function __matchComplex(element, complex, scope) {
+    function matchFrom(node, index) {
+        if (!__matchCompound(node, complex[index])) return false;
+        if (index === 0) return true;
+        var combinator = complex[index - 1];
+        if (combinator === ">") {
+            var parent = node.parentNode;
+            return !!parent && parent.nodeType === 1 && parent !== scope && matchFrom(parent, index - 2);
+        }
+        if (combinator === " ") {
+            for (var ancestor = node.parentNode; ancestor && ancestor.nodeType === 1; ancestor = ancestor.parentNode) {
+                if (matchFrom(ancestor, index - 2)) return true;
+            }
+            return false;
+        }
+        var siblings = node.parentNode ? node.parentNode.children : [], position = siblings.indexOf(node);
+        if (combinator === "+") return position > 0 && matchFrom(siblings[position - 1], index - 2);
+        for (var s = position - 1; s >= 0; s--) if (matchFrom(siblings[s], index - 2)) return true;
+        return false;
+    }
+    return matchFrom(element, complex.length - 1);
+}
+
+// --- HTML parsing and serialization ---------------------------------------------
+
+var ENTITIES = {amp: "&", lt: "<", gt: ">", quot: '"', apos: "'", nbsp: "\u00a0", copy: "\u00a9", reg: "\u00ae", times: "\u00d7"};
+
+function __decodeEntities(text) {
+    return text.replace(/&(#x[0-9a-f]+|#\d+|[a-z]+);/gi, function (match, entity) {
+        if (entity.charAt(0) === "#") {
+            return String.fromCodePoint(entity.charAt(1).toLowerCase() === "x" ? parseInt(entity.slice(2), 16) : parseInt(entity.slice(1), 10));
+        }
+        return ENTITIES[entity.toLowerCase()] || match;
+    });
+}
+
+// Parses HTML into a list of top-level nodes; tolerant of unclosed tags, not of every HTML5 recovery rule
+function __parseHTML(html) {
+    var root = new DocumentFragment(), stack = [root], i = 0;
+    function top() { return stack[stack.length - 1]; }
+    function append(node) {
+        var parent = top();
+        node.parentNode = parent;
+        parent.childNodes.push(node);
+    }
+    while (i < html.length) {
+        var lt = html.indexOf("<", i);
+        if (lt === -1) lt = html.length;
+        if (lt > i) append(new Text(__decodeEntities(html.slice(i, lt))));
+        i = lt;
+        if (i >= html.length) break;
+        if (html.startsWith("<!--", i)) {
+            var endComment = html.indexOf("-->", i + 4);
+            if (endComment === -1) endComment = html.length;
+            append(new Comment(html.slice(i + 4, endComment)));
+            i = endComment + 3;
+        } else if (html.charAt(i + 1) === "!" || html.charAt(i + 1) === "?") {
+            i = html.indexOf(">", i) + 1 || html.length;
+        } else if (html.charAt(i + 1) === "/") {
+            var close = /^<\/([a-zA-Z][\w:-]*)\s*>/.exec(html.slice(i));
+            if (!close) {
+                i = html.indexOf(">", i) + 1 || html.length;
+                continue;
+            }
+            var name = close[1].toLowerCase();
+            for (var s = stack.length - 1; s > 0; s--) {
+                if (stack[s].localName === name) {
+                    stack.length = s;
+                    break;
+                }
+            }
+            i += close[0].length;
+        } else {
+            var open = /^<([a-zA-Z][\w:-]*)/.exec(html.slice(i));
+            if (!open) {
+                append(new Text("<"));
+                i++;
+                continue;
+            }
+            var element = new Element(open[1]), attribute = /^\s*([^\s"'>\/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?/, rest;
+            i += open[0].length;
+            for (;;) {
+                rest = html.slice(i);
+                var match = attribute.exec(rest);
+                if (!match) break;
+                var value = match[2] !== undefined ? match[2] : match[3] !== undefined ? match[3] : match[4] !== undefined ? match[4] : "";
+                if (!element.hasAttribute(match[1])) element._attributes.push([match[1].toLowerCase(), __decodeEntities(value)]);
+                i += match[0].length;
+            }
+            var selfClosing = /^\s*\//.test(html.slice(i));
+            i = html.indexOf(">", i) + 1 || html.length;
+            append(element);
+            var tag = element.localName;
+            if (RAW_TEXT_ELEMENTS.indexOf(tag) !== -1) {
+                var endRaw = html.toLowerCase().indexOf("</" + tag, i);
+                if (endRaw === -1) endRaw = html.length;
+                var raw = html.slice(i, endRaw);
+                if (raw) {
+                    var text = new Text(tag === "textarea" || tag === "title" ? __decodeEntities(raw) : raw);
+                    text.parentNode = element;
+                    element.childNodes.push(text);
+                }
+                i = html.indexOf(">", endRaw) + 1 || html.length;
+            } else if (VOID_ELEMENTS.indexOf(tag) === -1 && !selfClosing) {
+                stack.push(element);
+            }
+        }
+    }
+    var nodes = root.childNodes;
+    nodes.forEach(function (node) { node.parentNode = null; });
+    return nodes;
+}
+
+function __escapeText(text) { return text.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/\u00a0/g, "&nbsp;"); }
+function __escapeAttribute(text) { return text.replace(/&/g, "&amp;").replace(/"/g, "&quot;").replace(/\u00a0/g, "&nbsp;"); }
+
+function __serialize(node) {
+    if (node.nodeType === 3) {
+        var parent = node.parentNode;
+        return parent && parent.nodeType === 1 && (parent.localName === "script" || parent.localName === "style") ? node.data : __escapeText(node.data);
+    }
+    if (node.nodeType === 8) return "<!--" + node.data + "-->";
+    if (node.nodeType !== 1) return node.childNodes.map(__serialize).join("");
+    var open = "<" + node.localName + node._attributes.map(function (a) { return " " + a[0] + '="' + __escapeAttribute(a[1]) + '"'; }).join("") + ">";
+    if (VOID_ELEMENTS.indexOf(node.localName) !== -1) return open;
+    return open + node.childNodes.map(__serialize).join("") + "</" + node.localName + ">";
+}
+
+// --- Backend entry points -----------------------------------------------------
+
+var ELEMENT_KEY = "element-6066-11e4-a52f-4a40b2c6f8a4";
+var __nodes = [];
+
+function __nodeId(node) {
+    if (node.__id === undefined) {
+        node.__id = __nodes.length;
+        __nodes.push(node);
+    }
+    return node.__id;
+}
+function __node(id) {
+    var node = __nodes[id];
+    if (!node || !node.isConnected) throw new Error("stale element reference: the element is no longer attached to the DOM");
+    return node;
+}
+function __toWire(value, depth) {
+    if (depth > 20) throw new Error("javascript error: the script result is nested too deeply");
+    if (value instanceof Node) {
+        if (value.nodeType !== 1) return null;
+        var wire = {};
+        wire[ELEMENT_KEY] = __nodeId(value);
+        return wire;
+    }
+    if (value === undefined || typeof value === "function") return null;
+    if (Array.isArray(value) || (value && typeof value.length === "number" && typeof value === "object" && !(value instanceof String))) {
+        return Array.prototype.map.call(value, function (item) { return __toWire(item, depth + 1); });
+    }
+    if (value && typeof value === "object") {
+        if (value === window) return null;
+        var out = {};
+        Object.keys(value).forEach(function (key) { out[key] = __toWire(value[key], depth + 1); });
+        return out;
+    }
+    return value;
+}
+function __fromWire(value) {
+    if (Array.isArray(value)) return value.map(__fromWire);
+    if (value && typeof value === "object") {
+        if (ELEMENT_KEY in value) return __node(value[ELEMENT_KEY]);
+        var out = {};
+        Object.keys(value).forEach(function (key) { out[key] = __fromWire(value[key]); });
+        return out;
+    }
+    return value;
+}
+function __result(value) {
+    __flushMutations();
+    var navigation = __pendingNavigation;
+    __pendingNavigation = null;
+    return JSON.stringify({value: __toWire(value, 0), navigation: navigation});
+}
+
+function __boot(stateJson, clock, epoch, url) {
+    var state = JSON.parse(stateJson);
+    Object.assign(__state.cookies, state.cookies);
+    Object.assign(__state.localStorage, state.localStorage);
+    Object.assign(__state.sessionStorage, state.sessionStorage);
+    __clock = clock;
+    __epoch = epoch;
+    location._href = url;
+    __historyStack = [{state: null, href: url}];
+    __historyIndex = 0;
+    return null;
+}
+
+function __loadDocument(html) {
+    __parseHTML(html).forEach(function (node) {
+        if (node.nodeType === 1) {
+            node.parentNode = document;
+            document.childNodes.push(node);
+        }
+    });
+    if (!document.documentElement) {
+        var htmlElement = new Element("html");
+        htmlElement.parentNode = document;
+        document.childNodes.push(htmlElement);
+    }
+    ["head", "body"].forEach(function (name) {
+        if (!document.querySelector(name)) document.documentElement.appendChild(new Element(name));
+    });
+    document.activeElement = document.body;
+    return JSON.stringify(__select(document, "script", false).map(function (script) {
+        return {src: script.hasAttribute("src") ? script.src : null, text: script.textContent};
+    }));
+}
+
+function __finishLoad() {
+    document.readyState = "interactive";
+    document.dispatchEvent(new Event("DOMContentLoaded", {bubbles: true}));
+    document.readyState = "complete";
+    window.dispatchEvent(new Event("load"));
+    __drain(function () { return false; }, 0);
+    return __result(null);
+}
+
+function __exportState() {
+    __liveCookies();
+    return JSON.stringify({state: __state, clock: __clock, console: __console.splice(0)});
+}
+
+function __execute(source, argsJson) {
+    var result = new Function(source).apply(window, __fromWire(JSON.parse(argsJson)));
+    return __result(result);
+}
+
+function __executeAsync(source, argsJson, timeoutMs) {
+    var outcome = {done: false, value: null}, args = __fromWire(JSON.parse(argsJson));
+    args.push(function (value) {
+        if (!outcome.done) {
+            outcome.done = true;
+            outcome.value = value;
+        }
+    });
+    new Function(source).apply(window, args);
+    if (!__drain(function () { return outcome.done; }, timeoutMs)) {
+        throw new Error("script timeout: result was not received in " + timeoutMs + " ms");
+    }
+    return __result(outcome.value);
+}
+
+function __elementCommand(id, command, argument) {
+    var element = __node(id);
+    switch (command) {
+        case "click":
+            if (!__isRendered(element)) throw new Error("element not interactable: the element is not rendered");
+            element.focus();
+            element.click();
+            return __result(null);
+        case "clear":
+            element.value = "";
+            element.dispatchEvent(new Event("input", {bubbles: true}));
+            element.dispatchEvent(new Event("change", {bubbles: true}));
+            return __result(null);
+        case "send_keys":
+            if (!__isRendered(element)) throw new Error("element not interactable: the element is not rendered");
+            element.focus();
+            argument.text.split("").forEach(function (character) {
+                element.dispatchEvent(new KeyboardEvent("keydown", {bubbles: true, key: character}));
+                element.value = element.value + character;
+                element.dispatchEvent(new Event("input", {bubbles: true}));
+                element.dispatchEvent(new KeyboardEvent("keyup", {bubbles: true, key: character}));
+            });
+            if (argument.submit && element.form) {
+                var button = __find(element.form, function (node) {
+                    return (node.localName === "input" || node.localName === "button") && node.type === "submit";
+                }, true);
+                if (button) button.click(); else element.form.requestSubmit();
+            }
+            return __result(null);
+        case "text":
+            return __result(__isRendered(element) ? element.innerText.trim() : "");
+        case "attribute":
+            var property = element[argument.name];
+            return __result(property !== undefined && property !== null && typeof property !== "object" && typeof property !== "function"
+                ? String(property) : element.getAttribute(argument.name));
+        case "displayed":
+            return __result(__isRendered(element));
+        case "enabled":
+            return __result(!element.disabled);
+        case "tag_name":
+            return __result(element.localName);
+    }
+    throw new Error("unknown command: " + command);
+}
+
+function __findElements(by, value, parentId) {
+    var root = parentId === null ? document : __node(parentId);
+    var selector = {
+        "id": '[id="' + value + '"]',
+        "name": '[name="' + value + '"]',
+        "class name": "." + CSS.escape(value),
+        "tag name": value,
+        "css selector": value
+    }[by];
+    if (selector === undefined) throw new Error("invalid selector: '" + by + "' locators are not supported by the in-process DOM backend");
+    return __result(root.querySelectorAll(selector));
+}
@@ -0,0 +1,470 @@
+/*
+ * Local stand-in for https://www.saucedemo.com used by the test suite.
+ *
+ * It mirrors the DOM of the real shop (ids, class names and data-test attributes),
+ * keeps the session in the `session-username` cookie and the cart in the
+ * `cart-contents` localStorage entry, and routes between pages with the History API.
+ */
+(function () {
+  "use strict";
+
+  var SESSION_COOKIE = "session-username";
+  var CART_KEY = "cart-contents";
+  var SESSION_LIFETIME_MS = 10 * 60 * 1000;
+  var PASSWORD = "secret_sauce";
+  var USERS = ["standard_user", "locked_out_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"];
+  var TAX_RATE = 0.08;
+
+  var ITEMS = [
+    {id: 4, name: "Sauce Labs Backpack", price: 29.99, image: "sauce-backpack-1200x1500.svg",
+      desc: "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection."},
+    {id: 0, name: "Sauce Labs Bike Light", price: 9.99, image: "bike-light-1200x1500.svg",
+      desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+    {id: 1, name: "Sauce Labs Bolt T-Shirt", price: 15.99, image: "bolt-shirt-1200x1500.svg",
+      desc: "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt."},
+    {id: 5, name: "Sauce Labs Fleece Jacket", price: 49.99, image: "sauce-pullover-1200x1500.svg",
+      desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."},
+    {id: 2, name: "Sauce Labs Onesie", price: 7.99, image: "red-onesie-1200x1500.svg",
+      desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+    {id: 3, name: "Test.allTheThings() T-Shirt (Red)", price: 15.99, image: "red-tatt-1200x1500.svg",
+      desc: "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton."}
+  ];
+
+  var PROTECTED_PAGES = ["/inventory.html", "/inventory-item.html", "/cart.html",
+    "/checkout-step-one.html", "/checkout-step-two.html", "/checkout-complete.html"];
+
+  var root = document.getElementById("root");
+  var state = {loginError: "", checkoutError: "", sort: "az", menuOpen: false};
+
+  // --- Session and cart -------------------------------------------------
+
+  function getUser() {
+    var match = document.cookie.match(new RegExp("(?:^|; )" + SESSION_COOKIE + "=([^;]*)"));
+    return match ? decodeURIComponent(match[1]) : null;
+  }
+
+  function setUser(username) {
+    var expires = new Date(Date.now() + SESSION_LIFETIME_MS).toUTCString();
+    document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(username) + "; expires=" + expires + "; path=/";
+  }
+
+  function clearUser() {
+    document.cookie = SESSION_COOKIE + "=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/";
+  }
+
+  function getCart() {
+    try {
+      var cart = JSON.parse(localStorage.getItem(CART_KEY) || "[]");
+      return Array.isArray(cart) ? cart : [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function setCart(cart) {
+    if (cart.length) {
+      localStorage.setItem(CART_KEY, JSON.stringify(cart));
+    } else {
+      localStorage.removeItem(CART_KEY);
+    }
+  }
+
+  function addToCart(id) {
+    var cart = getCart();
+    if (cart.indexOf(id) === -1) {
+      cart.push(id);
+      setCart(cart);
+    }
+  }
+
+  function removeFromCart(id) {
+    setCart(getCart().filter(function (itemId) { return itemId !== id; }));
+  }
+
+  function itemById(id) {
+    for (var i = 0; i < ITEMS.length; i++) {
+      if (ITEMS[i].id === id) return ITEMS[i];
+    }
+    return null;
+  }
+
+  // --- Helpers ------------------------------------------------------------
+
+  function slug(name) {
+    return name.replace(/\s+/g, "-").toLowerCase();
+  }
+
+  function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, function (c) {
+      return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+    });
+  }
+
+  function money(value) {
+    return "$" + value.toFixed(2);
+  }
+
+  function navigate(path) {
+    history.pushState(null, "", path);
+    render();
+  }
+
+  // --- Templates ----------------------------------------------------------
+
+  function errorBox(message) {
+    if (!message) return '<div class="error-message-container"></div>';
+    return '<div class="error-message-container error"><h3 data-test="error">' +
+      '<button class="error-button" data-test="error-button"><svg width="10" height="10" viewBox="0 0 10 10" ' +
+      'aria-hidden="true"><path d="M1 1l8 8M9 1l-8 8" stroke="currentColor" stroke-width="2"/></svg></button>' +
+      escapeHtml(message) + '</h3></div>';
+  }
+
+  function inventoryButton(item, inCart, extraClass) {
+    var action = inCart ? "remove" : "add-to-cart";
+    var style = inCart ? "btn_secondary" : "btn_primary";
+    var label = inCart ? "Remove" : "Add to cart";
+    var id = action + "-" + slug(item.name);
+    return '<button class="btn ' + style + ' btn_small ' + extraClass + '" data-test="' + escapeHtml(id) +
+      '" id="' + escapeHtml(id) + '" name="' + escapeHtml(id) + '" data-item-id="' + item.id + '">' + label + '</button>';
+  }
+
+  function header(title, secondary) {
+    var count = getCart().length;
+    var badge = count ? '<span class="shopping_cart_badge" data-test="shopping-cart-badge">' + count + '</span>' : "";
+    return '<div class="header_container" id="header_container" data-test="header-container">' +
+      '<div class="primary_header" data-test="primary-header">' +
+      '<div id="menu_button_container"><div class="bm-burger-button">' +
+      '<button type="button" id="react-burger-menu-btn">Open Menu</button></div>' +
+      '<div class="bm-menu-wrap' + (state.menuOpen ? " open" : "") + '" aria-hidden="' + !state.menuOpen + '">' +
+      '<nav class="bm-item-list">' +
+      '<a id="inventory_sidebar_link" class="bm-item menu-item" data-test="inventory-sidebar-link" href="#">All Items</a>' +
+      '<a id="about_sidebar_link" class="bm-item menu-item" data-test="about-sidebar-link" href="https://saucelabs.com/">About</a>' +
+      '<a id="logout_sidebar_link" class="bm-item menu-item" data-test="logout-sidebar-link" href="#">Logout</a>' +
+      '<a id="reset_sidebar_link" class="bm-item menu-item" data-test="reset-sidebar-link" href="#">Reset App State</a>' +
+      '</nav><button type="button" id="react-burger-cross-btn">Close Menu</button></div></div>' +
+      '<div class="header_label"><div class="app_logo">Swag Labs</div></div>' +
+      '<div id="shopping_cart_container" class="shopping_cart_container">' +
+      '<a class="shopping_cart_link" data-test="shopping-cart-link">' + badge + '</a></div></div>' +
+      '<div class="header_secondary_container" data-test="secondary-header">' +
+      '<span class="title" data-test="title">' + escapeHtml(title) + '</span>' + (secondary || "") + '</div></div>';
+  }
+
+  function footer() {
+    return '<footer class="footer" data-test="footer"><div class="footer_copy" data-test="footer-copy">' +
+      '&copy; 2024 Sauce Labs. All Rights Reserved. Terms of Service | Privacy Policy</div></footer>';
+  }
+
+  function page(title, secondary, body, containerId) {
+    return '<div class="page_wrapper" id="page_wrapper"><div id="contents_wrapper">' +
+      header(title, secondary) +
+      '<div id="' + containerId + '" class="' + containerId + '" data-test="' + containerId.replace(/_/g, "-") + '">' +
+      body + '</div></div>' + footer() + '</div>';
+  }
+
+  function cartItem(item, withButton) {
+    return '<div class="cart_item" data-test="inventory-item">' +
+      '<div class="cart_quantity" data-test="item-quantity">1</div>' +
+      '<div class="cart_item_label">' +
+      '<a href="#" id="item_' + item.id + '_title_link" data-test="item-' + item.id + '-title-link">' +
+      '<div class="inventory_item_name" data-test="inventory-item-name">' + escapeHtml(item.name) + '</div></a>' +
+      '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(item.desc) + '</div>' +
+      '<div class="item_pricebar" data-test="item-pricebar">' +
+      '<div class="inventory_item_price" data-test="inventory-item-price">' + money(item.price) + '</div>' +
+      (withButton ? inventoryButton(item, true, "cart_button") : "") +
+      '</div></div></div>';
+  }
+
+  function cartItems(withButton) {
+    return getCart().map(itemById).filter(Boolean).map(function (item) {
+      return cartItem(item, withButton);
+    }).join("");
+  }
+
+  function sortedItems() {
+    var items = ITEMS.slice();
+    var comparators = {
+      az: function (a, b) { return a.name.localeCompare(b.name); },
+      za: function (a, b) { return b.name.localeCompare(a.name); },
+      lohi: function (a, b) { return a.price - b.price || a.name.localeCompare(b.name); },
+      hilo: function (a, b) { return b.price - a.price || a.name.localeCompare(b.name); }
+    };
+    return items.sort(comparators[state.sort]);
+  }
+
+  // --- Pages --------------------------------------------------------------
+
+  function loginPage() {
+    var inputClass = state.loginError ? "input_error form_input error" : "input_error form_input";
+    return '<div class="login_container"><div class="login_logo">Swag Labs</div>' +
+      '<div class="login_wrapper" data-test="login-container"><div class="login_wrapper-inner">' +
+      '<div id="login_button_container" class="form_column"><div class="login-box"><form>' +
+      '<div class="form_group"><input class="' + inputClass + '" placeholder="Username" type="text" ' +
+      'data-test="username" id="user-name" name="user-name" autocorrect="off" autocapitalize="none" value=""></div>' +
+      '<div class="form_group"><input class="' + inputClass + '" placeholder="Password" type="password" ' +
+      'data-test="password" id="password" name="password" autocorrect="off" autocapitalize="none" value=""></div>' +
+      errorBox(state.loginError) +
+      '<input type="submit" class="submit-button btn_action" data-test="login-button" id="login-button" ' +
+      'name="login-button" value="Login"></form></div></div></div>' +
+      '<div class="login_credentials_wrap" data-test="login-credentials-container">' +
+      '<div class="login_credentials" id="login_credentials" data-test="login-credentials">' +
+      '<h4>Accepted usernames are:</h4>' + USERS.join("<br>") + '</div>' +
+      '<div class="login_password" data-test="login-password"><h4>Password for all users:</h4>' + PASSWORD + '</div>' +
+      '</div></div></div>';
+  }
+
+  function inventoryPage() {
+    var cart = getCart();
+    var sortSelect = '<div class="right_component"><span class="select_container">' +
+      '<select class="product_sort_container" data-test="product-sort-container">' +
+      [["az", "Name (A to Z)"], ["za", "Name (Z to A)"], ["lohi", "Price (low to high)"], ["hilo", "Price (high to low)"]]
+        .map(function (option) {
+          return '<option value="' + option[0] + '"' + (state.sort === option[0] ? " selected" : "") + '>' + option[1] + '</option>';
+        }).join("") +
+      '</select></span></div>';
+    var list = sortedItems().map(function (item) {
+      return '<div class="inventory_item" data-test="inventory-item">' +
+        '<div class="inventory_item_img"><a href="#" id="item_' + item.id + '_img_link" data-test="item-' + item.id + '-img-link">' +
+        '<img alt="' + escapeHtml(item.name) + '" class="inventory_item_img" src="/static/media/' + item.image + '" ' +
+        'data-test="inventory-item-' + escapeHtml(slug(item.name)) + '-img"></a></div>' +
+        '<div class="inventory_item_description" data-test="inventory-item-description">' +
+        '<div class="inventory_item_label">' +
+        '<a href="#" id="item_' + item.id + '_title_link" data-test="item-' + item.id + '-title-link">' +
+        '<div class="inventory_item_name " data-test="inventory-item-name">' + escapeHtml(item.name) + '</div></a>' +
+        '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(item.desc) + '</div></div>' +
+        '<div class="pricebar"><div class="inventory_item_price" data-test="inventory-item-price">' + money(item.price) + '</div>' +
+        inventoryButton(item, cart.indexOf(item.id) !== -1, "btn_inventory ") + '</div></div></div>';
+    }).join("");
+    return page("Products", sortSelect,
+      '<div><div id="inventory_container" class="inventory_container" data-test="inventory-container">' +
+      '<div class="inventory_list" data-test="inventory-list">' + list + '</div></div></div>',
+      "inventory_container");
+  }
+
+  function inventoryItemPage() {
+    var id = parseInt(new URLSearchParams(location.search).get("id"), 10);
+    var item = itemById(id);
+    var back = '<button class="btn btn_secondary back btn_large inventory_details_back_button" ' +
+      'data-test="back-to-products" id="back-to-products" name="back-to-products">Back to products</button>';
+    if (!item) {
+      return page("", back, '<div class="inventory_details"><div class="inventory_details_name large_size" ' +
+        'data-test="inventory-item-name">ITEM NOT FOUND</div></div>', "inventory_item_container");
+    }
+    var inCart = getCart().indexOf(item.id) !== -1;
+    var button = '<button class="btn ' + (inCart ? "btn_secondary" : "btn_primary") + ' btn_small btn_inventory" ' +
+      'data-test="' + (inCart ? "remove" : "add-to-cart") + '" id="' + (inCart ? "remove" : "add-to-cart") + '" ' +
+      'name="' + (inCart ? "remove" : "add-to-cart") + '" data-item-id="' + item.id + '">' + (inCart ? "Remove" : "Add to cart") + '</button>';
+    return page("", back,
+      '<div class="inventory_details" data-test="inventory-container"><div class="inventory_details_container">' +
+      '<div class="inventory_details_img_container"><img alt="' + escapeHtml(item.name) + '" class="inventory_details_img" ' +
+      'src="/static/media/' + item.image + '" data-test="item-' + escapeHtml(slug(item.name)) + '-img"></div>' +
+      '<div class="inventory_details_desc_container">' +
+      '<div class="inventory_details_name large_size" data-test="inventory-item-name">' + escapeHtml(item.name) + '</div>' +
+      '<div class="inventory_details_desc large_size" data-test="inventory-item-desc">' + escapeHtml(item.desc) + '</div>' +
+      '<div class="inventory_details_price" data-test="inventory-item-price">' + money(item.price) + '</div>' +
+      button + '</div></div></div>',
+      "inventory_item_container");
+  }
+
+  function cartPage() {
+    return page("Your Cart", "",
+      '<div><div class="cart_list" data-test="cart-list">' +
+      '<div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>' +
+      '<div class="cart_desc_label" data-test="cart-desc-label">Description</div>' +
+      cartItems(true) + '</div>' +
+      '<div class="cart_footer"><button class="btn btn_secondary back btn_medium" data-test="continue-shopping" ' +
+      'id="continue-shopping" name="continue-shopping">Continue Shopping</button>' +
+      '<button class="btn btn_action btn_medium checkout_button " data-test="checkout" id="checkout" ' +
+      'name="checkout">Checkout</button></div></div>',
+      "cart_contents_container");
+  }
+
+  function checkoutStepOnePage() {
+    var inputClass = state.checkoutError ? "input_error form_input error" : "input_error form_input";
+    function input(id, dataTest, placeholder) {
+      return '<div class="form_group"><input class="' + inputClass + '" placeholder="' + placeholder + '" type="text" ' +
+        'data-test="' + dataTest + '" id="' + id + '" name="' + id + '" autocorrect="off" autocapitalize="none" value=""></div>';
+    }
+    return page("Checkout: Your Information", "",
+      '<div class="checkout_info_wrapper"><form>' +
+      '<div class="checkout_info" data-test="checkout-info-container">' +
+      input("first-name", "firstName", "First Name") +
+      input("last-name", "lastName", "Last Name") +
+      input("postal-code", "postalCode", "Zip/Postal Code") +
+      errorBox(state.checkoutError) + '</div>' +
+      '<div class="checkout_buttons"><button class="btn btn_secondary back btn_medium cart_cancel_link" ' +
+      'data-test="cancel" id="cancel" name="cancel">Cancel</button>' +
+      '<input type="submit" class="submit-button btn btn_primary cart_button btn_action" data-test="continue" ' +
+      'id="continue" name="continue" value="Continue"></div></form></div>',
+      "checkout_info_container");
+  }
+
+  function checkoutStepTwoPage() {
+    var subtotal = getCart().map(itemById).filter(Boolean).reduce(function (sum, item) {
+      return sum + item.price;
+    }, 0);
+    var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+    return page("Checkout: Overview", "",
+      '<div><div class="cart_list" data-test="cart-list">' +
+      '<div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>' +
+      '<div class="cart_desc_label" data-test="cart-desc-label">Description</div>' +
+      cartItems(false) + '</div>' +
+      '<div class="summary_info">' +
+      '<div class="summary_info_label" data-test="payment-info-label">Payment Information:</div>' +
+      '<div class="summary_value_label" data-test="payment-info-value">SauceCard #31337</div>' +
+      '<div class="summary_info_label" data-test="shipping-info-label">Shipping Information:</div>' +
+      '<div class="summary_value_label" data-test="shipping-info-value">Free Pony Express Delivery!</div>' +
+      '<div class="summary_info_label" data-test="total-info-label">Price Total</div>' +
+      '<div class="summary_subtotal_label" data-test="subtotal-label">Item total: ' + money(subtotal) + '</div>' +
+      '<div class="summary_tax_label" data-test="tax-label">Tax: ' + money(tax) + '</div>' +
+      '<div class="summary_info_label summary_total_label" data-test="total-label">Total: ' + money(subtotal + tax) + '</div>' +
+      '<div class="cart_footer"><button class="btn btn_secondary back btn_medium cart_cancel_link" ' +
+      'data-test="cancel" id="cancel" name="cancel">Cancel</button>' +
+      '<button class="btn btn_action btn_medium cart_button" data-test="finish" id="finish" name="finish">Finish</button>' +
+      '</div></div></div>',
+      "checkout_summary_container");
+  }
+
+  function checkoutCompletePage() {
+    return page("Checkout: Complete!", "",
+      '<img alt="Pony Express" class="pony_express" src="/static/media/pony-express.svg" data-test="pony-express">' +
+      '<h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>' +
+      '<div class="complete-text" data-test="complete-text">Your order has been dispatched, and will arrive just ' +
+      'as fast as the pony can get there!</div>' +
+      '<button class="btn btn_primary btn_small" data-test="back-to-products" id="back-to-products" ' +
+      'name="back-to-products">Back Home</button>',
+      "checkout_complete_container");
+  }
+
+  var PAGES = {
+    "/": loginPage,
+    "/index.html": loginPage,
+    "/inventory.html": inventoryPage,
+    "/inventory-item.html": inventoryItemPage,
+    "/cart.html": cartPage,
+    "/checkout-step-one.html": checkoutStepOnePage,
+    "/checkout-step-two.html": checkoutStepTwoPage,
+    "/checkout-complete.html": checkoutCompletePage
+  };
+
+  function render() {
+    var path = location.pathname;
+    if (PROTECTED_PAGES.indexOf(path) !== -1 && !getUser()) {
+      state.loginError = "Epic sadface: You can only access '" + path + "' when you are logged in.";
+      history.replaceState(null, "", "/");
+      path = "/";
+    }
+    root.innerHTML = (PAGES[path] || loginPage)();
+  }
+
+  // --- Actions ------------------------------------------------------------
+
+  function submitLogin() {
+    var username = document.getElementById("user-name").value;
+    var password = document.getElementById("password").value;
+    if (!username) {
+      state.loginError = "Epic sadface: Username is required";
+    } else if (!password) {
+      state.loginError = "Epic sadface: Password is required";
+    } else if (USERS.indexOf(username) === -1 || password !== PASSWORD) {
+      state.loginError = "Epic sadface: Username and password do not match any user in this service";
+    } else if (username === "locked_out_user") {
+      state.loginError = "Epic sadface: Sorry, this user has been locked out.";
+    } else {
+      state.loginError = "";
+      setUser(username);
+      navigate("/inventory.html");
+      return;
+    }
+    render();
+    document.getElementById("user-name").value = username;
+    document.getElementById("password").value = password;
+  }
+
+  function submitCheckoutInformation() {
+    var values = {
+      firstName: document.getElementById("first-name").value,
+      lastName: document.getElementById("last-name").value,
+      postalCode: document.getElementById("postal-code").value
+    };
+    if (!values.firstName) {
+      state.checkoutError = "Error: First Name is required";
+    } else if (!values.lastName) {
+      state.checkoutError = "Error: Last Name is required";
+    } else if (!values.postalCode) {
+      state.checkoutError = "Error: Postal Code is required";
+    } else {
+      state.checkoutError = "";
+      navigate("/checkout-step-two.html");
+      return;
+    }
+    render();
+    document.getElementById("first-name").value = values.firstName;
+    document.getElementById("last-name").value = values.lastName;
+    document.getElementById("postal-code").value = values.postalCode;
+  }
+
+  var CLICK_ACTIONS = {
+    "error-button": function () {
+      state.loginError = "";
+      state.checkoutError = "";
+      render();
+    },
+    "shopping-cart-link": function () { navigate("/cart.html"); },
+    "react-burger-menu-btn": function () { state.menuOpen = true; render(); },
+    "react-burger-cross-btn": function () { state.menuOpen = false; render(); },
+    "inventory_sidebar_link": function () { state.menuOpen = false; navigate("/inventory.html"); },
+    "logout_sidebar_link": function () { state.menuOpen = false; clearUser(); navigate("/"); },
+    "reset_sidebar_link": function () { setCart([]); render(); },
+    "continue-shopping": function () { navigate("/inventory.html"); },
+    "checkout": function () { navigate("/checkout-step-one.html"); },
+    "cancel": function () {
+      state.checkoutError = "";
+      navigate(location.pathname === "/checkout-step-one.html" ? "/cart.html" : "/inventory.html");
+    },
+    "finish": function () { setCart([]); navigate("/checkout-complete.html"); },
+    "back-to-products": function () { navigate("/inventory.html"); }
+  };
+
+  document.addEventListener("click", function (event) {
+    var target = event.target.closest("button, a, input[type=submit]");
+    if (!target) return;
+    var key = target.getAttribute("data-test") || target.id;
+    var itemId = target.getAttribute("data-item-id");
+
+    if (target.tagName === "A" && /^item_\d+_(title|img)_link$/.test(target.id)) {
+      event.preventDefault();
+      navigate("/inventory-item.html?id=" + target.id.split("_")[1]);
+    } else if (itemId !== null && /^(add-to-cart|remove)/.test(key)) {
+      event.preventDefault();
+      if (key.indexOf("remove") === 0) {
+        removeFromCart(parseInt(itemId, 10));
+      } else {
+        addToCart(parseInt(itemId, 10));
+      }
+      render();
+    } else if (CLICK_ACTIONS[key] || CLICK_ACTIONS[target.id]) {
+      event.preventDefault();
+      (CLICK_ACTIONS[key] || CLICK_ACTIONS[target.id])();
+    }
+  });
+
+  document.addEventListener("submit", function (event) {
+    event.preventDefault();
+    if (document.getElementById("login-button")) {
+      submitLogin();
+    } else if (document.getElementById("continue")) {
+      submitCheckoutInformation();
+    }
+  });
+
+  document.addEventListener("change", function (event) {
+    if (event.target.matches(".product_sort_container")) {
+      state.sort = event.target.value;
+      render();
+    }
+  });
+
+  window.addEventListener("popstate", render);
+
+  render();
+})();
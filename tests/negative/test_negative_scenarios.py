@@ -1,10 +1,13 @@
 import pytest
 import allure
+from selenium.common.exceptions import TimeoutException
 from pages.login_page import LoginPage
 
 # --- Test Data ---
 VALID_USER = "standard_user"
 INVALID_PASSWORD = "wrong_password"
+ITEM_1 = "Sauce Labs Backpack"
+UNKNOWN_ITEM = "Sauce Labs Hoverboard"
 
 
 @pytest.mark.negative
@@ -27,3 +30,15 @@ class TestNegativeScenarios:
 
         assert actual_error == expected_error, "Error message for invalid login is incorrect."
         assert "inventory.html" not in login_page.get_current_url(), "User was redirected to inventory despite invalid login."
+
+    @pytest.mark.browserless
+    @allure.title("Test Batch with an Unknown Item Leaves the Cart Unchanged")
+    @allure.description("Verify that a batched add fails without adding anything when one of the items does not exist.")
+    def test_batch_with_unknown_item_changes_nothing(self, session_seeder):
+        """
+        Tests that a batched cart operation is all or nothing.
+        """
+        inventory_page = session_seeder.open_inventory(VALID_USER)
+        with pytest.raises(TimeoutException):
+            inventory_page.add_items_to_cart([ITEM_1, UNKNOWN_ITEM])
+        assert inventory_page.get_cart_badge_item_count() == 0, "Items were added although the batch failed."
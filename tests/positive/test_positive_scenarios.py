@@ -7,6 +7,14 @@ VALID_USER = "standard_user"
 VALID_PASSWORD = "secret_sauce"
 ITEM_1 = "Sauce Labs Backpack"
 ITEM_2 = "Sauce Labs Bike Light"
+ALL_ITEMS = [
+    "Sauce Labs Backpack",
+    "Sauce Labs Bike Light",
+    "Sauce Labs Bolt T-Shirt",
+    "Sauce Labs Fleece Jacket",
+    "Sauce Labs Onesie",
+    "Test.allTheThings() T-Shirt (Red)",
+]
 CHECKOUT_INFO = {
     "first_name": "John",
     "last_name": "Doe",
@@ -25,66 +33,92 @@ class TestPositiveScenarios:
     def test_successful_login(self, driver):
         """
         Tests successful login with valid credentials.
+        This is the smoke test for the real login UI; other tests start from a seeded session.
         """
         login_page = LoginPage(driver).open()
         inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
         assert inventory_page.get_title() == "Products", "Failed to log in successfully."
 
+    @pytest.mark.browserless
     @allure.title("Test Add Single Item to Cart")
     @allure.description("Verify that a user can add a single item to the shopping cart.")
-    def test_add_single_item_to_cart(self, driver):
+    def test_add_single_item_to_cart(self, session_seeder):
         """
         Tests adding a single item to the cart.
         """
-        login_page = LoginPage(driver).open()
-        inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
+        inventory_page = session_seeder.open_inventory(VALID_USER)
         inventory_page.add_item_to_cart(ITEM_1)
         assert inventory_page.get_cart_badge_item_count() == 1, "Cart badge count is not 1."
         cart_page = inventory_page.go_to_cart()
         assert cart_page.get_cart_items_count() == 1, "Item was not added to the cart."
 
+    @pytest.mark.browserless
     @allure.title("Test Add Multiple Items to Cart")
     @allure.description("Verify that a user can add multiple items to the shopping cart.")
-    def test_add_multiple_items_to_cart(self, driver):
+    def test_add_multiple_items_to_cart(self, session_seeder):
         """
         Tests adding multiple items to the cart.
         """
-        login_page = LoginPage(driver).open()
-        inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
+        inventory_page = session_seeder.open_inventory(VALID_USER)
         inventory_page.add_item_to_cart(ITEM_1)
         inventory_page.add_item_to_cart(ITEM_2)
         assert inventory_page.get_cart_badge_item_count() == 2, "Cart badge count is not 2."
         cart_page = inventory_page.go_to_cart()
         assert cart_page.get_cart_items_count() == 2, "Not all items were added to the cart."
 
+    @pytest.mark.browserless
+    @allure.title("Test Add and Remove Items in Bulk")
+    @allure.description("Verify that all items can be added on the inventory page and removed on the cart page in one batch.")
+    def test_add_and_remove_items_in_bulk(self, session_seeder):
+        """
+        Tests the batched cart operations of the inventory and cart pages.
+        """
+        inventory_page = session_seeder.open_inventory(VALID_USER)
+        inventory_page.add_items_to_cart(ALL_ITEMS)
+        assert inventory_page.get_cart_badge_item_count() == len(ALL_ITEMS), "Not all items were added to the cart."
+
+        cart_page = inventory_page.go_to_cart()
+        cart_page.remove_items(ALL_ITEMS)
+        assert cart_page.get_cart_items_count() == 0, "Not all items were removed from the cart."
+
+    @pytest.mark.browserless
+    @allure.title("Test Item Prices in the Cart")
+    @allure.description("Verify that the cart lists items at the prices shown on the inventory page.")
+    def test_cart_keeps_item_prices(self, session_seeder):
+        """
+        Tests that item prices carry over from the inventory page to the cart.
+        """
+        inventory_page = session_seeder.open_inventory(VALID_USER)
+        prices = {item: inventory_page.get_item_price(item) for item in (ITEM_1, ITEM_2)}
+        inventory_page.add_items_to_cart([ITEM_1, ITEM_2])
+
+        cart_page = inventory_page.go_to_cart()
+        for item, price in prices.items():
+            assert cart_page.get_item_price(item) == price, f"Price of '{item}' changed in the cart."
+
+    @pytest.mark.browserless
     @allure.title("Test Remove Item from Cart")
     @allure.description("Verify that a user can remove an item from the shopping cart.")
-    def test_remove_item_from_cart(self, driver):
+    def test_remove_item_from_cart(self, session_seeder):
         """
         Tests removing an item from the cart.
         """
-        login_page = LoginPage(driver).open()
-        inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
-        inventory_page.add_item_to_cart(ITEM_1)
-        assert inventory_page.get_cart_badge_item_count() == 1, "Precondition failed: Item not added."
+        cart_page = session_seeder.open_cart(VALID_USER, [ITEM_1])
+        assert cart_page.get_cart_items_count() == 1, "Precondition failed: Item not in the cart."
 
-        cart_page = inventory_page.go_to_cart()
         cart_page.remove_item(ITEM_1)
         assert cart_page.get_cart_items_count() == 0, "Item was not removed from the cart."
 
     @allure.title("Test Successful Checkout")
     @allure.description("Verify that a user can complete the checkout process successfully.")
-    def test_successful_checkout(self, driver):
+    def test_successful_checkout(self, session_seeder):
         """
         Tests the full, successful checkout process.
         """
-        # 1. Login and add item
-        login_page = LoginPage(driver).open()
-        inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
-        inventory_page.add_item_to_cart(ITEM_1)
+        # 1. Start logged in with an item in the cart
+        cart_page = session_seeder.open_cart(VALID_USER, [ITEM_1])
 
-        # 2. Go to cart and checkout
-        cart_page = inventory_page.go_to_cart()
+        # 2. Checkout
         checkout_step_one = cart_page.go_to_checkout()
 
         # 3. Fill info and continue
@@ -100,3 +134,29 @@ class TestPositiveScenarios:
         checkout_complete = checkout_step_two.click_finish()
         assert checkout_complete.get_title() == "Checkout: Complete!", "Checkout was not completed."
         assert checkout_complete.get_complete_header_text() == "Thank you for your order!", "Final confirmation message is incorrect."
+
+    @pytest.mark.visual_baselines("lean")
+    @allure.title("Test Inventory, Cart and Checkout Look Unchanged")
+    @allure.description("Verify the inventory, cart and checkout pages against their baseline screenshots.")
+    def test_pages_look_unchanged(self, session_seeder):
+        """
+        Tests the look of the shopping pages against the baselines recorded with the lean profile.
+        """
+        inventory_page = session_seeder.open_inventory(VALID_USER)
+        inventory_page.assert_visual("page")
+
+        cart_page = session_seeder.open_cart(VALID_USER, [ITEM_1])
+        cart_page.assert_visual("page")
+
+        checkout_step_one = cart_page.go_to_checkout()
+        checkout_step_one.fill_information(
+            CHECKOUT_INFO["first_name"],
+            CHECKOUT_INFO["last_name"],
+            CHECKOUT_INFO["postal_code"]
+        )
+        # The entered text shows a blinking caret, so the form fields are masked
+        checkout_step_one.assert_visual("page", masks=[
+            checkout_step_one.FIRST_NAME_INPUT,
+            checkout_step_one.LAST_NAME_INPUT,
+            checkout_step_one.POSTAL_CODE_INPUT,
+        ])
@@ -0,0 +1,73 @@
+import itertools
+
+import pytest
+import allure
+from utils.combinatorial import covering_array
+
+# --- Test Data ---
+DOMAINS = {
+    "username": ["standard_user", "problem_user", "performance_glitch_user"],
+    "first_name": ["John", "", "Ünïcødé"],
+    "last_name": ["Doe", ""],
+    "postal_code": ["12345", "", "ABC-1"],
+    "items": [1, 2, 6],
+}
+
+
+def uncovered(cases: list[dict], domains: dict, strength: int) -> list:
+    """
+    Returns every combination of `strength` input values that no case contains.
+    """
+    missing = []
+    for names in itertools.combinations(domains, strength):
+        for values in itertools.product(*(domains[name] for name in names)):
+            if not any(all(case[name] == value for name, value in zip(names, values)) for case in cases):
+                missing.append(dict(zip(names, values)))
+    return missing
+
+
+@pytest.mark.unit
+@allure.epic("Test Infrastructure")
+@allure.feature("Pairwise Test Data")
+class TestCoveringArray:
+
+    @allure.title("Test Every Pair of Values Is Covered")
+    def test_pairwise_covers_every_pair(self):
+        """
+        Tests that a strength 2 array covers every value pair of any two inputs with far fewer cases.
+        """
+        cases = covering_array(DOMAINS)
+        assert uncovered(cases, DOMAINS, 2) == [], "Some value pairs are not covered."
+        assert 9 <= len(cases) <= 15, f"{len(cases)} cases for 162 combinations."
+        assert all(set(case) == set(DOMAINS) for case in cases)
+
+    @allure.title("Test Cases Are Deterministic")
+    def test_same_domains_give_same_cases(self):
+        """
+        Tests that the same domains always produce the same cases in the same order.
+        """
+        assert covering_array(DOMAINS) == covering_array(dict(DOMAINS))
+
+    @allure.title("Test Strength 3 Covers Every Triple")
+    def test_three_wise(self):
+        """
+        Tests that a strength 3 array covers every value triple of any three inputs.
+        """
+        domains = {name: DOMAINS[name] for name in ("username", "last_name", "postal_code", "items")}
+        assert uncovered(covering_array(domains, strength=3), domains, 3) == []
+
+    @allure.title("Test Strength Is Capped by the Number of Inputs")
+    def test_strength_above_inputs_is_exhaustive(self):
+        """
+        Tests that asking for more strength than there are inputs yields the full product.
+        """
+        domains = {"a": [1, 2], "b": ["x", "y", "z"]}
+        assert len(covering_array(domains, strength=3)) == 6
+
+    @allure.title("Test Empty Domains Are Rejected")
+    def test_empty_domain(self):
+        """
+        Tests that an input without values is an error.
+        """
+        with pytest.raises(ValueError):
+            covering_array({"a": [1], "b": []})
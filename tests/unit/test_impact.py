@@ -0,0 +1,124 @@
+import subprocess
+import textwrap
+
+import pytest
+import allure
+from utils.impact import ImpactGraph, select_tests
+
+# --- Test Data ---
+PROJECT = {
+    "pages/base_page.py": """
+        class BasePage:
+            def click(self):
+                return "clicked"
+    """,
+    "pages/home_page.py": """
+        from pages.base_page import BasePage
+
+
+        class HomePage(BasePage):
+            def title(self):
+                return "Home"
+    """,
+    "pages/login_page.py": """
+        from pages.base_page import BasePage
+
+
+        class LoginPage(BasePage):
+            def login(self):
+                from pages.home_page import HomePage
+                self.click()
+                return HomePage()
+    """,
+    "utils/helpers.py": """
+        def slugify(text):
+            return text.lower()
+    """,
+    "tests/test_login.py": """
+        from pages.login_page import LoginPage
+
+
+        def test_login():
+            assert LoginPage().login().title() == "Home"
+    """,
+    "tests/test_helpers.py": """
+        from utils.helpers import slugify
+
+
+        def test_slugify():
+            assert slugify("A") == "a"
+
+
+        def test_untyped(page):
+            assert page.title()
+    """,
+}
+TESTS = {
+    "login": ["tests/test_login.py::test_login"],
+    "slugify": ["tests/test_helpers.py::test_slugify"],
+    "untyped": ["tests/test_helpers.py::test_untyped"],
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    """
+    A small committed project; `edit` replaces text in a file (new files start empty) and returns the selected tests.
+    """
+    root = tmp_path / "project"
+    for path, source in PROJECT.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(textwrap.dedent(source).lstrip(), encoding="utf-8")
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "initial"], cwd=root, check=True)
+
+    def edit(path, old, new):
+        file = root / path
+        text = file.read_text(encoding="utf-8") if file.exists() else ""
+        file.write_text(text.replace(old, new), encoding="utf-8")
+        return select_tests(ImpactGraph(root, tmp_path / "impact_graph.json"), "HEAD", TESTS)
+
+    return edit
+
+
+@pytest.mark.unit
+@allure.epic("Test Infrastructure")
+@allure.feature("Change-Based Test Selection")
+class TestImpactSelection:
+
+    @allure.title("Test a Page Method Change Selects the Tests Reaching It")
+    def test_method_reached_through_return_type(self, project):
+        """
+        Tests that a method is reached through the page object another method returns.
+        """
+        assert project("pages/home_page.py", '"Home"', '"Start"') == {"login"}
+
+    @allure.title("Test a Base Class Change Selects Its Subclasses' Tests")
+    def test_inherited_method(self, project):
+        """
+        Tests that a call on `self` reaches the method its base class defines.
+        """
+        assert project("pages/base_page.py", '"clicked"', '"pressed"') == {"login"}
+
+    @allure.title("Test a Helper Change Selects Only Its Importers")
+    def test_imported_function(self, project):
+        """
+        Tests that a helper change selects the test importing it and nothing else.
+        """
+        assert project("utils/helpers.py", "text.lower()", "text.casefold()") == {"slugify"}
+
+    @allure.title("Test Calls on Untyped Receivers Add No Dependency")
+    def test_unknown_receiver_is_not_linked(self, project):
+        """
+        Tests that `page.title()` on a parameter of unknown type is not linked to every `title` method.
+        """
+        assert "untyped" not in project("pages/home_page.py", '"Home"', '"Start"')
+
+    @allure.title("Test a conftest.py Change Selects Everything")
+    def test_conftest_change_selects_all(self, project):
+        """
+        Tests that a change that cannot be mapped to nodes affects every test.
+        """
+        assert project("tests/conftest.py", "", "import pytest\n") is None
@@ -0,0 +1,52 @@
+import pytest
+import allure
+from utils.parallel import lpt_shards, strip_option
+
+# --- Test Data ---
+DURATIONS = {f"test_{seconds}": float(seconds) for seconds in (7, 6, 5, 4, 3, 2, 1)}
+
+
+def loads(shards, durations):
+    return sorted(sum(durations[nodeid] for nodeid in shard) for shard in shards)
+
+
+@pytest.mark.unit
+@allure.epic("Test Infrastructure")
+@allure.feature("Parallel Sharding")
+class TestParallelSharding:
+
+    @allure.title("Test LPT Shards Are Balanced")
+    def test_lpt_balances_known_durations(self):
+        """
+        Tests that longest-first assignment spreads the known durations evenly.
+        """
+        shards = lpt_shards(list(DURATIONS), DURATIONS, 3)
+        assert sorted(nodeid for shard in shards for nodeid in shard) == sorted(DURATIONS), "Tests were lost or repeated."
+        assert loads(shards, DURATIONS) == [9.0, 9.0, 10.0], "Shards are not balanced."
+
+    @allure.title("Test Unknown Durations Count as the Average")
+    def test_lpt_uses_average_for_unknown_tests(self):
+        """
+        Tests that a test without a recorded duration weighs as much as the average known test.
+        """
+        durations = {"slow": 9.0, "fast": 1.0}
+        shards = lpt_shards(["slow", "fast", "new_a", "new_b"], durations, 2)
+        assert loads(shards, dict(durations, new_a=5.0, new_b=5.0)) == [10.0, 10.0], "Unknown tests were misweighted."
+
+    @allure.title("Test No Shard Is Empty")
+    def test_lpt_drops_empty_shards(self):
+        """
+        Tests that asking for more workers than tests yields one shard per test.
+        """
+        shards = lpt_shards(["a", "b"], {}, 4)
+        assert sorted(shards) == [["a"], ["b"]], "Empty shards were planned."
+
+    @allure.title("Test Options Are Stripped from Worker Arguments")
+    def test_strip_option(self):
+        """
+        Tests that options are removed with their values, and flags without one.
+        """
+        args = ["-q", "--workers", "4", "--clean-alluredir", "tests", "--workers=2", "--alluredir=out"]
+        args = strip_option(args, "--workers")
+        assert args == ["-q", "--clean-alluredir", "tests", "--alluredir=out"]
+        assert strip_option(args, "--clean-alluredir", takes_value=False) == ["-q", "tests", "--alluredir=out"]
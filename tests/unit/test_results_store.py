@@ -0,0 +1,76 @@
+import gzip
+import os
+
+import pytest
+import allure
+from utils.results_store import COMPRESS_THRESHOLD, ResultsStore
+
+# --- Test Data ---
+SCREENSHOT = b"\x89PNG fake screenshot"
+PAGE_SOURCE = b"<html>" + b"x" * COMPRESS_THRESHOLD + b"</html>"
+
+
+@pytest.mark.unit
+@allure.epic("Test Infrastructure")
+@allure.feature("Allure Results Store")
+class TestResultsStore:
+
+    @allure.title("Test Identical Files Are Stored Once")
+    def test_put_deduplicates_and_compresses(self, tmp_path):
+        """
+        Tests that identical content is one object and large text is gzip-compressed.
+        """
+        store = ResultsStore(tmp_path / "store")
+        first = store.put("a-attachment.png", SCREENSHOT)
+        second = store.put("b-attachment.png", SCREENSHOT)
+        source = store.put("c-attachment.html", PAGE_SOURCE)
+        store.flush()
+
+        assert first["sha256"] == second["sha256"], "Identical screenshots were hashed differently."
+        assert source["gzip"] and not first["gzip"], "Only the large page source should be compressed."
+        assert len(list(store.objects.glob("*/*"))) == 2, "Identical content was stored twice."
+        assert set(store.entries()) == {"a-attachment.png", "b-attachment.png", "c-attachment.html"}
+
+    @allure.title("Test Export Round-Trips and Skips Unchanged Files")
+    def test_export_round_trip(self, tmp_path):
+        """
+        Tests that exported files match what was put, and a second export writes nothing.
+        """
+        store = ResultsStore(tmp_path / "store")
+        store.put("a-attachment.png", SCREENSHOT)
+        store.put("c-attachment.html", PAGE_SOURCE)
+        store.flush()
+        results = tmp_path / "allure-results"
+
+        assert store.export(results) == (2, 0)
+        assert (results / "a-attachment.png").read_bytes() == SCREENSHOT
+        assert (results / "c-attachment.html").read_bytes() == PAGE_SOURCE, "The compressed object was not restored."
+        assert store.export(results) == (0, 2), "Unchanged files were written again."
+
+    @allure.title("Test Garbage Collection Keeps Only Referenced Objects")
+    def test_gc_after_reset(self, tmp_path):
+        """
+        Tests that gc deletes the objects of a discarded result set and keeps the current ones.
+        """
+        store = ResultsStore(tmp_path / "store")
+        store.put("old-attachment.html", PAGE_SOURCE)
+        store.flush()
+        store.reset_manifest()
+        entry = store.put("new-attachment.png", SCREENSHOT)
+        store.flush()
+
+        assert store.gc() == 1, "The unreferenced page source was not deleted."
+        assert store.gc() == 0
+        remaining = list(store.objects.glob("*/*"))
+        assert [path.name for path in remaining] == [entry["sha256"]], "A referenced object was deleted."
+
+    @allure.title("Test Compressed Objects Are Valid gzip")
+    def test_compressed_object(self, tmp_path):
+        """
+        Tests that a compressed object decompresses to the stored content.
+        """
+        store = ResultsStore(tmp_path / "store")
+        entry = store.put("c-attachment.html", PAGE_SOURCE)
+        path = store.objects / entry["sha256"][:2] / f"{entry['sha256']}.gz"
+        assert os.path.getsize(path) < len(PAGE_SOURCE)
+        assert gzip.decompress(path.read_bytes()) == PAGE_SOURCE
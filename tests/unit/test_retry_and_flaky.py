@@ -0,0 +1,93 @@
+import pytest
+import allure
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException
+from utils import retry
+from utils.flaky import MIN_UNSTABLE_RUNS, instability, quarantined_tests
+from utils.retry import StepRetries, retry_step
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Records the pauses between attempts instead of sleeping, and counts retries apart from the running test.
+    """
+    pauses = []
+    monkeypatch.setattr(retry.time, "sleep", pauses.append)
+    monkeypatch.setattr(retry, "step_retries", StepRetries())
+    return pauses
+
+
+def failing(times: int, error=TimeoutException):
+    """
+    Returns a step that raises `error` on its first `times` calls.
+    """
+    calls = []
+
+    def step():
+        calls.append(1)
+        if len(calls) <= times:
+            raise error("transient")
+        return len(calls)
+
+    return step
+
+
+@pytest.mark.unit
+@allure.epic("Test Infrastructure")
+@allure.feature("Step Retries and Flaky Quarantine")
+class TestRetryAndFlaky:
+
+    @allure.title("Test Retries Back Off Exponentially")
+    def test_backoff_grows_by_factor(self, sleeps):
+        """
+        Tests that the pause before the n-th retry is backoff * factor ** (n - 1).
+        """
+        step = retry_step(failing(3), attempts=4, backoff=0.5, factor=3.0)
+        assert step() == 4, "The step did not succeed on its last attempt."
+        assert sleeps == [0.5, 1.5, 4.5]
+        assert retry.step_retries.count == 3, "Retries were not counted for the flaky tracker."
+
+    @allure.title("Test the Last Failure Is Raised")
+    def test_gives_up_after_attempts(self, sleeps):
+        """
+        Tests that the error of the last attempt is raised without a pause after it.
+        """
+        step = retry_step(failing(5), attempts=3, backoff=0.1)
+        with pytest.raises(TimeoutException):
+            step()
+        assert sleeps == [0.1, 0.2]
+
+    @allure.title("Test Fatal Errors Are Not Retried")
+    def test_fatal_error_is_not_retried(self, sleeps):
+        """
+        Tests that a dead session fails the step at once.
+        """
+        step = retry_step(failing(1, InvalidSessionIdException), exceptions=(Exception,))
+        with pytest.raises(InvalidSessionIdException):
+            step()
+        assert sleeps == [], "A fatal error was retried."
+
+    @allure.title("Test the Quarantine Threshold")
+    def test_quarantine_threshold(self):
+        """
+        Tests that tests are quarantined from `threshold` of unstable runs on, and only if they also pass.
+        """
+        history = {
+            "at_threshold": "ppfrpppppp",
+            "below_threshold": "pppppppppf",
+            "always_fails": "ffffffffff",
+            "too_few_runs": "f",
+            "unstable_passes": "prprprprpr",
+        }
+        assert instability(history["at_threshold"]) == 0.2
+        assert quarantined_tests(history, 0.2) == {"at_threshold": 0.2, "unstable_passes": 0.5}
+        assert quarantined_tests(history, 0.6) == {}, "Tests below the threshold were quarantined."
+
+    @allure.title("Test a Single Unstable Run Never Quarantines")
+    def test_minimum_unstable_runs(self):
+        """
+        Tests that fewer than MIN_UNSTABLE_RUNS unstable runs never quarantine a test, whatever the share.
+        """
+        results = "p" + "r" * (MIN_UNSTABLE_RUNS - 1)
+        assert instability(results) >= 0.5
+        assert quarantined_tests({"new_test": results}, 0.5) == {}
@@ -1,11 +1,56 @@
 import pytest
 import allure
 from pages.login_page import LoginPage
+from utils.combinatorial import pairwise
 
 # --- Test Data ---
 VALID_USER = "standard_user"
-VALID_PASSWORD = "secret_sauce"
 ITEM_1 = "Sauce Labs Backpack"
+VALID_PASSWORD = "secret_sauce"
+ALL_ITEMS = [
+    "Sauce Labs Backpack",
+    "Sauce Labs Bike Light",
+    "Sauce Labs Bolt T-Shirt",
+    "Sauce Labs Fleece Jacket",
+    "Sauce Labs Onesie",
+    "Test.allTheThings() T-Shirt (Red)",
+]
+# With two inputs every pair is a full combination, so the login cases are exhaustive
+LOGIN_USERNAMES = ["standard_user", "locked_out_user", "problem_user", "performance_glitch_user", ""]
+LOGIN_PASSWORDS = [VALID_PASSWORD, "wrong_password", ""]
+# problem_user is left out on purpose: the real shop breaks its checkout form for that user
+CHECKOUT_CASES = pairwise("checkout information", {
+    "username": ["standard_user", "performance_glitch_user"],
+    "item": ALL_ITEMS,
+    "first_name": ["John", ""],
+    "last_name": ["Doe", ""],
+    "postal_code": ["12345", ""],
+})
+
+
+def expected_login_error(username: str, password: str) -> str | None:
+    """
+    Returns the error the shop shows for these credentials, or None if the login succeeds.
+    """
+    if not username:
+        return "Epic sadface: Username is required"
+    if not password:
+        return "Epic sadface: Password is required"
+    if password != VALID_PASSWORD:
+        return "Epic sadface: Username and password do not match any user in this service"
+    if username == "locked_out_user":
+        return "Epic sadface: Sorry, this user has been locked out."
+    return None
+
+
+def expected_checkout_error(first_name: str, last_name: str, postal_code: str) -> str | None:
+    """
+    Returns the error for the first missing checkout field, or None if the form is complete.
+    """
+    for label, value in (("First Name", first_name), ("Last Name", last_name), ("Postal Code", postal_code)):
+        if not value:
+            return f"Error: {label} is required"
+    return None
 
 
 @pytest.mark.validation
@@ -16,25 +61,54 @@ class TestValidationScenarios:
 
     @allure.title("Test Checkout with Missing Information")
     @allure.description("Verify that an error is shown when trying to checkout without filling required fields.")
-    def test_checkout_with_missing_info(self, driver):
+    def test_checkout_with_missing_info(self, session_seeder):
         """
         Tests that an error message appears if checkout is attempted without filling in the user info.
         """
-        # 1. Login and add an item to the cart
-        login_page = LoginPage(driver).open()
-        inventory_page = login_page.login(VALID_USER, VALID_PASSWORD)
-        inventory_page.add_item_to_cart(ITEM_1)
+        # 1. Start on the checkout info page, logged in with an item in the cart
+        checkout_page = session_seeder.open_checkout_step_one(VALID_USER, [ITEM_1])
 
-        # 2. Proceed to checkout info page
-        cart_page = inventory_page.go_to_cart()
-        checkout_page = cart_page.go_to_checkout()
-
-        # 3. Click 'Continue' without filling fields
+        # 2. Click 'Continue' without filling fields
         checkout_page.click_continue_for_error()
 
-        # 4. Verify error message
+        # 3. Verify error message
         expected_error = "Error: First Name is required"
         actual_error = checkout_page.get_error_message()
 
         assert actual_error == expected_error, "The error message for missing first name is incorrect."
         assert "checkout-step-two.html" not in checkout_page.get_current_url(), "User was incorrectly advanced to the next checkout step."
+
+    @allure.title("Test Login Combinations")
+    @allure.description("Verify the outcome of every combination of user and password.")
+    @pytest.mark.parametrize("password", LOGIN_PASSWORDS, ids=lambda value: value or "empty")
+    @pytest.mark.parametrize("username", LOGIN_USERNAMES, ids=lambda value: value or "empty")
+    def test_login_combinations(self, driver, username, password):
+        """
+        Tests that each combination of credentials either logs in or shows the matching error.
+        """
+        login_page = LoginPage(driver).open()
+        inventory_page = login_page.login(username, password)
+
+        expected_error = expected_login_error(username, password)
+        if expected_error is None:
+            assert inventory_page.get_title() == "Products", f"'{username}' could not log in."
+        else:
+            assert login_page.get_error_message() == expected_error, "The login error message is incorrect."
+
+    @allure.title("Test Checkout Information Combinations")
+    @allure.description("Verify checkout step one for a pairwise covering set of users, items and form inputs.")
+    @pytest.mark.parametrize(CHECKOUT_CASES.argnames, CHECKOUT_CASES.params())
+    def test_checkout_information_combinations(self, session_seeder, username, item, first_name, last_name, postal_code):
+        """
+        Tests that checkout step one accepts a complete form and names the first missing field otherwise.
+        """
+        checkout_page = session_seeder.open_checkout_step_one(username, [item])
+        checkout_page.fill_information(first_name, last_name, postal_code)
+
+        expected_error = expected_checkout_error(first_name, last_name, postal_code)
+        if expected_error is None:
+            checkout_step_two = checkout_page.continue_to_step_two()
+            assert checkout_step_two.get_title() == "Checkout: Overview", "Failed to proceed to checkout overview."
+        else:
+            checkout_page.click_continue_for_error()
+            assert checkout_page.get_error_message() == expected_error, "The checkout error message is incorrect."
@@ -0,0 +1,139 @@
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from uuid import uuid4
+
+import allure_commons
+from allure_commons.model2 import ATTACHMENT_PATTERN, Attachment, ExecutableItem
+from allure_commons.types import AttachmentType
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; screenshots are then attached exactly as captured
+    Image = None
+
+logger = get_logger(__name__)
+
+WEBP = ("image/webp", "webp")
+
+
+@dataclass
+class FailureArtifacts:
+    """
+    Raw data captured from the browser at the moment a test failed.
+    """
+    name: str
+    screenshot: bytes | None = None
+    page_source: str | None = None
+    url: str | None = None
+    console_log: list | None = None
+    cookies: list | None = None
+
+
+class ArtifactPipeline:
+    """
+    Captures failure artifacts synchronously and encodes and writes them on a thread pool.
+
+    Only the WebDriver calls happen on the test's thread. Each attachment is registered
+    with the running Allure test right away, so it belongs to the right test, while
+    compressing the screenshot and writing the files happen in the background and
+    overlap with the next test.
+    """
+
+    def __init__(self, allure_reporter, max_workers: int = 2, screenshot_format: str = "webp"):
+        """
+        Initializes the pipeline for the Allure reporter of the run (None disables attaching).
+        """
+        self.allure_reporter = allure_reporter
+        self.screenshot_format = screenshot_format if Image is not None else "png"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifacts")
+        self._pending = []
+
+    def capture(self, driver: WebDriver, name: str) -> FailureArtifacts:
+        """
+        Grabs the screenshot, page source, URL, console log and cookies in one pass.
+        """
+        artifacts = FailureArtifacts(name=name)
+        for field, grab in (
+            ("screenshot", driver.get_screenshot_as_png),
+            ("page_source", lambda: driver.page_source),
+            ("url", lambda: driver.current_url),
+            ("console_log", lambda: driver.get_log("browser")),
+            ("cookies", driver.get_cookies),
+        ):
+            try:
+                setattr(artifacts, field, grab())
+            except WebDriverException as e:
+                logger.warning("Could not capture %s for '%s': %s", field, name, e)
+        return artifacts
+
+    def submit(self, artifacts: FailureArtifacts):
+        """
+        Registers the artifacts with the current Allure test and writes them in the background.
+        """
+        if self.allure_reporter is None:
+            return
+        if artifacts.screenshot is not None:
+            if self.screenshot_format == "webp":
+                self._attach(f"{artifacts.name}.webp", WEBP, _encode_webp, artifacts.screenshot)
+            else:
+                self._attach(f"{artifacts.name}.png", AttachmentType.PNG, _optimize_png, artifacts.screenshot)
+        if artifacts.page_source is not None:
+            self._attach("page source", AttachmentType.HTML, str.encode, artifacts.page_source)
+        if artifacts.url is not None:
+            self._attach("url", AttachmentType.URI_LIST, str.encode, artifacts.url)
+        if artifacts.console_log is not None:
+            self._attach("console log", AttachmentType.JSON, _encode_json, artifacts.console_log)
+        if artifacts.cookies is not None:
+            self._attach("cookies", AttachmentType.JSON, _encode_json, artifacts.cookies)
+
+    def shutdown(self):
+        """
+        Waits for every pending attachment to be written.
+        """
+        for future in self._pending:
+            exception = future.exception()
+            if exception is not None:
+                logger.error("Failed to write failure artifact: %s", exception)
+        self._executor.shutdown(wait=True)
+
+    def _attach(self, name, attachment_type, encode, data):
+        if isinstance(attachment_type, AttachmentType):
+            mime_type, extension = attachment_type.mime_type, attachment_type.extension
+        else:
+            mime_type, extension = attachment_type
+        # Registered with the running test, step or fixture now; the file itself is written later
+        file_name = ATTACHMENT_PATTERN.format(prefix=uuid4(), ext=extension)
+        executable = self.allure_reporter.get_last_item(ExecutableItem)
+        if executable is None:
+            logger.warning("No running Allure test to attach '%s' to", name)
+            return
+        executable.attachments.append(Attachment(name=name, source=file_name, type=mime_type))
+        self._pending.append(self._executor.submit(_write_attachment, file_name, encode, data))
+
+
+def _write_attachment(file_name: str, encode, data):
+    allure_commons.plugin_manager.hook.report_attached_data(body=encode(data), file_name=file_name)
+
+
+def _encode_webp(png: bytes) -> bytes:
+    output = io.BytesIO()
+    Image.open(io.BytesIO(png)).save(output, format="WEBP", quality=80, method=4)
+    return output.getvalue()
+
+
+def _optimize_png(png: bytes) -> bytes:
+    if Image is None:
+        return png
+    output = io.BytesIO()
+    Image.open(io.BytesIO(png)).save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def _encode_json(data) -> bytes:
+    return json.dumps(data, indent=2).encode("utf-8")
@@ -0,0 +1,396 @@
+"""
+The backends the page objects run on.
+
+Page objects, waits and fixtures only use the WebDriver commands listed in
+`BrowserBackend`. Selenium's Chrome driver provides them against a real browser.
+`DomBackend` provides them in-process: it loads the bundled copy of the shop into an
+embedded V8 context (mini-racer) on top of a small DOM (`resources/dom_shim.js`), so the
+app's own script and the scripts of the page objects run unchanged, without starting a
+browser. Every URL is served from the bundled copy, whatever its host.
+
+Nothing is laid out or painted, so screenshots, visual checks, CDP commands and page load
+metrics need Chrome. Tests marked `browserless` may run on `DomBackend`; mini-racer is
+optional, without it they run on Chrome like every other test.
+"""
+import atexit
+import functools
+import json
+import time
+import weakref
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.keys import Keys
+
+from utils.local_app import APP_ROOT
+from utils.logger import get_logger
+
+try:
+    from py_mini_racer import MiniRacer
+    from py_mini_racer import JSEvalException
+except ImportError:  # The in-process backend is optional
+    MiniRacer = None
+    JSEvalException = Exception
+
+logger = get_logger(__name__)
+
+SHIM_FILE = Path(__file__).resolve().parent.parent / "resources" / "dom_shim.js"
+# The W3C WebDriver key that marks an element reference in script arguments and results
+ELEMENT_KEY = "element-6066-11e4-a52f-4a40b2c6f8a4"
+# Like Selenium's default script timeout; measured on the backend's virtual clock
+SCRIPT_TIMEOUT = 30
+BLANK_URL = "about:blank"
+
+# Error messages raised by the shim and the WebDriver errors they stand for
+_ERRORS = (
+    ("stale element reference", StaleElementReferenceException),
+    ("script timeout", TimeoutException),
+    ("element not interactable", ElementNotInteractableException),
+    ("invalid selector", InvalidSelectorException),
+    ("is not a valid selector", InvalidSelectorException),
+)
+
+# Backends that still hold a V8 context; mini-racer hangs if it is left to close them at interpreter exit
+_live_backends = weakref.WeakSet()
+
+
+class BrowserBackend(Protocol):
+    """
+    The WebDriver commands the page objects, waits and fixtures use.
+
+    Selenium's `WebDriver` implements them as they are; `DomBackend` implements them in-process.
+    """
+
+    @property
+    def current_url(self) -> str: ...
+
+    @property
+    def page_source(self) -> str: ...
+
+    def get(self, url: str) -> None: ...
+
+    def find_element(self, by: str, value: str): ...
+
+    def find_elements(self, by: str, value: str) -> list: ...
+
+    def execute_script(self, script: str, *args): ...
+
+    def execute_async_script(self, script: str, *args): ...
+
+    def add_cookie(self, cookie_dict: dict) -> None: ...
+
+    def get_cookies(self) -> list[dict]: ...
+
+    def delete_all_cookies(self) -> None: ...
+
+    def get_screenshot_as_png(self) -> bytes: ...
+
+    def get_log(self, log_type: str) -> list: ...
+
+    def quit(self) -> None: ...
+
+
+class DomElement:
+    """
+    An element of the document currently loaded in a `DomBackend`, with the WebElement methods page objects use.
+    """
+
+    def __init__(self, backend: "DomBackend", element_id: int, generation: int):
+        self._backend = backend
+        self._id = element_id
+        self._generation = generation
+
+    @property
+    def id(self) -> str:
+        return f"{self._generation}:{self._id}"
+
+    @property
+    def text(self) -> str:
+        return self._command("text")
+
+    @property
+    def tag_name(self) -> str:
+        return self._command("tag_name")
+
+    @property
+    def screenshot_as_png(self) -> bytes:
+        raise WebDriverException("The in-process DOM backend does not render pages; element screenshots need Chrome")
+
+    def click(self):
+        self._command("click")
+
+    def clear(self):
+        self._command("clear")
+
+    def send_keys(self, *value):
+        """
+        Types `value` into the element. Enter submits the element's form; other special keys are ignored.
+        """
+        typed = "".join(str(part) for part in value)
+        submit = Keys.ENTER in typed or Keys.RETURN in typed
+        # Selenium's special keys live in the Unicode private use area
+        text = "".join(character for character in typed if not "\ue000" <= character <= "\uf8ff")
+        self._command("send_keys", text=text, submit=submit)
+
+    def get_attribute(self, name: str) -> str | None:
+        return self._command("attribute", name=name)
+
+    def is_displayed(self) -> bool:
+        return self._command("displayed")
+
+    def is_enabled(self) -> bool:
+        return self._command("enabled")
+
+    def find_element(self, by: str, value: str) -> "DomElement":
+        return self._backend._first(self._backend._find(by, value, self), by, value)
+
+    def find_elements(self, by: str, value: str) -> list["DomElement"]:
+        return self._backend._find(by, value, self)
+
+    def _command(self, command: str, **argument):
+        return self._backend._element_command(self, command, argument)
+
+    def __eq__(self, other):
+        return isinstance(other, DomElement) and (other._backend, other.id) == (self._backend, self.id)
+
+    def __hash__(self):
+        return hash((id(self._backend), self.id))
+
+    def __repr__(self):
+        return f"<DomElement {self.id}>"
+
+
+class DomBackend:
+    """
+    Runs the bundled copy of the shop in an embedded V8 context instead of a browser.
+
+    Every navigation starts a new context, like a new document; cookies, localStorage and
+    the virtual clock carry over. Timers only advance while an async script is waited for,
+    so a wait that times out returns at once instead of after its timeout.
+    """
+
+    def __init__(self, app_root: Path = APP_ROOT):
+        if MiniRacer is None:
+            raise WebDriverException("The in-process DOM backend needs mini-racer: pip install mini-racer")
+        self.app_root = Path(app_root).resolve()
+        self._context = None
+        self._generation = 0
+        self._state = {"cookies": {}, "localStorage": {}, "sessionStorage": {}}
+        self._clock = 0
+        self._epoch = time.time() * 1000
+        self._console = []
+        _live_backends.add(self)
+        self._load(BLANK_URL, "")
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Tells whether mini-racer is installed.
+        """
+        return MiniRacer is not None
+
+    @property
+    def current_url(self) -> str:
+        return self.execute_script("return location.href;")
+
+    @property
+    def title(self) -> str:
+        return self.execute_script("return document.title;")
+
+    @property
+    def page_source(self) -> str:
+        return self.execute_script("return document.documentElement.outerHTML;")
+
+    def get(self, url: str):
+        """
+        Loads `url` from the bundled copy of the shop, which serves the same page for every route.
+        """
+        logger.info("Loading %s in the in-process DOM backend", url)
+        self._load(url, _read(self.app_root / "index.html"))
+
+    def refresh(self):
+        self.get(self.current_url)
+
+    def find_element(self, by: str, value: str) -> DomElement:
+        return self._first(self._find(by, value, None), by, value)
+
+    def find_elements(self, by: str, value: str) -> list[DomElement]:
+        return self._find(by, value, None)
+
+    def execute_script(self, script: str, *args):
+        return self._command("__execute", script, json.dumps(self._to_wire(list(args))))
+
+    def execute_async_script(self, script: str, *args):
+        return self._command("__executeAsync", script, json.dumps(self._to_wire(list(args))), SCRIPT_TIMEOUT * 1000)
+
+    def add_cookie(self, cookie_dict: dict):
+        expiry = cookie_dict.get("expiry")
+        cookie = {
+            "name": cookie_dict["name"],
+            "value": str(cookie_dict["value"]),
+            "path": cookie_dict.get("path", "/"),
+            "expiry": None if expiry is None else int(expiry + self._clock_skew()),
+        }
+        self.execute_script("__state.cookies[arguments[0].name] = arguments[0];", cookie)
+
+    def get_cookies(self) -> list[dict]:
+        cookies = self.execute_script("return Object.values(__liveCookies());")
+        host = urlsplit(self.current_url).hostname or ""
+        skew = self._clock_skew()
+        result = []
+        for cookie in cookies:
+            entry = {"name": cookie["name"], "value": cookie["value"], "path": cookie["path"], "domain": host,
+                     "secure": False, "httpOnly": False}
+            if cookie["expiry"] is not None:
+                entry["expiry"] = int(cookie["expiry"] - skew)
+            result.append(entry)
+        return result
+
+    def delete_cookie(self, name: str):
+        self.execute_script("delete __state.cookies[arguments[0]];", name)
+
+    def delete_all_cookies(self):
+        self.execute_script("Object.keys(__state.cookies).forEach(function (name) { delete __state.cookies[name]; });")
+
+    def get_screenshot_as_png(self) -> bytes:
+        raise WebDriverException("The in-process DOM backend does not render pages; screenshots need Chrome")
+
+    def get_log(self, log_type: str) -> list:
+        """
+        Returns and clears the console messages and uncaught errors of the pages, like Chrome's 'browser' log.
+        """
+        if log_type != "browser":
+            raise WebDriverException(f"The in-process DOM backend has no '{log_type}' log")
+        if self._context is not None:
+            self._console.extend(json.loads(self._context.eval("JSON.stringify(__console.splice(0))")))
+        entries, self._console = self._console, []
+        return entries
+
+    def quit(self):
+        self._unload()
+
+    def close(self):
+        self._unload()
+
+    def _clock_skew(self) -> float:
+        # Seconds the page clock is ahead of the wall clock; cookie expiry is wall-clock time outside the backend
+        return self.execute_script("return Date.now();") / 1000 - time.time()
+
+    def _load(self, url: str, html: str):
+        self._unload()
+        self._context = MiniRacer()
+        self._generation += 1
+        self._context.eval(_read(SHIM_FILE))
+        self._context.call("__boot", json.dumps(self._state), self._clock, self._epoch, url)
+        for script in json.loads(self._context.call("__loadDocument", html)):
+            source = script["text"] if script["src"] is None else self._asset(script["src"])
+            if source is None:
+                self._console.append(self._log_entry(f"Failed to load script {script['src']}"))
+                continue
+            try:
+                self._context.eval(source)
+            except JSEvalException as e:
+                # An error in a page script is reported in the console log, as in a browser
+                self._console.append(self._log_entry(str(e)))
+        self._command("__finishLoad")
+
+    def _unload(self):
+        if self._context is None:
+            return
+        exported = json.loads(self._context.call("__exportState"))
+        self._state = exported["state"]
+        self._clock = exported["clock"]
+        self._console.extend(exported["console"])
+        self._context.close()
+        self._context = None
+
+    def _asset(self, src: str) -> str | None:
+        path = (self.app_root / urlsplit(src).path.lstrip("/")).resolve()
+        if not path.is_relative_to(self.app_root) or not path.is_file():
+            return None
+        return _read(path)
+
+    def _command(self, function: str, *args):
+        if self._context is None:
+            raise WebDriverException("The in-process DOM backend has been quit")
+        generation = self._generation
+        try:
+            result = json.loads(self._context.call(function, *args))
+        except JSEvalException as e:
+            raise _webdriver_error(e) from None
+        value = self._from_wire(result["value"], generation)
+        if result["navigation"]:
+            # A link, a form submission or a `location` change loads a new document
+            self.get(result["navigation"])
+        return value
+
+    def _element_command(self, element: DomElement, command: str, argument: dict):
+        if element._backend is not self or element._generation != self._generation:
+            raise StaleElementReferenceException("stale element reference: the element belongs to a previous document")
+        return self._command("__elementCommand", element._id, command, argument)
+
+    def _find(self, by: str, value: str, parent: DomElement | None) -> list[DomElement]:
+        if parent is not None and parent._generation != self._generation:
+            raise StaleElementReferenceException("stale element reference: the element belongs to a previous document")
+        return self._command("__findElements", by, value, None if parent is None else parent._id)
+
+    @staticmethod
+    def _first(elements: list, by: str, value: str) -> DomElement:
+        if not elements:
+            raise NoSuchElementException(f"no such element: Unable to locate element: {by}='{value}'")
+        return elements[0]
+
+    def _to_wire(self, value):
+        if isinstance(value, DomElement):
+            if value._backend is not self or value._generation != self._generation:
+                raise StaleElementReferenceException("stale element reference: the element belongs to a previous document")
+            return {ELEMENT_KEY: value._id}
+        if isinstance(value, (list, tuple)):
+            return [self._to_wire(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._to_wire(item) for key, item in value.items()}
+        return value
+
+    def _from_wire(self, value, generation: int):
+        if isinstance(value, list):
+            return [self._from_wire(item, generation) for item in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return DomElement(self, value[ELEMENT_KEY], generation)
+            return {key: self._from_wire(item, generation) for key, item in value.items()}
+        return value
+
+    def _log_entry(self, message: str) -> dict:
+        return {"level": "SEVERE", "message": message, "source": "javascript", "timestamp": int(time.time() * 1000)}
+
+
+@functools.lru_cache(maxsize=None)
+def _read(path: Path) -> str:
+    # The shim and the app are read once per process; a new context per navigation is cheap, disk reads are not
+    return path.read_text(encoding="utf-8")
+
+
+def _webdriver_error(error: Exception) -> WebDriverException:
+    # mini-racer reports '<location>: Error: <message>' followed by the offending source line
+    first_line = str(error).splitlines()[0] if str(error) else ""
+    message = first_line.split("Error: ", 1)[-1]
+    for marker, exception in _ERRORS:
+        if marker in message:
+            return exception(message)
+    return JavascriptException(f"javascript error: {message}")
+
+
+@atexit.register
+def _quit_live_backends():
+    for backend in list(_live_backends):
+        backend.quit()
@@ -1,112 +1,324 @@
-from selenium.webdriver.remote.webdriver import WebDriver
+import inspect
+
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 
+from utils import dom_wait as EC
+from utils.backend import BrowserBackend
+from utils.catalog import CatalogIndex
+from utils.dom_wait import DomWait
+from utils.element_cache import ElementCache
 from utils.logger import get_logger
+from utils.page_metrics import page_metrics
+from utils.retry import retry_step
+from utils.tracing import traced
+from utils.visual import visual
 
 # Get logger for the base_page module
 logger = get_logger(__name__)
 
+# Clicks the named items' buttons and waits for the page to confirm every click, all in one round-trip
+BATCH_ITEM_CLICK_SCRIPT = """
+var names = arguments[0], itemSelector = arguments[1], buttonText = arguments[2],
+    confirmText = arguments[3], timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+
+function findItem(name) {
+    var items = document.querySelectorAll(itemSelector);
+    for (var i = 0; i < items.length; i++) {
+        var label = items[i].querySelector('.inventory_item_name');
+        if (label && label.textContent.trim() === name) return items[i];
+    }
+    return null;
+}
+function findButton(name, text) {
+    var item = findItem(name);
+    if (!item) return null;
+    var buttons = item.querySelectorAll('button');
+    for (var i = 0; i < buttons.length; i++) {
+        if (buttons[i].textContent.trim() === text) return buttons[i];
+    }
+    return null;
+}
+function isConfirmed(name) {
+    return confirmText === null ? findItem(name) === null : findButton(name, confirmText) !== null;
+}
+function waitFor(check, callback) {
+    (function poll() {
+        if (check() || Date.now() > deadline) return callback();
+        setTimeout(poll, 10);
+    })();
+}
+
+var results = {};
+waitFor(function () {
+    return names.every(function (name) { return findButton(name, buttonText) !== null; });
+}, function () {
+    var missing = names.filter(function (name) { return findButton(name, buttonText) === null; });
+    if (missing.length) {
+        // All or nothing: a partly changed cart would make a retry click some items twice
+        names.forEach(function (name) { results[name] = missing.indexOf(name) === -1 ? 'not_clicked' : 'not_found'; });
+        return done(results);
+    }
+    names.forEach(function (name) {
+        // Found again, as every click re-renders the list
+        findButton(name, buttonText).click();
+        results[name] = 'clicked';
+    });
+    waitFor(function () {
+        return names.every(function (name) { return results[name] !== 'clicked' || isConfirmed(name); });
+    }, function () {
+        names.forEach(function (name) {
+            if (results[name] === 'clicked') results[name] = isConfirmed(name) ? 'done' : 'not_confirmed';
+        });
+        done(results);
+    });
+});
+"""
+
 
 class BasePage:
     """
     The base class for all Page Objects.
     """
 
-    def __init__(self, driver: WebDriver):
+    TIMEOUT = 10
+    # (container, item) CSS selectors of the product list indexed by `catalog`, on pages that have one
+    CATALOG_SELECTORS = None
+
+    def __init_subclass__(cls, **kwargs):
         """
-        Initializes the BasePage with a WebDriver instance.
+        Wraps the public methods of every page object in tracing spans.
+        """
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if inspect.isfunction(attribute) and not name.startswith("_"):
+                setattr(cls, name, traced(attribute))
+
+    def __init__(self, driver: BrowserBackend):
+        """
+        Initializes the BasePage with a WebDriver session or another browser backend, e.g. `DomBackend`.
         """
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
+        self.wait = DomWait(self.driver, self.TIMEOUT)
+        self.element_cache = ElementCache()
+        self.catalog = CatalogIndex(driver, *self.CATALOG_SELECTORS, self.TIMEOUT) if self.CATALOG_SELECTORS else None
 
+    @traced(category="primitive")
+    @retry_step(exceptions=(WebDriverException,))
+    def navigate(self, url: str):
+        """
+        Opens a URL in the browser and drops all cached elements and the catalog index of this page.
+
+        Loading a URL is idempotent, so a failed load (e.g. a page load timeout) is retried with backoff.
+        """
+        logger.info("Navigating to: %s", url)
+        self.element_cache.clear()
+        if self.catalog is not None:
+            self.catalog.invalidate()
+        self.driver.get(url)
+        self.record_page_metrics()
+
+    def record_page_metrics(self):
+        """
+        Records the load metrics of the current document for this page when page metrics are enabled.
+        """
+        page_metrics.record(self.driver, type(self).__name__)
+
+    @traced(category="primitive")
     def find_element(self, by, value) -> WebElement:
         """
-        Finds a web element with explicit wait.
+        Finds a web element with explicit wait, reusing the cached handle while it is still attached.
+        """
+        element = self.element_cache.get(by, value)
+        if element is not None:
+            try:
+                # One cheap command, so callers that use the element directly never get a stale handle
+                element.is_enabled()
+                logger.info("Element cache hit: %s='%s'", by, value, extra=self._log_extra(by, value))
+                return element
+            except StaleElementReferenceException:
+                logger.info("Cached element went stale, finding it again: %s='%s'", by, value,
+                            extra=self._log_extra(by, value))
+                self.element_cache.discard(by, value)
+        return self._locate(by, value)
+
+    def _locate(self, by, value) -> WebElement:
+        """
+        Waits for the element to be present and caches its handle.
         """
-        logger.info(f"Finding element with locator: {by}='{value}'")
+        logger.info("Finding element with locator: %s='%s'", by, value, extra=self._log_extra(by, value))
         try:
             element = self.wait.until(EC.presence_of_element_located((by, value)))
-            logger.info(f"Element found: {by}='{value}'")
+            logger.info("Element found: %s='%s'", by, value, extra=self._log_extra(by, value))
+            self.element_cache.put(by, value, element)
             return element
         except TimeoutException:
-            logger.error(f"Element not found within timeout: {by}='{value}'")
+            logger.error("Element not found within timeout: %s='%s'", by, value, extra=self._log_extra(by, value))
             raise
 
+    @traced(category="primitive")
     def find_elements(self, by, value) -> list[WebElement]:
         """
         Finds multiple web elements with explicit wait.
         """
-        logger.info(f"Finding elements with locator: {by}='{value}'")
+        logger.info("Finding elements with locator: %s='%s'", by, value, extra=self._log_extra(by, value))
         try:
             elements = self.wait.until(EC.presence_of_all_elements_located((by, value)))
-            logger.info(f"Found {len(elements)} elements: {by}='{value}'")
+            logger.info("Found %s elements: %s='%s'", len(elements), by, value, extra=self._log_extra(by, value))
             return elements
         except TimeoutException:
-            logger.error(f"Elements not found within timeout: {by}='{value}'")
+            logger.error("Elements not found within timeout: %s='%s'", by, value, extra=self._log_extra(by, value))
             raise
 
+    @traced(category="primitive")
     def click(self, by, value):
         """
         Clicks a web element after ensuring it's clickable.
         """
-        logger.info(f"Clicking element with locator: {by}='{value}'")
+        logger.info("Clicking element with locator: %s='%s'", by, value, extra=self._log_extra(by, value))
+        # A click may change what the locator matches (e.g. 'Add to cart' becoming 'Remove'),
+        # so the clicked element is never kept in the cache afterwards
+        element = self.element_cache.pop(by, value)
+        if element is not None:
+            try:
+                element.click()
+                logger.info("Clicked cached element: %s='%s'", by, value, extra=self._log_extra(by, value))
+                return
+            except WebDriverException:
+                # Stale or not clickable yet; fall back to waiting for clickability below
+                pass
         try:
             element = self.wait.until(EC.element_to_be_clickable((by, value)))
             element.click()
-            logger.info(f"Clicked element: {by}='{value}'")
+            logger.info("Clicked element: %s='%s'", by, value, extra=self._log_extra(by, value))
         except TimeoutException:
-            logger.error(f"Element not clickable within timeout: {by}='{value}'")
+            logger.error("Element not clickable within timeout: %s='%s'", by, value, extra=self._log_extra(by, value))
             raise
 
+    @traced(category="primitive")
     def send_keys(self, by, value, text: str):
         """
         Sends text to a web element.
         """
-        logger.info(f"Sending keys '{text}' to element: {by}='{value}'")
+        logger.info("Sending keys '%s' to element: %s='%s'", text, by, value, extra=self._log_extra(by, value))
         try:
-            element = self.find_element(by, value)
-            element.clear()
-            element.send_keys(text)
-            logger.info(f"Keys sent successfully to: {by}='{value}'")
+            def clear_and_type(element):
+                element.clear()
+                element.send_keys(text)
+            self._with_element(by, value, clear_and_type)
+            logger.info("Keys sent successfully to: %s='%s'", by, value, extra=self._log_extra(by, value))
         except Exception as e:
-            logger.error(f"Error sending keys to {by}='{value}': {e}")
+            logger.error("Error sending keys to %s='%s': %s", by, value, e, extra=self._log_extra(by, value))
             raise
 
+    @traced(category="primitive")
     def get_text(self, by, value) -> str:
         """
         Gets the text of a web element.
         """
-        logger.info(f"Getting text from element: {by}='{value}'")
+        logger.info("Getting text from element: %s='%s'", by, value, extra=self._log_extra(by, value))
         try:
-            element = self.find_element(by, value)
-            text = element.text
-            logger.info(f"Got text '{text}' from: {by}='{value}'")
+            text = None
+            element = self.element_cache.get(by, value)
+            if element is not None:
+                try:
+                    text = element.text
+                except StaleElementReferenceException:
+                    logger.info("Cached element went stale, finding it again: %s='%s'", by, value,
+                                extra=self._log_extra(by, value))
+                    self.element_cache.discard(by, value)
+            if text is None:
+                # Waiting for the element and reading its text are coalesced into one script call
+                element, text = self.wait.until(EC.text_of_element_located((by, value)))
+                self.element_cache.put(by, value, element)
+            logger.info("Got text '%s' from: %s='%s'", text, by, value, extra=self._log_extra(by, value))
             return text
         except Exception as e:
-            logger.error(f"Error getting text from {by}='{value}': {e}")
+            logger.error("Error getting text from %s='%s': %s", by, value, e, extra=self._log_extra(by, value))
             raise
 
+    @traced(category="primitive")
     def get_current_url(self) -> str:
         """
         Gets the current URL of the web page.
         """
         logger.info("Getting current URL")
         url = self.driver.current_url
-        logger.info(f"Current URL is: {url}")
+        logger.info("Current URL is: %s", url)
         return url
 
+    @traced(category="primitive")
     def js_click(self, by, value):
         """
         Clicks a web element using JavaScript.
         """
-        logger.info(f"Clicking element with JavaScript: {by}='{value}'")
+        logger.info("Clicking element with JavaScript: %s='%s'", by, value, extra=self._log_extra(by, value))
         try:
-            element = self.find_element(by, value)
-            self.driver.execute_script("arguments[0].click();", element)
-            logger.info(f"Clicked element with JavaScript: {by}='{value}'")
+            self._with_element(by, value, lambda element: self.driver.execute_script("arguments[0].click();", element))
+            self.element_cache.pop(by, value)
+            logger.info("Clicked element with JavaScript: %s='%s'", by, value, extra=self._log_extra(by, value))
         except Exception as e:
-            logger.error(f"Error clicking element with JavaScript {by}='{value}': {e}")
+            logger.error("Error clicking element with JavaScript %s='%s': %s", by, value, e, extra=self._log_extra(by, value))
             raise
+
+    @traced(category="primitive")
+    def assert_visual(self, name: str, locator=None, masks=(), max_diff_ratio: float | None = None):
+        """
+        Compares the page, or the element at `locator`, with its stored baseline screenshot.
+
+        `masks` are locators of dynamic regions to ignore. Raises AssertionError when more
+        than `max_diff_ratio` (default: `--visual-max-diff`) of the pixels changed.
+        """
+        baseline = f"{type(self).__name__}-{name}"
+        logger.info("Checking the look of '%s'", baseline)
+        element = self.find_element(*locator) if locator is not None else None
+        visual.check(self.driver, baseline, element, masks, max_diff_ratio)
+        return self
+
+    def _log_extra(self, by, value) -> dict:
+        """
+        Returns the structured fields (page class and locator) attached to a log record.
+        """
+        return {"page": type(self).__name__, "locator": (by, value)}
+
+    def _with_element(self, by, value, action):
+        """
+        Runs `action` on the (possibly cached) element, re-finding it once if the handle went stale.
+
+        A cached handle is used without `find_element`'s liveness check, as staleness is handled here.
+        """
+        element = self.element_cache.get(by, value)
+        if element is not None:
+            logger.info("Element cache hit: %s='%s'", by, value, extra=self._log_extra(by, value))
+        else:
+            element = self._locate(by, value)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            logger.info("Cached element went stale, finding it again: %s='%s'", by, value, extra=self._log_extra(by, value))
+            self.element_cache.discard(by, value)
+            return action(self._locate(by, value))
+
+    @traced(category="primitive")
+    def click_item_buttons(self, item_names: list[str], item_selector: str, button_text: str,
+                           confirm_text: str | None) -> dict:
+        """
+        Clicks the button labelled `button_text` of every named item in a single script call.
+
+        Waits until each click is confirmed, either by the item's button switching to
+        `confirm_text` or, when `confirm_text` is None, by the item disappearing.
+        Nothing is clicked unless every button is found in time. Returns a mapping of item
+        name to its result and raises TimeoutException if any item or button cannot be
+        found or confirmed in time.
+        """
+        logger.info("Clicking '%s' for %s item(s) in one batch: %s", button_text, len(item_names), item_names)
+        results = self.driver.execute_async_script(
+            BATCH_ITEM_CLICK_SCRIPT, list(item_names), item_selector, button_text, confirm_text, self.TIMEOUT * 1000
+        )
+        failed = {name: result for name, result in results.items() if result != "done"}
+        if failed:
+            logger.error("Batch '%s' failed for: %s", button_text, failed)
+            raise TimeoutException(f"Batch '{button_text}' did not complete for items: {failed}")
+        logger.info("Batch '%s' completed for all %s item(s)", button_text, len(results))
+        return results
@@ -0,0 +1,170 @@
+import json
+import os
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METRICS = ("wall_ms", "commands", "rss_kib")
+
+
+@dataclass
+class FlowResult:
+    """
+    The measurements of every round of one benchmarked flow.
+    """
+    name: str
+    wall_ms: list = field(default_factory=list)
+    commands: list = field(default_factory=list)
+    rss_kib: list = field(default_factory=list)
+
+    def medians(self) -> dict:
+        """
+        Returns the median of every metric that has measurements.
+        """
+        return {
+            metric: round(statistics.median(values), 2)
+            for metric in METRICS
+            if (values := getattr(self, metric))
+        }
+
+
+def find_regressions(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares flow medians with a baseline and describes every metric that grew by more than `threshold`.
+    """
+    regressions = []
+    for name, medians in sorted(current.items()):
+        for metric, value in medians.items():
+            reference = baseline.get(name, {}).get(metric)
+            if reference and value > reference * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {value:g} vs baseline {reference:g} ({value / reference - 1:+.0%})"
+                )
+    return regressions
+
+
+def find_missing(current: dict, baseline: dict) -> list[str]:
+    """
+    Describes every measured flow metric that has no baseline to be compared with.
+    """
+    return [
+        f"{name}: {metric}"
+        for name, medians in sorted(current.items())
+        for metric in medians
+        if not baseline.get(name, {}).get(metric)
+    ]
+
+
+class BenchmarkRecorder:
+    """
+    Pytest plugin that collects flow measurements and checks them against a stored baseline.
+
+    The run fails if any metric of any flow is slower (or larger) than its baseline by more
+    than the threshold, or has no baseline at all. With `save`, the medians of this run become
+    the new baseline; with `bootstrap`, only the medians that have no baseline are added to it.
+    Metrics that cannot be measured on this machine are skipped with a warning.
+    """
+
+    def __init__(self, baseline_file: Path, threshold: float, save: bool, bootstrap: bool = False):
+        self.baseline_file = baseline_file
+        self.threshold = threshold
+        self.save = save
+        self.bootstrap = bootstrap
+        self.results = {}
+        self.regressions = []
+        self.missing = []
+        self.recorded = []
+        self.skipped = {}
+
+    def result(self, name: str) -> FlowResult:
+        """
+        Returns the (possibly new) result that rounds of flow `name` are recorded in.
+        """
+        return self.results.setdefault(name, FlowResult(name))
+
+    def skip_metric(self, metric: str, reason: str):
+        """
+        Leaves `metric` out of this run, e.g. the browser's RSS where it cannot be measured.
+        """
+        if metric not in self.skipped:
+            logger.warning("Benchmark metric %s is skipped: %s", metric, reason)
+            self.skipped[metric] = reason
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        medians = {name: result.medians() for name, result in self.results.items() if result.wall_ms}
+        if not medians:
+            return
+        if self.save:
+            self._write_baseline(medians)
+            logger.info("Saved benchmark baseline for %d flow(s) to %s", len(medians), self.baseline_file)
+            return
+        baseline = self._read_baseline()
+        self.regressions = find_regressions(medians, baseline, self.threshold)
+        self.missing = find_missing(medians, baseline)
+        if self.bootstrap and self.missing:
+            for name, flow_medians in medians.items():
+                for metric, value in flow_medians.items():
+                    if not baseline.get(name, {}).get(metric):
+                        baseline.setdefault(name, {})[metric] = value
+            self._write_baseline(baseline)
+            logger.info("Added %d missing metric(s) to the benchmark baseline %s", len(self.missing), self.baseline_file)
+            self.recorded, self.missing = self.missing, []
+        if (self.regressions or self.missing) and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        baseline = self._read_baseline()
+        terminalreporter.section("flow benchmarks")
+        terminalreporter.write_line(
+            f"{'flow':<16}  {'rounds':>6}  {'wall ms':>9}  {'commands':>8}  {'RSS KiB':>10}  {'baseline wall ms':>16}"
+        )
+        for name, result in sorted(self.results.items()):
+            medians = result.medians()
+            reference = baseline.get(name, {}).get("wall_ms")
+            terminalreporter.write_line(
+                f"{name:<16}  {len(result.wall_ms):>6}  {medians.get('wall_ms', 0):>9.1f}  "
+                f"{medians.get('commands', 0):>8g}  {medians.get('rss_kib', 0):>10.0f}  "
+                f"{reference if reference is not None else '-':>16}"
+            )
+        for metric, reason in self.skipped.items():
+            terminalreporter.write_line(f"{metric} skipped: {reason}", yellow=True)
+        if self.save:
+            terminalreporter.write_line(f"baseline saved to {self.baseline_file}")
+            return
+        if self.recorded:
+            terminalreporter.write_line(f"recorded in {self.baseline_file} (no baseline before):", yellow=True)
+            for recorded in self.recorded:
+                terminalreporter.write_line(f"  {recorded}", yellow=True)
+        if not baseline:
+            terminalreporter.write_line(
+                f"no baseline in {self.baseline_file}; run with --benchmark-save to create one", red=True
+            )
+        elif self.missing:
+            terminalreporter.write_line("no baseline for (run with --benchmark-save to record it):", red=True)
+            for missing in self.missing:
+                terminalreporter.write_line(f"  {missing}", red=True)
+        if self.regressions:
+            terminalreporter.write_line(f"regressions over the {self.threshold:.0%} threshold:", red=True)
+            for regression in self.regressions:
+                terminalreporter.write_line(f"  {regression}", red=True)
+        elif baseline and not self.missing:
+            terminalreporter.write_line(f"no regressions over the {self.threshold:.0%} threshold", green=True)
+
+    def _write_baseline(self, baseline: dict):
+        tmp_file = self.baseline_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_file, self.baseline_file)
+
+    def _read_baseline(self) -> dict:
+        try:
+            return json.loads(self.baseline_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
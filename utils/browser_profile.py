@@ -0,0 +1,165 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_METRICS_FILE = ".profile_metrics.json"
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """
+    Chrome settings used to launch the browser sessions of a run.
+    """
+    name: str
+    arguments: tuple = ()
+    blocked_urls: tuple = ()
+    maximize: bool = True
+
+
+FULL = BrowserProfile(name="full")
+
+LEAN = BrowserProfile(
+    name="lean",
+    arguments=(
+        "--headless=new",
+        "--window-size=1920,1080",
+        "--disable-extensions",
+        "--disable-gpu",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--no-first-run",
+        "--mute-audio",
+    ),
+    blocked_urls=(
+        # Images and fonts
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        # Analytics and error beacons
+        "*google-analytics.com*", "*googletagmanager.com*", "*backtrace.io*",
+    ),
+    maximize=False,
+)
+
+PROFILES = {profile.name: profile for profile in (FULL, LEAN)}
+
+
+def apply_url_blocking(driver: WebDriver, profile: BrowserProfile):
+    """
+    Blocks the profile's URL patterns in the browser through the Chrome DevTools Protocol.
+    """
+    if not profile.blocked_urls:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_urls)})
+    logger.info("Blocking %s URL pattern(s) for the '%s' profile", len(profile.blocked_urls), profile.name)
+
+
+def drain_transferred_bytes(driver: WebDriver) -> int:
+    """
+    Returns the number of bytes received over the network since the last call.
+
+    Reads (and thereby clears) the Network events of the Chrome performance log.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException:
+        return 0
+    transferred = 0
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            transferred += int(message["params"].get("encodedDataLength", 0))
+    return transferred
+
+
+class ProfileReport:
+    """
+    Pytest plugin that records per-test time and network bytes for the active browser profile.
+
+    Measurements of every profile are kept in a metrics file, so a run with one profile
+    can be compared test by test with the last run of the full profile. Nothing is measured
+    unless `measure` is set. Worker processes write their bytes to a file of their own,
+    which the parent merges; only the parent writes the metrics file.
+    """
+
+    def __init__(self, profile: BrowserProfile, metrics_file: Path, measure: bool, worker: str | None = None):
+        self.profile = profile
+        self.metrics_file = metrics_file
+        self.measure = measure
+        self.worker = worker
+        self.durations = {}
+        self.transferred = {}
+
+    def record_bytes(self, nodeid: str, transferred: int):
+        """
+        Stores the bytes a test received over the network.
+        """
+        self.transferred[nodeid] = transferred
+        if self.worker is not None:
+            # Written before the test's last report reaches the parent, which merges it
+            _write_json(self._worker_file(self.worker), self.transferred)
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker is not None or not self.measure:
+            return
+        self._merge_workers()
+        if not self.transferred:
+            return
+        metrics = _read_json(self.metrics_file)
+        if self.profile.name != FULL.name:
+            self._write_savings(terminalreporter, metrics.get(FULL.name, {}))
+        current = metrics.setdefault(self.profile.name, {})
+        for nodeid, transferred in self.transferred.items():
+            current[nodeid] = {"duration": round(self.durations.get(nodeid, 0.0), 3), "bytes": transferred}
+        _write_json(self.metrics_file, metrics)
+
+    def _merge_workers(self):
+        # The parent replayed the workers' reports, so only their tests of this run are taken
+        for worker_file in self.metrics_file.parent.glob(self._worker_file("*").name):
+            for nodeid, transferred in _read_json(worker_file).items():
+                if nodeid in self.durations:
+                    self.transferred[nodeid] = transferred
+            worker_file.unlink(missing_ok=True)
+
+    def _worker_file(self, worker: str) -> Path:
+        return self.metrics_file.with_name(f"{Path(self.metrics_file.name).stem}.worker-{worker}.json")
+
+    def _write_savings(self, terminalreporter, baseline: dict):
+        terminalreporter.section(f"browser profile '{self.profile.name}' vs '{FULL.name}'")
+        total_time = total_bytes = 0
+        for nodeid, transferred in sorted(self.transferred.items()):
+            if nodeid not in baseline:
+                terminalreporter.write_line(f"{nodeid}: no '{FULL.name}' profile measurement to compare with")
+                continue
+            time_saved = baseline[nodeid]["duration"] - self.durations.get(nodeid, 0.0)
+            bytes_saved = baseline[nodeid]["bytes"] - transferred
+            total_time += time_saved
+            total_bytes += bytes_saved
+            terminalreporter.write_line(f"{nodeid}: {time_saved:+.2f}s saved, {bytes_saved / 1024:+.1f} KiB saved")
+        terminalreporter.write_line(f"total: {total_time:+.2f}s saved, {total_bytes / 1024:+.1f} KiB saved")
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: Path, data: dict):
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_file, path)
@@ -0,0 +1,224 @@
+"""
+An in-memory index of the products listed on a page, built from one DOM snapshot.
+
+One script call reads every item of the list (name, price, description, the `data-test`
+id of its button and whether it is in the cart), so lookups, price checks and button
+locators are answered from memory instead of a slow text-matching XPath query per item.
+
+The snapshot is tagged with a version that the page itself maintains: a MutationObserver
+bumps it on every DOM change, and a navigation starts a new document with a new token.
+Every read sends the version of the index to the page, which answers 'unchanged' or with a
+new snapshot in the same call; clicks through the index check the version in the same
+script call and refuse to act on a stale snapshot. The index is also dropped after every
+click and navigation.
+
+An item that is not listed, or listed without a price, within the timeout raises
+TimeoutException, like the element waits of the page objects.
+"""
+from dataclasses import dataclass
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Waits for the list container (and item `wanted`, if given) with a price on every item, then returns
+# 'unchanged' if the document is still at `knownVersion`, or its version and every item in it
+SNAPSHOT_SCRIPT = """
+var containerSelector = arguments[0], itemSelector = arguments[1], timeoutMs = arguments[2],
+    knownVersion = arguments[3], wanted = arguments[4], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+
+function text(root, selector) {
+    var element = root.querySelector(selector);
+    return element ? element.textContent.trim() : null;
+}
+
+function listed(container) {
+    return Array.prototype.some.call(container.querySelectorAll(itemSelector), function (item) {
+        return text(item, '.inventory_item_name') === wanted;
+    });
+}
+
+function priced(container) {
+    return Array.prototype.every.call(container.querySelectorAll(itemSelector), function (item) {
+        return !!text(item, '.inventory_item_price');
+    });
+}
+
+(function poll() {
+    var container = document.querySelector(containerSelector);
+    var ready = container && document.readyState === 'complete' && (wanted === null || listed(container))
+        && priced(container);
+    if (!ready && Date.now() <= deadline) return setTimeout(poll, 10);
+    var state = window.__catalogIndex;
+    if (!state) {
+        state = window.__catalogIndex = {token: Math.random().toString(36).slice(2), version: 0};
+        state.observer = new MutationObserver(function () { state.version++; });
+        state.observer.observe(document, {childList: true, subtree: true, characterData: true, attributes: true});
+    }
+    // Changes not yet delivered to the observer count as well
+    if (state.observer.takeRecords().length) state.version++;
+    var version = state.token + ':' + state.version;
+    if (version === knownVersion) return done({version: version, unchanged: true});
+    var items = container === null ? null : Array.prototype.map.call(container.querySelectorAll(itemSelector), function (item) {
+        var button = item.querySelector('button[data-test]');
+        var buttonId = button ? button.getAttribute('data-test') : null;
+        return {
+            name: text(item, '.inventory_item_name'),
+            price: text(item, '.inventory_item_price'),
+            description: text(item, '.inventory_item_desc'),
+            button: buttonId,
+            in_cart: buttonId !== null && buttonId.indexOf('remove') === 0
+        };
+    });
+    done({version: version, items: items});
+})();
+"""
+
+# Clicks a button found by its `data-test` id if the snapshot is current and the button reads `label`
+CLICK_SCRIPT = """
+var version = arguments[0], buttonId = arguments[1], label = arguments[2];
+var state = window.__catalogIndex;
+if (state && state.observer.takeRecords().length) state.version++;
+if (!state || state.token + ':' + state.version !== version) return 'stale';
+var button = document.querySelector('[data-test="' + buttonId + '"]');
+if (!button) return 'stale';
+if (button.textContent.trim() !== label) return 'skipped';
+button.click();
+return 'clicked';
+"""
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """
+    One product as listed on the page at the time of the snapshot.
+    """
+    name: str
+    price: float
+    description: str
+    button: str | None
+    in_cart: bool
+
+    @property
+    def slug(self) -> str:
+        """
+        The item part of the button id, e.g. 'sauce-labs-backpack' for 'add-to-cart-sauce-labs-backpack'.
+        """
+        for prefix in ("add-to-cart-", "remove-"):
+            if self.button and self.button.startswith(prefix):
+                return self.button[len(prefix):]
+        return self.button or ""
+
+    def button_locator(self, in_cart: bool | None = None) -> tuple:
+        """
+        Returns the locator of the item's button, by default in its current state.
+
+        `in_cart=True` targets the 'Remove' button, `in_cart=False` the 'Add to cart' button.
+        """
+        if in_cart is None:
+            button = self.button
+        else:
+            button = f"{'remove' if in_cart else 'add-to-cart'}-{self.slug}"
+        return (By.CSS_SELECTOR, f'[data-test="{button}"]')
+
+
+class CatalogIndex:
+    """
+    Lazily snapshots the items matching `item_selector` inside `container_selector`.
+    """
+
+    def __init__(self, driver: WebDriver, container_selector: str, item_selector: str, timeout: float = 10):
+        self.driver = driver
+        self.container_selector = container_selector
+        self.item_selector = item_selector
+        self.timeout = timeout
+        self.snapshots = 0
+        self._version = None
+        self._items = None
+
+    @property
+    def items(self) -> dict[str, CatalogItem]:
+        """
+        The listed items by name, in page order, as the page lists them now.
+
+        One script call confirms the index is current or replaces it with a fresh snapshot.
+        """
+        self._snapshot()
+        return self._items
+
+    def item(self, name: str) -> CatalogItem:
+        """
+        Returns the listed item `name` as the page lists it now, waiting up to the timeout for it to be listed.
+        """
+        self._snapshot(name)
+        return self._items[name]
+
+    def click(self, name: str, label: str) -> bool:
+        """
+        Clicks the button of item `name` if it reads `label`; returns False if it reads something else.
+
+        The page checks the version of the index in the same call, so the index is not
+        re-validated first; a click on a stale snapshot is refused by the page and retried
+        once on a fresh snapshot.
+        """
+        for _ in range(2):
+            if self._items is None or name not in self._items:
+                self._snapshot(name)
+            item = self._items[name]
+            result = self.driver.execute_script(CLICK_SCRIPT, self._version, item.button, label)
+            if result != "stale":
+                if result == "clicked":
+                    self.invalidate()
+                return result == "clicked"
+            logger.info("Catalog snapshot of '%s' is outdated, taking a new one", self.container_selector)
+            self.invalidate()
+        raise StaleElementReferenceException(f"The button of '{name}' kept changing while clicking it")
+
+    def invalidate(self):
+        """
+        Drops the index, e.g. after the page changed the list or navigated.
+        """
+        self._items = None
+        self._version = None
+
+    def _snapshot(self, wanted: str | None = None):
+        if self._items is not None and (wanted is None or wanted in self._items):
+            known_version = self._version
+        else:
+            known_version = None
+        result = self.driver.execute_async_script(
+            SNAPSHOT_SCRIPT, self.container_selector, self.item_selector, self.timeout * 1000, known_version, wanted
+        )
+        if result.get("unchanged"):
+            return
+        if result["items"] is None:
+            raise TimeoutException(f"'{self.container_selector}' did not appear within {self.timeout}s")
+        if wanted is not None and not any(item["name"] == wanted for item in result["items"]):
+            raise TimeoutException(f"No item named '{wanted}' was listed in '{self.container_selector}' "
+                                   f"within {self.timeout}s")
+        items = {
+            item["name"]: CatalogItem(
+                name=item["name"],
+                price=self._price(item),
+                description=item["description"] or "",
+                button=item["button"],
+                in_cart=item["in_cart"],
+            )
+            for item in result["items"]
+        }
+        self.snapshots += 1
+        self._version = result["version"]
+        self._items = items
+        logger.info("Indexed %d item(s) of '%s' in one snapshot", len(self._items), self.container_selector)
+
+    def _price(self, item: dict) -> float:
+        try:
+            return float(item["price"].lstrip("$"))
+        except (AttributeError, ValueError):
+            raise TimeoutException(f"Item '{item['name']}' in '{self.container_selector}' showed no valid price "
+                                   f"within {self.timeout}s (read {item['price']!r})") from None
@@ -0,0 +1,141 @@
+"""
+Deterministic pairwise (and t-wise) test data.
+
+Testing every combination of input values multiplies browser runs quickly. A covering
+array of strength 2 instead makes sure every pair of values of any two inputs appears in
+at least one case, which catches the faults caused by the interaction of two inputs with
+a fraction of the cases. The cases are built greedily in a fixed order, so the same
+domains always produce the same cases and results stay comparable between runs:
+
+    CHECKOUT_CASES = pairwise("checkout", {"username": [...], "first_name": ["John", ""], ...})
+
+    @pytest.mark.parametrize(CHECKOUT_CASES.argnames, CHECKOUT_CASES.params())
+    def test_checkout(self, session_seeder, username, first_name, ...):
+"""
+import itertools
+import math
+from dataclasses import dataclass
+
+import pytest
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Uncovered tuples tried as the starting point of each new case
+SEED_CANDIDATES = 16
+
+# Every case set generated in this process, for the run summary of the ones whose tests ran
+CASE_SETS = {}
+
+
+@dataclass(frozen=True)
+class CaseSet:
+    """
+    Generated cases for a set of named input domains.
+    """
+    name: str
+    parameters: tuple
+    cases: tuple
+    full_size: int
+    strength: int
+
+    @property
+    def argnames(self) -> str:
+        """
+        The parameter names in the form `pytest.mark.parametrize` expects.
+        """
+        return ",".join(self.parameters)
+
+    @property
+    def reduction(self) -> float:
+        """
+        Share of the full cartesian product that the generated cases leave out.
+        """
+        return 1 - len(self.cases) / self.full_size if self.full_size else 0.0
+
+    def params(self) -> list:
+        """
+        Returns the cases as `pytest.param`s with readable ids, marked `combinatorial(name)` for the run summary.
+        """
+        return [
+            pytest.param(*(case[name] for name in self.parameters), id="-".join(_case_id(case[name]) for name in self.parameters),
+                         marks=pytest.mark.combinatorial(self.name))
+            for case in self.cases
+        ]
+
+
+def covering_array(domains: dict, strength: int = 2) -> list[dict]:
+    """
+    Returns cases in which every combination of `strength` values of any `strength` inputs appears.
+    """
+    names = list(domains)
+    values = [list(domains[name]) for name in names]
+    if not names or any(not domain for domain in values):
+        raise ValueError("Every input needs at least one value")
+    strength = min(strength, len(names))
+    uncovered = {
+        (combination, indexes)
+        for combination in itertools.combinations(range(len(names)), strength)
+        for indexes in itertools.product(*(range(len(values[position])) for position in combination))
+    }
+
+    rows = []
+    while uncovered:
+        best_row, best_covered = None, set()
+        for combination, indexes in sorted(uncovered)[:SEED_CANDIDATES]:
+            row = [None] * len(names)
+            for position, index in zip(combination, indexes):
+                row[position] = index
+            for position in range(len(names)):
+                if row[position] is None:
+                    row[position] = _best_value(row, position, len(values[position]), uncovered)
+            covered = _covered_by(row, uncovered)
+            if len(covered) > len(best_covered):
+                best_row, best_covered = row, covered
+        rows.append(best_row)
+        uncovered -= best_covered
+    return [{name: values[position][row[position]] for position, name in enumerate(names)} for row in rows]
+
+
+def pairwise(name: str, domains: dict, strength: int = 2) -> CaseSet:
+    """
+    Generates the covering cases for `domains` and registers them under `name` for the run summary.
+    """
+    cases = covering_array(domains, strength)
+    case_set = CaseSet(
+        name=name,
+        parameters=tuple(domains),
+        cases=tuple(cases),
+        full_size=math.prod(len(domain) for domain in domains.values()),
+        strength=min(strength, len(domains)),
+    )
+    CASE_SETS[name] = case_set
+    logger.info("Generated %d of %d case(s) for '%s' (%d-wise)", len(cases), case_set.full_size, name, case_set.strength)
+    return case_set
+
+
+def _best_value(row: list, position: int, size: int, uncovered: set) -> int:
+    # The value completing the most uncovered tuples with the inputs chosen so far; ties go to the lowest index
+    scores = [0] * size
+    for combination, indexes in uncovered:
+        if position not in combination:
+            continue
+        # Unassigned inputs are None and never match, so only tuples this value would complete count
+        if all(row[other] == index for other, index in zip(combination, indexes) if other != position):
+            scores[indexes[combination.index(position)]] += 1
+    return scores.index(max(scores))
+
+
+def _covered_by(row: list, uncovered: set) -> set:
+    return {
+        (combination, indexes)
+        for combination, indexes in uncovered
+        if all(row[position] == index for position, index in zip(combination, indexes))
+    }
+
+
+def _case_id(value) -> str:
+    if value == "":
+        return "<empty>"
+    return str(value).replace(" ", "_")
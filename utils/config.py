@@ -0,0 +1,28 @@
+import os
+from urllib.parse import urljoin
+
+DEFAULT_BASE_URL = "https://www.saucedemo.com/"
+
+_base_url = os.environ.get("SAUCEDEMO_BASE_URL", DEFAULT_BASE_URL)
+
+
+def get_base_url() -> str:
+    """
+    Returns the base URL of the application under test, always ending with a slash.
+    """
+    return _base_url
+
+
+def set_base_url(url: str):
+    """
+    Points every page object at the application served from `url`.
+    """
+    global _base_url
+    _base_url = url if url.endswith("/") else f"{url}/"
+
+
+def app_url(path: str = "") -> str:
+    """
+    Builds an absolute application URL from a path such as 'cart.html'.
+    """
+    return urljoin(_base_url, path.lstrip("/"))
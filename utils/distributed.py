@@ -0,0 +1,339 @@
+"""
+Runs the suite on worker processes spread over several hosts.
+
+A coordinator (`pytest --coordinator=HOST:PORT`) collects the tests and serves them over
+TCP. Any number of workers (`pytest --connect=HOST:PORT`), on any host with a checkout
+of the project, connect, collect the same tests and pull them one at a time, so a fast
+worker simply takes more tests than a slow one. Workers stream their test reports and
+their Allure result files back; the coordinator reports the tests as if it had run them.
+
+Messages are JSON objects, one per line.
+"""
+import base64
+import filecmp
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.logger import get_logger
+from utils.parallel import WORKER_ENV, strip_option
+from utils.results_store import StoreFileLogger
+
+logger = get_logger(__name__)
+
+MAX_ATTEMPTS = 2
+# Allure files younger than this may still be being written by the artifact pipeline
+SETTLE_SECONDS = 0.5
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """
+    Splits `HOST:PORT` into its parts.
+    """
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise pytest.UsageError(f"Expected HOST:PORT, got '{address}'")
+    return host, int(port)
+
+
+class Connection:
+    """
+    A socket that exchanges JSON line messages.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._file = sock.makefile("rwb")
+        self._lock = threading.Lock()
+
+    def send(self, message: dict):
+        data = json.dumps(message).encode("utf-8") + b"\n"
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+
+    def receive(self) -> dict | None:
+        line = self._file.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self.sock.close()
+
+
+class Coordinator:
+    """
+    Pytest plugin for the coordinating process: hands out tests and replays the workers' reports.
+    """
+
+    def __init__(self, config, address: str, spawn_workers: int, idle_timeout: float, durations: dict,
+                 store_logger: StoreFileLogger | None = None):
+        self.config = config
+        self.durations = durations
+        self.store_logger = store_logger
+        self.host, self.port = parse_address(address)
+        self.spawn_workers = spawn_workers
+        self.idle_timeout = idle_timeout
+        alluredir = config.getoption("--alluredir", None)
+        self.alluredir = Path(config.invocation_params.dir, alluredir) if alluredir else None
+        self._queue = []
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._events = queue.Queue()
+        self._workers = {}
+        self._server = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if self.config.option.collectonly or not session.items:
+            return None
+        # Longest tests first, so the run does not end waiting for one long test on one worker
+        nodeids = [item.nodeid for item in session.items]
+        known = [self.durations[nodeid] for nodeid in nodeids if nodeid in self.durations]
+        fallback = sum(known) / len(known) if known else 0.0
+        self._queue = sorted(nodeids, key=lambda nodeid: self.durations.get(nodeid, fallback), reverse=True)
+        locations = {item.nodeid: item.location for item in session.items}
+        self._listen()
+        processes = self._spawn() if self.spawn_workers else []
+
+        pending = set(self._queue)
+        idle_since = time.monotonic()
+        while pending:
+            try:
+                event, *payload = self._events.get(timeout=1)
+            except queue.Empty:
+                if not self._workers and time.monotonic() - idle_since > self.idle_timeout:
+                    break
+                continue
+            idle_since = time.monotonic()
+            if event == "start":
+                nodeid, = payload
+                self.config.hook.pytest_runtest_logstart(nodeid=nodeid, location=locations[nodeid])
+            elif event == "report":
+                report = self.config.hook.pytest_report_from_serializable(config=self.config, data=payload[0])
+                report.location = tuple(report.location)
+                self.config.hook.pytest_runtest_logreport(report=report)
+            elif event == "finish":
+                nodeid, = payload
+                self.config.hook.pytest_runtest_logfinish(nodeid=nodeid, location=locations[nodeid])
+                pending.discard(nodeid)
+            elif event == "abandon":
+                nodeid, = payload
+                logger.error("Giving up on %s after %d lost worker(s)", nodeid, MAX_ATTEMPTS)
+                session.testsfailed += 1
+                pending.discard(nodeid)
+
+        for nodeid in sorted(pending):
+            logger.error("No worker ran %s within %ss of inactivity", nodeid, self.idle_timeout)
+        session.testsfailed += len(pending)
+        self._server.close()
+        # Workers send their last Allure files right before they disconnect
+        deadline = time.monotonic() + self.idle_timeout
+        while self._workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+        for process in processes:
+            process.wait()
+        return True
+
+    def _listen(self):
+        self._server = socket.create_server((self.host, self.port))
+        self.host, self.port = self._server.getsockname()[:2]
+        logger.info("Coordinator serving %d test(s) at %s:%d", len(self._queue), self.host, self.port)
+        self.config.pluginmanager.get_plugin("terminalreporter").write_line(
+            f"coordinator: {len(self._queue)} test(s) waiting at {self.host}:{self.port}; "
+            f"start workers with: pytest --connect={self.host}:{self.port}"
+        )
+        threading.Thread(target=self._accept, name="coordinator-accept", daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, peer = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(Connection(sock), peer), daemon=True).start()
+
+    def _serve(self, connection: Connection, peer):
+        hello = connection.receive()
+        name = f"{hello.get('worker', '?')}@{peer[0]}" if hello else str(peer)
+        collected = set(hello.get("collected", ())) if hello else set()
+        connection.send({"type": "welcome", "allure": self.alluredir is not None})
+        self._workers[name] = connection
+        logger.info("Worker %s connected with %d collected test(s)", name, len(collected))
+        in_flight = set()
+        try:
+            while (message := connection.receive()) is not None:
+                kind = message["type"]
+                if kind == "next":
+                    nodeid = self._take(collected)
+                    if nodeid is not None:
+                        in_flight.add(nodeid)
+                    connection.send({"type": "run", "nodeid": nodeid})
+                elif kind == "start":
+                    self._events.put(("start", message["nodeid"]))
+                elif kind == "report":
+                    self._events.put(("report", message["report"]))
+                elif kind == "finish":
+                    in_flight.discard(message["nodeid"])
+                    self._events.put(("finish", message["nodeid"]))
+                elif kind == "file":
+                    self._store_file(name, message["name"], base64.b64decode(message["data"]))
+                elif kind == "bye":
+                    break
+        except (OSError, ValueError) as e:
+            logger.warning("Lost worker %s: %s", name, e)
+        finally:
+            self._workers.pop(name, None)
+            connection.close()
+            self._requeue(name, in_flight)
+
+    def _take(self, collected: set):
+        with self._lock:
+            for index, nodeid in enumerate(self._queue):
+                if nodeid in collected:
+                    self._attempts[nodeid] = self._attempts.get(nodeid, 0) + 1
+                    return self._queue.pop(index)
+        return None
+
+    def _requeue(self, name: str, nodeids: set):
+        for nodeid in sorted(nodeids):
+            if self._attempts.get(nodeid, 0) >= MAX_ATTEMPTS:
+                self._events.put(("abandon", nodeid))
+                continue
+            logger.warning("Worker %s left before finishing %s, handing it out again", name, nodeid)
+            with self._lock:
+                self._queue.insert(0, nodeid)
+
+    def _store_file(self, worker: str, name: str, data: bytes):
+        if self.alluredir is None:
+            return
+        if self.store_logger is not None:
+            # Exported to --alluredir with the coordinator's own results at the end of the run
+            self.store_logger.add_file(Path(name).name, data)
+            return
+        self.alluredir.mkdir(parents=True, exist_ok=True)
+        target = self.alluredir / Path(name).name
+        tmp_file = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(data)
+        if target.exists():
+            # Result files are uuid-named; shared files such as environment.properties are kept once
+            if filecmp.cmp(tmp_file, target, shallow=False):
+                tmp_file.unlink()
+                return
+            target = target.with_name(f"{target.stem}-{worker.replace('@', '-')}{target.suffix}")
+        os.replace(tmp_file, target)
+
+    def _spawn(self) -> list:
+        args = list(self.config.invocation_params.args)
+        for option in ("--coordinator", "--spawn-workers", "--alluredir", "--changed-since", "--results-store"):
+            args = strip_option(args, option)
+        # The workers stream their results here; cleaning and the store are the coordinator's
+        args = strip_option(args, "--clean-alluredir", takes_value=False)
+        workdir = Path(tempfile.mkdtemp(prefix="pytest-distributed-"))
+        processes = []
+        for index in range(self.spawn_workers):
+            command = [sys.executable, "-m", "pytest", *args, f"--connect={self.host}:{self.port}"]
+            if self.alluredir is not None:
+                command.append(f"--alluredir={workdir / f'allure-{index}'}")
+            log_file = open(workdir / f"worker-{index}.log", "w", encoding="utf-8")
+            env = dict(os.environ, **{WORKER_ENV: f"d{index}"})
+            processes.append(subprocess.Popen(
+                command, cwd=self.config.invocation_params.dir, env=env, stdout=log_file, stderr=subprocess.STDOUT
+            ))
+            log_file.close()
+        logger.info("Spawned %d local worker(s), logs in %s", self.spawn_workers, workdir)
+        return processes
+
+
+class Worker:
+    """
+    Pytest plugin for a worker process: pulls tests from the coordinator and streams back the results.
+    """
+
+    def __init__(self, config, address: str):
+        self.config = config
+        self.address = parse_address(address)
+        alluredir = config.getoption("--alluredir", None)
+        self.alluredir = Path(config.invocation_params.dir, alluredir) if alluredir else None
+        self.send_allure = False
+        self.connection = None
+        self._sent_files = set()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if self.config.option.collectonly:
+            return None
+        self.connection = Connection(socket.create_connection(self.address))
+        self.connection.send({
+            "type": "hello",
+            "worker": os.environ.get(WORKER_ENV, f"{socket.gethostname()}-{os.getpid()}"),
+            "collected": [item.nodeid for item in session.items],
+        })
+        welcome = self.connection.receive()
+        self.send_allure = bool(welcome and welcome.get("allure")) and self.alluredir is not None
+        items = {item.nodeid: item for item in session.items}
+
+        # Always hold the next test, so fixtures are torn down only when their scope really ends
+        current = self._next()
+        while current is not None:
+            following = self._next()
+            item = items[current]
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=items.get(following))
+            if session.shouldstop:
+                raise session.Interrupted(session.shouldstop)
+            self._stream_files(final=False)
+            current = following
+        return True
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        if self.connection is not None:
+            self.connection.send({"type": "start", "nodeid": nodeid})
+
+    def pytest_runtest_logreport(self, report):
+        if self.connection is not None:
+            data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+            self.connection.send({"type": "report", "report": data})
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        if self.connection is not None:
+            self.connection.send({"type": "finish", "nodeid": nodeid})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_unconfigure(self, config):
+        # Runs after the artifact pipeline has written its last attachments
+        if self.connection is None:
+            return
+        self._stream_files(final=True)
+        self.connection.send({"type": "bye"})
+        self.connection.close()
+        self.connection = None
+
+    def _next(self):
+        self.connection.send({"type": "next"})
+        reply = self.connection.receive()
+        return reply.get("nodeid") if reply else None
+
+    def _stream_files(self, final: bool):
+        if not self.send_allure or not self.alluredir.is_dir():
+            return
+        now = time.time()
+        for path in sorted(self.alluredir.iterdir()):
+            if path.name in self._sent_files or not path.is_file():
+                continue
+            if not final and now - path.stat().st_mtime < SETTLE_SECONDS:
+                continue
+            self.connection.send({
+                "type": "file", "name": path.name, "data": base64.b64encode(path.read_bytes()).decode("ascii"),
+            })
+            self._sent_files.add(path.name)
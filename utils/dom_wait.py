@@ -0,0 +1,221 @@
+"""
+Event-driven replacements for the `expected_conditions` used by the page objects.
+
+Instead of polling the browser over WebDriver every 500 ms, `DomWait.until` sends the
+condition to the page once as an async script. The script re-checks it whenever the
+DOM mutates or a frame is rendered and answers as soon as it holds, so a wait costs a
+single round-trip. Conditions keep the names of their `expected_conditions` counterparts,
+which makes this module a drop-in replacement:
+
+    from utils import dom_wait as EC
+    self.wait.until(EC.visibility_of_element_located(locator))
+"""
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.tracing import traced
+
+# How chromedriver reports that the page navigated away while the async script was waiting
+NAVIGATION_ERRORS = ("document unloaded", "execution context was destroyed", "cannot find context with specified id")
+
+WAIT_SCRIPT = """
+var spec = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+
+function find(all) {
+    var by = spec.by, value = spec.value, nodes = [];
+    if (by === 'xpath') {
+        var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    } else {
+        var selector = {
+            'id': '[id="' + value + '"]',
+            'name': '[name="' + value + '"]',
+            'class name': '.' + (window.CSS && CSS.escape ? CSS.escape(value) : value),
+            'tag name': value,
+            'css selector': value
+        }[by];
+        nodes = Array.prototype.slice.call(document.querySelectorAll(selector));
+    }
+    return all ? nodes : (nodes[0] || null);
+}
+function isVisible(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+function check() {
+    var el;
+    switch (spec.type) {
+        case 'presence':
+            el = find(false);
+            return el ? {value: el} : null;
+        case 'presence_all':
+            var nodes = find(true);
+            return nodes.length ? {value: nodes} : null;
+        case 'presence_text':
+            el = find(false);
+            // Like WebElement.text: the rendered text of a visible element, '' for a hidden one
+            return el ? {value: [el, isVisible(el) ? el.innerText.trim() : '']} : null;
+        case 'visibility':
+            el = find(false);
+            return el && isVisible(el) ? {value: el} : null;
+        case 'clickable':
+            el = find(false);
+            return el && isVisible(el) && !el.disabled ? {value: el} : null;
+        case 'text':
+            el = find(false);
+            return el && (el.innerText || el.textContent).indexOf(spec.text) !== -1 ? {value: true} : null;
+        case 'url_to_be':
+            return location.href === spec.url ? {value: true} : null;
+        case 'url_contains':
+            return location.href.indexOf(spec.url) !== -1 ? {value: true} : null;
+        case 'url_changes':
+            return location.href !== spec.url ? {value: true} : null;
+    }
+    throw new Error('Unknown wait condition: ' + spec.type);
+}
+
+var finished = false, observer = null, timer = null;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+function tryFinish() {
+    if (finished) return;
+    var result = check();
+    if (result) finish({ok: true, value: result.value});
+}
+
+var initial = check();
+if (initial) {
+    done({ok: true, value: initial.value});
+} else {
+    observer = new MutationObserver(tryFinish);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(function () { finish({ok: false}); }, timeoutMs);
+    // Animation frames catch changes that are not DOM mutations, such as pushState navigation;
+    // the slower timer keeps checking in background tabs, where animation frames are paused
+    (function onFrame() {
+        tryFinish();
+        if (!finished) requestAnimationFrame(onFrame);
+    })();
+    (function onTimer() {
+        tryFinish();
+        if (!finished) setTimeout(onTimer, 100);
+    })();
+}
+"""
+
+
+class DomCondition:
+    """
+    A wait condition evaluated inside the page by `DomWait`.
+    """
+
+    def __init__(self, description: str, **spec):
+        self.description = description
+        self.spec = spec
+
+    def __repr__(self):
+        return self.description
+
+
+def presence_of_element_located(locator) -> DomCondition:
+    by, value = locator
+    return DomCondition(f"presence of {by}='{value}'", type="presence", by=by, value=value)
+
+
+def presence_of_all_elements_located(locator) -> DomCondition:
+    by, value = locator
+    return DomCondition(f"presence of all {by}='{value}'", type="presence_all", by=by, value=value)
+
+
+def text_of_element_located(locator) -> DomCondition:
+    """
+    Waits for the element and returns it together with its text, in a single round-trip.
+    """
+    by, value = locator
+    return DomCondition(f"text of {by}='{value}'", type="presence_text", by=by, value=value)
+
+
+def visibility_of_element_located(locator) -> DomCondition:
+    by, value = locator
+    return DomCondition(f"visibility of {by}='{value}'", type="visibility", by=by, value=value)
+
+
+def element_to_be_clickable(locator) -> DomCondition:
+    by, value = locator
+    return DomCondition(f"clickability of {by}='{value}'", type="clickable", by=by, value=value)
+
+
+def text_to_be_present_in_element(locator, text: str) -> DomCondition:
+    by, value = locator
+    return DomCondition(f"text '{text}' in {by}='{value}'", type="text", by=by, value=value, text=text)
+
+
+def url_to_be(url: str) -> DomCondition:
+    return DomCondition(f"URL to be '{url}'", type="url_to_be", url=url)
+
+
+def url_contains(url: str) -> DomCondition:
+    return DomCondition(f"URL to contain '{url}'", type="url_contains", url=url)
+
+
+def url_changes(url: str) -> DomCondition:
+    return DomCondition(f"URL to change from '{url}'", type="url_changes", url=url)
+
+
+class DomWait:
+    """
+    Waits for conditions by listening to DOM mutations inside the page.
+
+    Plain callables (e.g. selenium's own `expected_conditions`) are still accepted and
+    fall back to regular WebDriverWait polling.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: float):
+        """
+        Initializes the wait for `driver` with a timeout in seconds.
+        """
+        self.driver = driver
+        self.timeout = timeout
+
+    @traced(category="wait")
+    def until(self, condition, message: str = ""):
+        """
+        Waits until `condition` holds and returns its value, or raises TimeoutException.
+        """
+        if not isinstance(condition, DomCondition):
+            return WebDriverWait(self.driver, self.timeout).until(condition, message)
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = self.driver.execute_async_script(WAIT_SCRIPT, condition.spec, int(remaining * 1000))
+            except WebDriverException as e:
+                if not _navigated(e):
+                    # A dead session or window will not recover before the deadline
+                    raise
+                # The document was replaced while waiting (full navigation); listen on the new one
+                time.sleep(0.05)
+                continue
+            if result and result.get("ok"):
+                return result.get("value")
+            if result is not None:
+                # The page gave up after the remaining time; backends with a virtual clock get here early
+                break
+        raise TimeoutException(message or f"Timed out after {self.timeout}s waiting for {condition}")
+
+
+def _navigated(error: WebDriverException) -> bool:
+    message = (error.msg or str(error)).lower()
+    return any(marker in message for marker in NAVIGATION_ERRORS)
@@ -0,0 +1,39 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from utils.browser_profile import FULL, BrowserProfile, apply_url_blocking
+from utils.logger import get_logger
+from utils.transport import tune_transport
+from utils.watchdog import owner_environment
+
+logger = get_logger(__name__)
+
+
+def create_chrome_driver(driver_executable_path: str, profile: BrowserProfile = FULL,
+                         measure_bytes: bool = False) -> webdriver.Chrome:
+    """
+    Launches a new Chrome session configured for the test suite with the given browser profile.
+
+    With `measure_bytes`, Chrome logs its network events so the bytes of each test can be counted.
+    """
+    chrome_options = ChromeOptions()
+    chrome_options.add_experimental_option(
+        "prefs", {"credentials_enable_service": False, "profile.password_manager_enabled": False}
+    )
+    for argument in profile.arguments:
+        chrome_options.add_argument(argument)
+    logging_prefs = {"browser": "ALL"}
+    if measure_bytes:
+        # Network events in the performance log let us measure the bytes each test downloads
+        logging_prefs["performance"] = "ALL"
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    chrome_options.set_capability("goog:loggingPrefs", logging_prefs)
+
+    # The owner tag lets the watchdog find this browser's processes if the run dies before quitting it
+    service = ChromeService(executable_path=driver_executable_path, env=owner_environment())
+    driver = tune_transport(webdriver.Chrome(service=service, options=chrome_options))
+    apply_url_blocking(driver, profile)
+    if profile.maximize:
+        driver.maximize_window()
+    return driver
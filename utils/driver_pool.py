@@ -0,0 +1,188 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+from utils.watchdog import BrowserWatchdog
+
+logger = get_logger(__name__)
+
+
+class PooledDriver:
+    """
+    A WebDriver session owned by a DriverPool, together with its usage counter.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Keeps a number of browser sessions warm and hands them out to tests.
+
+    Spare sessions are launched on a background thread so that a test never waits
+    for a browser start unless the pool is exhausted. Returned sessions are reset
+    to a clean state before they are handed out again, and are replaced after
+    `max_uses` tests, as soon as they stop responding or when the `watchdog`
+    reports them over their resource caps.
+    """
+
+    def __init__(self, driver_factory, size: int = 2, max_uses: int = 25,
+                 watchdog: BrowserWatchdog | None = None):
+        """
+        Initializes the pool. No browser is started until `start()` is called.
+        """
+        self._driver_factory = driver_factory
+        self._watchdog = watchdog
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._idle = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="driver-pool")
+        self._all = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """
+        Pre-launches `size` sessions in the background.
+        """
+        logger.info("Warming up driver pool with %s session(s)", self.size)
+        for _ in range(self.size):
+            self._executor.submit(self._launch)
+        return self
+
+    def acquire(self, timeout: float = 120) -> WebDriver:
+        """
+        Returns a clean, responsive session, waiting for a warm one if necessary.
+        """
+        while True:
+            try:
+                pooled = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No browser session became available within {timeout} seconds")
+            if isinstance(pooled, Exception):
+                # A launch failed: report it to this test and try again for the next one
+                self._executor.submit(self._launch)
+                raise pooled
+            exceeded = self._watchdog.exceeded(pooled.driver) if self._watchdog else None
+            if exceeded is not None:
+                self._watchdog.record_recycle(exceeded)
+                self._discard(pooled)
+                continue
+            if self._is_alive(pooled):
+                pooled.uses += 1
+                logger.info("Acquired pooled driver (use %s/%s)", pooled.uses, self.max_uses)
+                return pooled.driver
+            logger.warning("Pooled driver is not responding, replacing it")
+            self._discard(pooled)
+
+    def release(self, driver: WebDriver):
+        """
+        Returns a session to the pool. It is reset (or recycled) in the background.
+        """
+        pooled = self._find(driver)
+        if pooled is None:
+            return
+        self._executor.submit(self._recycle, pooled)
+
+    def close(self):
+        """
+        Quits every session owned by the pool.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            sessions = list(self._all)
+            self._all.clear()
+        for pooled in sessions:
+            self._quit(pooled)
+        logger.info("Driver pool closed (%s session(s) quit)", len(sessions))
+
+    def _launch(self):
+        if self._closed:
+            return
+        try:
+            pooled = PooledDriver(self._driver_factory())
+        except Exception as e:
+            logger.error("Failed to launch pooled driver: %s", e)
+            self._idle.put(e)
+            return
+        if self._watchdog is not None:
+            self._watchdog.track(pooled.driver)
+        with self._lock:
+            self._all.add(pooled)
+        self._idle.put(pooled)
+
+    def _recycle(self, pooled: PooledDriver):
+        exceeded = self._watchdog.exceeded(pooled.driver) if self._watchdog else None
+        if exceeded is not None:
+            self._watchdog.record_recycle(exceeded)
+            self._discard(pooled)
+            return
+        if pooled.uses >= self.max_uses:
+            logger.info("Pooled driver reached %s uses, replacing it", self.max_uses)
+            self._discard(pooled)
+            return
+        try:
+            reset_session(pooled.driver)
+        except WebDriverException as e:
+            logger.warning("Failed to reset pooled driver, replacing it: %s", e)
+            self._discard(pooled)
+            return
+        self._idle.put(pooled)
+
+    def _discard(self, pooled: PooledDriver):
+        with self._lock:
+            self._all.discard(pooled)
+        self._quit(pooled)
+        if not self._closed:
+            self._executor.submit(self._launch)
+
+    def _find(self, driver: WebDriver):
+        with self._lock:
+            for pooled in self._all:
+                if pooled.driver is driver:
+                    return pooled
+        return None
+
+    @staticmethod
+    def _is_alive(pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _quit(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning("Error while quitting pooled driver: %s", e)
+        if self._watchdog is not None:
+            self._watchdog.untrack(pooled.driver)
+
+
+def reset_session(driver: WebDriver):
+    """
+    Clears cookies, localStorage and sessionStorage and leaves the browser on about:blank.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException:
+        # Pages such as about:blank or data: URLs have no storage to clear
+        pass
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except (AttributeError, WebDriverException):
+        driver.delete_all_cookies()
+    driver.get("about:blank")
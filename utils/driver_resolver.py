@@ -0,0 +1,142 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "saucedemo-tests" / "chromedriver.json"
+
+_resolved = None
+_lock = threading.Lock()
+
+
+class DriverResolutionError(RuntimeError):
+    """
+    Raised when no usable chromedriver executable can be found.
+    """
+
+
+@dataclass(frozen=True)
+class DriverResolution:
+    """
+    The outcome of resolving the chromedriver executable.
+    """
+    path: str
+    source: str  # "pinned", "cache" or "download"
+    browser_version: str | None
+    elapsed: float
+
+
+def resolve_chromedriver(pinned_path: str | None = None, cache_file: Path = DEFAULT_CACHE_FILE) -> DriverResolution:
+    """
+    Resolves the chromedriver executable once per process.
+
+    The lookup order is: a pinned local binary (fully offline), the on-disk cache
+    entry for the installed Chrome version, and finally a webdriver-manager download
+    whose result is written back to the cache.
+    """
+    global _resolved
+    with _lock:
+        if _resolved is None:
+            _resolved = _resolve(pinned_path or os.environ.get("CHROMEDRIVER_PATH"), Path(cache_file))
+            logger.info(
+                "Resolved chromedriver from %s in %.3fs: %s", _resolved.source, _resolved.elapsed, _resolved.path
+            )
+        return _resolved
+
+
+def _resolve(pinned_path, cache_file: Path) -> DriverResolution:
+    started = time.perf_counter()
+
+    if pinned_path:
+        if not is_valid_driver(pinned_path):
+            raise DriverResolutionError(f"Pinned chromedriver is not a working executable: {pinned_path}")
+        return DriverResolution(pinned_path, "pinned", None, time.perf_counter() - started)
+
+    browser_version = get_installed_chrome_version()
+    cache = _read_cache(cache_file)
+    if browser_version:
+        cached_path = cache.get(browser_version)
+        if cached_path and is_valid_driver(cached_path, browser_version):
+            return DriverResolution(cached_path, "cache", browser_version, time.perf_counter() - started)
+
+    try:
+        driver_path = _download_driver()
+    except Exception as e:
+        raise DriverResolutionError(
+            f"Could not download chromedriver for Chrome {browser_version or '(unknown version)'} "
+            f"and no cached or pinned binary is available: {e}"
+        ) from e
+    if not is_valid_driver(driver_path, browser_version):
+        raise DriverResolutionError(f"Downloaded chromedriver is not a working executable: {driver_path}")
+
+    if browser_version:
+        cache[browser_version] = driver_path
+        _write_cache(cache_file, cache)
+    return DriverResolution(driver_path, "download", browser_version, time.perf_counter() - started)
+
+
+def get_installed_chrome_version() -> str | None:
+    """
+    Returns the version of the locally installed Chrome (or Chromium), or None if it cannot be detected.
+    """
+    os_manager = OperationSystemManager()
+    for chrome_type in (ChromeType.GOOGLE, ChromeType.CHROMIUM):
+        version = os_manager.get_browser_version_from_os(chrome_type)
+        if version:
+            return version
+    return None
+
+
+def is_valid_driver(path: str, browser_version: str | None = None) -> bool:
+    """
+    Checks that `path` is an executable chromedriver matching the browser's major version.
+    """
+    if not os.path.isfile(path) or not os.access(path, os.X_OK):
+        return False
+    try:
+        output = subprocess.run(
+            [path, "--version"], capture_output=True, text=True, timeout=10, check=True
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    if not output.startswith("ChromeDriver"):
+        return False
+    if browser_version:
+        driver_major = output.split()[1].split(".")[0]
+        return driver_major == browser_version.split(".")[0]
+    return True
+
+
+def _download_driver() -> str:
+    base_driver_path = ChromeDriverManager().install()
+    # Correct the path if it points to THIRD_PARTY_NOTICES.chromedriver
+    if "THIRD_PARTY_NOTICES.chromedriver" in base_driver_path:
+        return os.path.join(os.path.dirname(base_driver_path), "chromedriver")
+    return base_driver_path
+
+
+def _read_cache(cache_file: Path) -> dict:
+    try:
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache_file: Path, cache: dict):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("Could not write chromedriver cache %s: %s", cache_file, e)
@@ -0,0 +1,64 @@
+from selenium.webdriver.remote.webelement import WebElement
+
+
+class ElementCache:
+    """
+    Per-page cache of WebElement handles keyed by locator.
+
+    Every lookup through `get` is counted as a hit or a miss, both on the cache itself and in the
+    class-wide `totals`, so the number of saved WebDriver round-trips can be reported. `pop` is not
+    counted. A hit only happens when the same page object reads or types into the same locator
+    again before navigating (e.g. re-reading the cart badge after each add); page objects that are
+    created per action and read each locator once, as most of this suite does, will show only misses.
+    A hit returned by `BasePage.find_element` still costs one liveness check; its own actions skip it.
+    """
+
+    totals = {"hits": 0, "misses": 0, "stale": 0}
+
+    def __init__(self):
+        """
+        Initializes an empty cache.
+        """
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def get(self, by, value) -> WebElement | None:
+        """
+        Returns the cached handle for the locator, or None on a miss.
+        """
+        element = self._elements.get((by, value))
+        if element is None:
+            self.misses += 1
+            ElementCache.totals["misses"] += 1
+        else:
+            self.hits += 1
+            ElementCache.totals["hits"] += 1
+        return element
+
+    def put(self, by, value, element: WebElement):
+        """
+        Stores the handle found for the locator.
+        """
+        self._elements[(by, value)] = element
+
+    def pop(self, by, value) -> WebElement | None:
+        """
+        Removes and returns the handle for the locator, if any, without counting a lookup.
+        """
+        return self._elements.pop((by, value), None)
+
+    def discard(self, by, value):
+        """
+        Drops a handle that turned out to be stale.
+        """
+        if self.pop(by, value) is not None:
+            self.stale += 1
+            ElementCache.totals["stale"] += 1
+
+    def clear(self):
+        """
+        Drops every handle, e.g. after the page navigated.
+        """
+        self._elements.clear()
@@ -0,0 +1,88 @@
+"""
+Failure history per test and the quarantine of chronically flaky tests.
+
+Every run appends one result per test to the history file: `p` for a clean pass, `r` for
+a pass that needed step retries and `f` for a failure. A test that passes sometimes but
+was unstable (failed or needed retries) in at least `threshold` of its recent runs is
+quarantined; `--quarantine=exclude` leaves it out of the main run and
+`--quarantine=only` runs just the quarantined tests, e.g. as a separate, non-blocking job.
+A test leaves the quarantine on its own once its unstable runs age out of the window.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FLAKY_HISTORY_FILE = ".flaky_history.json"
+HISTORY_WINDOW = 20
+MIN_UNSTABLE_RUNS = 2
+
+
+def load_history(path: Path) -> dict:
+    """
+    Loads the recent results per test, oldest first.
+    """
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def instability(results: str) -> float:
+    """
+    Returns the share of failed or retried runs in `results`.
+    """
+    return sum(result in "fr" for result in results) / len(results) if results else 0.0
+
+
+def quarantined_tests(history: dict, threshold: float) -> dict:
+    """
+    Returns the flaky tests with their instability: tests that pass at least sometimes but
+    were unstable in at least `threshold` (and `MIN_UNSTABLE_RUNS`) of their recent runs.
+    """
+    flaky = {}
+    for nodeid, results in history.items():
+        passes = sum(result in "pr" for result in results)
+        unstable = sum(result in "fr" for result in results)
+        if passes and unstable >= MIN_UNSTABLE_RUNS and instability(results) >= threshold:
+            flaky[nodeid] = instability(results)
+    return flaky
+
+
+class FlakyTracker:
+    """
+    Pytest plugin that records the result of every test in the history file.
+
+    Outcomes and step retries come from the duration recorder, which also receives the
+    reports that `--workers` processes hand back to the parent.
+    """
+
+    def __init__(self, config, history_file: Path):
+        self.config = config
+        self.history_file = history_file
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        recorder = self.config.pluginmanager.get_plugin("duration_recorder")
+        if recorder is None or self.config.option.collectonly:
+            return
+        results = {}
+        for nodeid, outcome in recorder.outcomes.items():
+            if outcome == "failed":
+                results[nodeid] = "f"
+            elif outcome == "passed":
+                results[nodeid] = "r" if nodeid in recorder.retried else "p"
+        if not results:
+            return
+        history = load_history(self.history_file)
+        for nodeid, result in results.items():
+            history[nodeid] = (history.get(nodeid, "") + result)[-HISTORY_WINDOW:]
+        tmp_file = self.history_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(history, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_file, self.history_file)
+        logger.info("Recorded %d result(s) in %s", len(results), self.history_file)
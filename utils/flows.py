@@ -0,0 +1,74 @@
+"""
+The core user flows of the shop, written once against the page objects.
+
+Each flow starts from a clean browser session and raises AssertionError when the shop
+does not end up in the expected state. `paths` lists the pages the flow loads, in order,
+for tools that replay a flow without a browser.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from pages.login_page import LoginPage
+from utils.session_seeder import INVENTORY_ITEM_IDS, SessionSeeder
+
+USERNAME = "standard_user"
+PASSWORD = "secret_sauce"
+ITEM = "Sauce Labs Backpack"
+ALL_ITEMS = list(INVENTORY_ITEM_IDS)
+CHECKOUT_INFO = ("John", "Doe", "12345")
+
+
+@dataclass(frozen=True)
+class Flow:
+    """
+    A named user flow: a function run against a SessionSeeder, and the pages it loads.
+    """
+    name: str
+    run: Callable[[SessionSeeder], None]
+    paths: tuple
+
+
+def login(seeder: SessionSeeder):
+    inventory_page = LoginPage(seeder.driver).open().login(USERNAME, PASSWORD)
+    assert inventory_page.get_title() == "Products", "Login did not open the inventory page."
+
+
+def add_one_item(seeder: SessionSeeder):
+    inventory_page = seeder.open_inventory(USERNAME)
+    inventory_page.add_item_to_cart(ITEM)
+    assert inventory_page.get_cart_badge_item_count() == 1, "Cart badge count is not 1."
+
+
+def add_all_items(seeder: SessionSeeder):
+    inventory_page = seeder.open_inventory(USERNAME)
+    inventory_page.add_items_to_cart(ALL_ITEMS)
+    assert inventory_page.get_cart_badge_item_count() == len(ALL_ITEMS), "Not all items were added."
+
+
+def remove_item(seeder: SessionSeeder):
+    cart_page = seeder.open_cart(USERNAME, [ITEM])
+    cart_page.remove_item(ITEM)
+    assert cart_page.get_cart_items_count() == 0, "Item was not removed from the cart."
+
+
+def checkout(seeder: SessionSeeder):
+    checkout_step_one = seeder.open_cart(USERNAME, [ITEM]).go_to_checkout()
+    checkout_step_one.fill_information(*CHECKOUT_INFO)
+    checkout_step_two = checkout_step_one.continue_to_step_two()
+    assert checkout_step_two.get_title() == "Checkout: Overview", "Checkout overview was not opened."
+    checkout_complete = checkout_step_two.click_finish()
+    assert checkout_complete.get_complete_header_text() == "Thank you for your order!", "Checkout was not completed."
+
+
+FLOWS = {
+    flow.name: flow
+    for flow in (
+        Flow("login", login, ("", "inventory.html")),
+        Flow("add_one_item", add_one_item, ("inventory.html",)),
+        Flow("add_all_items", add_all_items, ("inventory.html",)),
+        Flow("remove_item", remove_item, ("cart.html",)),
+        Flow("checkout", checkout, (
+            "cart.html", "checkout-step-one.html", "checkout-step-two.html", "checkout-complete.html",
+        )),
+    )
+}
@@ -0,0 +1,746 @@
+"""
+Test-impact selection from a static dependency graph of the project.
+
+Every module, class, function and module-level variable of the project is a node. A
+node depends on the names it uses: imported modules and symbols (including imports
+inside methods, such as the lazy page imports in `CartPage.go_to_checkout`) and
+definitions of its own module. `receiver.method` resolves through the type of the
+receiver and its bases, inferred from `self`, annotations, assignments, fixtures and
+what the called functions return (`LoginPage(driver).open().login(...)` is an
+`InventoryPage`). A receiver typed with a Protocol reaches the classes implementing
+it; one typed with a class from outside the project (a Selenium `WebDriver`) reaches
+the methods of that name the project's stand-ins (`DomBackend`) define. A call on a
+receiver of unknown type adds no edge. A test is affected by a change if its function,
+one of its fixtures or a fixture they request with `request.getfixturevalue` reaches a
+node whose lines changed since a git ref.
+
+Parsing results are cached per file and reused while the file's hash is unchanged.
+"""
+import ast
+import hashlib
+import inspect
+import json
+import os
+import re
+import subprocess
+from collections import deque
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILE = ".impact_graph.json"
+CACHE_VERSION = 2
+MODULE = "<module>"
+# The type of a value that comes from outside the project
+EXTERNAL = "<external>"
+SKIPPED_DIRS = {"__pycache__", "venv", "node_modules", "allure-results", "allure-report"}
+# Changes to these files never change test behaviour
+IGNORED_SUFFIXES = {".md"}
+IGNORED_FILES = {".gitignore"}
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class ImpactGraph:
+    """
+    The dependency graph of all Python files under `root`.
+    """
+
+    def __init__(self, root: Path, cache_file: Path | None = None):
+        """
+        Parses every Python file under `root`, reusing cached results of unchanged files.
+        """
+        self.root = Path(root)
+        self.cache_file = cache_file or self.root / CACHE_FILE
+        self.files = self._load_files()
+        self.modules = {_module_name(path): path for path in self.files}
+        self.fixtures, self.plugins = {}, {}
+        for path, entry in self.files.items():
+            for qualname, node in entry["nodes"].items():
+                if node.get("fixture"):
+                    self.fixtures.setdefault(qualname.rsplit(".", 1)[-1], []).append(f"{path}::{qualname}")
+                for name, values in node.get("plugins", {}).items():
+                    self.plugins.setdefault(name, []).extend((path, qualname, value) for value in values)
+        self.edges = self._link()
+
+    def node_at(self, path: str, line: int) -> str:
+        """
+        Returns the innermost node of `path` whose lines include `line`.
+        """
+        best, best_size = f"{path}::{MODULE}", None
+        for qualname, node in self.files[path]["nodes"].items():
+            start, end = node["lines"]
+            if qualname != MODULE and start <= line <= end and (best_size is None or end - start < best_size):
+                best, best_size = f"{path}::{qualname}", end - start
+        return best
+
+    def affected_by(self, changed: set[str]) -> set[str]:
+        """
+        Returns every node that depends, directly or transitively, on one of the `changed` nodes.
+        """
+        dependents = {}
+        for source, targets in self.edges.items():
+            for target in targets:
+                dependents.setdefault(target, set()).add(source)
+        affected = set(changed)
+        queue = deque(changed)
+        while queue:
+            for dependent in dependents.get(queue.popleft(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+        return affected
+
+    def _load_files(self) -> dict:
+        try:
+            cache = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            cached = cache["files"] if cache.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            cached = {}
+        files, parsed = {}, 0
+        for path in _python_files(self.root):
+            source = (self.root / path).read_bytes()
+            digest = hashlib.sha256(source).hexdigest()
+            entry = cached.get(path)
+            if entry is None or entry["hash"] != digest:
+                entry = {"hash": digest, "nodes": _parse(source, path)}
+                parsed += 1
+            files[path] = entry
+        if parsed or set(files) != set(cached):
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps({"version": CACHE_VERSION, "files": files}), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+        logger.info("Impact graph: %d file(s), %d parsed, %d from cache", len(files), parsed, len(files) - parsed)
+        return files
+
+    def _link(self) -> dict:
+        # Every class, and the method names of each
+        self._classes = {f"{path}::{qualname}" for path, entry in self.files.items()
+                         for qualname, node in entry["nodes"].items() if node["kind"] == "class"}
+        self._methods = {}
+        for path, entry in self.files.items():
+            for qualname, node in entry["nodes"].items():
+                class_name, _, name = qualname.rpartition(".")
+                if node["kind"] == "function" and entry["nodes"].get(class_name, {}).get("kind") == "class":
+                    self._methods.setdefault(f"{path}::{class_name}", set()).add(name)
+
+        # Receivers are typed first: which classes stand in for an outside class depends on all its uses
+        receivers, used = {}, {}
+        for path, entry in self.files.items():
+            for qualname, node in entry["nodes"].items():
+                resolved = receivers[f"{path}::{qualname}"] = []
+                for receiver, attribute in node["attributes"]:
+                    target = self._module_attribute(path, qualname, receiver, attribute)
+                    types = self._types(path, qualname, receiver, frozenset()) if target is None else set()
+                    resolved.append((target, types, attribute))
+                    for type_key in types - _internal(types):
+                        used.setdefault(type_key, set()).add(attribute)
+        self._stand_ins = self._find_stand_ins(used)
+
+        edges = {}
+        for path, entry in self.files.items():
+            nodes = entry["nodes"]
+            module_imports = nodes[MODULE]["imports"]
+            for qualname, node in nodes.items():
+                key = f"{path}::{qualname}"
+                targets = edges.setdefault(key, set())
+                if qualname != MODULE:
+                    targets.add(f"{path}::{MODULE}")
+                    parent = qualname.rpartition(".")[0]
+                    if node["kind"] == "class" and parent in nodes:
+                        targets.add(f"{path}::{parent}")
+                if node["kind"] == "module":
+                    # Importing a module runs it, whichever of its symbols is used
+                    for module, symbol in node["imports"].values():
+                        target = self._import_target(module, symbol)
+                        if target is not None:
+                            targets.add(f"{target.split('::')[0]}::{MODULE}")
+                if node["kind"] == "class":
+                    targets.update(f"{key}.{method}" for method in ("__init__", "__init_subclass__")
+                                   if f"{qualname}.{method}" in nodes)
+                bindings = {**module_imports, **node["imports"]}
+                for name in node["names"]:
+                    targets.update(self._resolve_name(path, name, bindings))
+                for target, types, attribute in receivers[key]:
+                    if target is not None:
+                        targets.add(target)
+                    for type_key in types:
+                        targets.update(self._members(type_key, attribute))
+                targets.discard(key)
+        return edges
+
+    def _types(self, path: str, qualname: str, expression, seen: frozenset) -> set:
+        """
+        Returns the classes an expression in node `qualname` of `path` can evaluate to: node keys, or EXTERNAL
+        followed by the dotted name of a class from outside the project.
+
+        A class and its instances are not told apart; both resolve their members through the class.
+        """
+        marker = (path, qualname, json.dumps(expression))
+        if expression is None or marker in seen:
+            return set()
+        seen = seen | {marker}
+        nodes = self.files[path]["nodes"]
+        node = nodes[qualname]
+        kind = expression[0]
+        if kind == "either":
+            return set().union(*(self._types(path, qualname, value, seen) for value in expression[1:]))
+        if kind == "fixture":
+            return set().union(*(self._results(fixture, None, seen) for fixture in self.fixtures.get(expression[1], ())))
+        if kind == "plugin":
+            return set().union(*(self._types(*registration, seen) for registration in self.plugins.get(expression[1], ())))
+        if kind == "name":
+            name = expression[1]
+            owner = qualname if node["kind"] == "class" else _owner_class(nodes, qualname)
+            if name in ("self", "cls") and owner is not None:
+                return {f"{path}::{owner}"}
+            if name in node["assigned"]:
+                return set().union(*(self._types(path, qualname, value, seen) for value in node["assigned"][name]))
+            if name in node["params"]:
+                annotation = node["params"][name]
+                if annotation is not None:
+                    return self._types(path, qualname, annotation, seen)
+                # Test and fixture arguments are fixtures
+                return set().union(*(self._results(fixture, None, seen) for fixture in self.fixtures.get(name, ())))
+            return self._global_types(path, qualname, name, seen, called=False)
+        if kind == "call":
+            function = expression[1]
+            if function is None:
+                return set()
+            if function == ["name", "super"]:
+                owner = _owner_class(nodes, qualname)
+                return set(self._class_hierarchy(f"{path}::{owner}")[1:]) if owner is not None else set()
+            if function[0] == "name" and function[1] not in ("self", "cls") and \
+                    function[1] not in node["assigned"] and function[1] not in node["params"]:
+                return self._global_types(path, qualname, function[1], seen, called=True)
+            if function[0] == "attr":
+                receiver, attribute = function[1], function[2]
+                target = self._module_attribute(path, qualname, receiver, attribute)
+                if target is not None:
+                    target_path, target_name = target.split("::")
+                    return self._global_types(target_path, MODULE, target_name, seen, called=True)
+                types = set()
+                # What a method of an outside class returns is unknown
+                for type_key in _internal(self._types(path, qualname, receiver, seen)):
+                    for member in self._members(type_key, attribute):
+                        types.update(self._results(member, type_key, seen))
+                return types
+            # Calling a class (e.g. `cls(...)`) gives an instance of it
+            return self._types(path, qualname, function, seen)
+        # An instance attribute: the types assigned to `self.<attribute>` in the methods of the receiver's class
+        receiver, attribute = expression[1], expression[2]
+        target = self._module_attribute(path, qualname, receiver, attribute)
+        if target is not None:
+            target_path, target_name = target.split("::")
+            return self._global_types(target_path, MODULE, target_name, seen, called=False)
+        if receiver is not None and receiver[0] == "name" and _is_class_name(attribute):
+            # `webdriver.Chrome`, a class of an outside module
+            modules = self._global_types(path, qualname, receiver[1], seen, called=False, module=True)
+            if modules:
+                return {f"{module}.{attribute}" for module in modules}
+        types = set()
+        for type_key in _internal(self._types(path, qualname, receiver, seen)):
+            types.update(self._instance_types(type_key, attribute, seen))
+        return types
+
+    def _instance_types(self, type_key: str, attribute: str, seen: frozenset) -> set:
+        """
+        Returns the types of `instance.attribute`: what the methods of the class or its bases assign to
+        `self.<attribute>`, or what the property `attribute` returns.
+        """
+        types = set()
+        for class_key in self._class_hierarchy(type_key):
+            path, class_name = class_key.split("::")
+            for member, node in self.files[path]["nodes"].items():
+                if member.rpartition(".")[0] == class_name:
+                    for value in node["instance"].get(attribute, ()):
+                        types.update(self._types(path, member, value, seen))
+        if not types:
+            path, class_name = type_key.split("::")
+            member = self._class_member(path, class_name, attribute, set())
+            if member is not None and member != type_key:
+                types.update(self._results(member, type_key, seen))
+        return types
+
+    def _class_hierarchy(self, type_key: str) -> list:
+        """
+        Returns the class `type_key` followed by its bases within the project.
+        """
+        hierarchy, pending = [], [type_key]
+        while pending:
+            class_key = pending.pop()
+            if class_key in hierarchy:
+                continue
+            hierarchy.append(class_key)
+            path, class_name = class_key.split("::")
+            nodes = self.files[path]["nodes"]
+            bindings = {**nodes[MODULE]["imports"], **nodes[class_name]["imports"]}
+            for base in nodes[class_name]["bases"]:
+                pending.extend(target for target in self._resolve_name(path, base, bindings) if target in self._classes)
+        return hierarchy
+
+    def _module_attribute(self, path: str, qualname: str, receiver, attribute: str):
+        """
+        Returns the node `receiver.attribute` refers to when `receiver` is an imported module, otherwise None.
+        """
+        if receiver is None or receiver[0] != "name":
+            return None
+        nodes = self.files[path]["nodes"]
+        bindings = {**nodes[MODULE]["imports"], **nodes[qualname]["imports"]}
+        return self._resolve_module_attribute(receiver[1], attribute, bindings)
+
+    def _global_types(self, path: str, qualname: str, name: str, seen: frozenset, called: bool,
+                      module: bool = False) -> set:
+        """
+        Returns the types of a module-level or imported `name`, or of what calling it returns.
+
+        With `module`, returns EXTERNAL followed by the module's name if `name` is an outside module, and
+        nothing otherwise.
+        """
+        nodes = self.files[path]["nodes"]
+        bindings = {**nodes[MODULE]["imports"], **nodes[qualname]["imports"]}
+        targets = self._resolve_name(path, name, bindings)
+        if module or not targets:
+            if targets or name not in bindings:
+                return set()
+            module_name, symbol = bindings[name]
+            if module:
+                return {f"{EXTERNAL}{module_name}"} if symbol is None else set()
+            # Only a class imported from outside the project (`WebDriver`) gives a value of a known, outside type;
+            # what an outside function returns is unknown
+            return {f"{EXTERNAL}{module_name}.{symbol}"} if symbol is not None and _is_class_name(symbol) else set()
+        types = set()
+        for target in targets:
+            target_path, target_name = target.split("::")
+            target_node = self.files[target_path]["nodes"].get(target_name)
+            if target_node is None or target_node["kind"] == "module":
+                continue
+            if target_node["kind"] == "class":
+                types.add(target)
+            elif target_node["kind"] == "variable" or called:
+                types.update(self._results(target, None, seen))
+        return types
+
+    def _results(self, key: str, receiver, seen: frozenset) -> set:
+        """
+        Returns the types of what calling function `key` returns (or yields), or of the value of variable `key`.
+
+        `return self` gives the type the method was looked up on.
+        """
+        path, qualname = key.split("::")
+        node = self.files[path]["nodes"].get(qualname)
+        if node is None or node["kind"] == "class":
+            return {key} if node is not None else set()
+        types = set()
+        for result in node["results"]:
+            if result == ["name", "self"] and receiver is not None:
+                types.add(receiver)
+            else:
+                types.update(self._types(path, qualname, result, seen))
+        return types
+
+    def _members(self, type_key: str, attribute: str) -> set:
+        """
+        Returns the nodes `attribute` can refer to on an instance of the class `type_key`.
+        """
+        if type_key.startswith(EXTERNAL):
+            members = set()
+            for class_key in self._stand_ins.get(type_key, ()):
+                member = self._class_member(*class_key.split("::"), attribute, set())
+                if member is not None:
+                    members.add(member)
+            return members
+        path, class_name = type_key.split("::")
+        member = self._class_member(path, class_name, attribute, set())
+        members = {member} if member is not None else set()
+        if "Protocol" in self.files[path]["nodes"][class_name]["bases"]:
+            members.update(self._implementations(path, class_name, attribute))
+        return members
+
+    def _find_stand_ins(self, used: dict) -> dict:
+        """
+        Maps every outside class to the project classes that can stand in for it (`DomBackend` for a `WebDriver`).
+
+        A stand-in defines every method the project uses on the outside class that any project class defines,
+        and there must be at least two such methods; one shared name (`open`, `start`) is a coincidence.
+        """
+        defined = set().union(*self._methods.values())
+        stand_ins = {}
+        for type_key, attributes in used.items():
+            expected = attributes & defined
+            if len(expected) >= 2:
+                stand_ins[type_key] = [class_key for class_key, names in self._methods.items() if expected <= names]
+        return stand_ins
+
+    def _implementations(self, path: str, protocol: str, attribute: str) -> set:
+        """
+        Returns the methods `attribute` of the classes that define every method of `protocol`.
+        """
+        required = self._methods.get(f"{path}::{protocol}", set())
+        return {
+            f"{class_key}.{attribute}" for class_key, names in self._methods.items()
+            if class_key != f"{path}::{protocol}" and attribute in names and required <= names
+        }
+
+    def _resolve_name(self, path: str, name: str, bindings: dict) -> list:
+        if name in bindings:
+            target = self._import_target(*bindings[name])
+            return [target] if target else []
+        if name in self.files[path]["nodes"]:
+            return [f"{path}::{name}"]
+        return []
+
+    def _class_member(self, path: str, class_name: str, attribute: str, seen: set):
+        """
+        Finds the method or class attribute `attribute` of a class, looking through its bases.
+        """
+        nodes = self.files[path]["nodes"]
+        if f"{class_name}.{attribute}" in nodes:
+            return f"{path}::{class_name}.{attribute}"
+        if attribute in nodes[class_name]["class_attributes"]:
+            return f"{path}::{class_name}"
+        seen.add((path, class_name))
+        bindings = {**nodes[MODULE]["imports"], **nodes[class_name]["imports"]}
+        for base in nodes[class_name]["bases"]:
+            for target in self._resolve_name(path, base, bindings):
+                base_path, base_name = target.split("::")
+                base_node = self.files[base_path]["nodes"].get(base_name)
+                if base_node and base_node["kind"] == "class" and (base_path, base_name) not in seen:
+                    member = self._class_member(base_path, base_name, attribute, seen)
+                    if member is not None:
+                        return member
+        return None
+
+    def _resolve_module_attribute(self, base, attribute: str, bindings: dict):
+        if base is None or base not in bindings:
+            return None
+        target = self._import_target(*bindings[base])
+        if target is None or not target.endswith(f"::{MODULE}"):
+            return None
+        path = target.split("::")[0]
+        return f"{path}::{attribute}" if attribute in self.files[path]["nodes"] else target
+
+    def _import_target(self, module: str, symbol: str | None):
+        if symbol and f"{module}.{symbol}" in self.modules:
+            return self._module_node(f"{module}.{symbol}")
+        path = self.modules.get(module)
+        if path is None:
+            return None
+        if symbol and symbol in self.files[path]["nodes"]:
+            return f"{path}::{symbol}"
+        return f"{path}::{MODULE}"
+
+    def _module_node(self, module: str):
+        path = self.modules.get(module)
+        return f"{path}::{MODULE}" if path else None
+
+
+def changed_nodes(graph: ImpactGraph, ref: str) -> set[str] | None:
+    """
+    Returns the nodes whose lines changed between `ref` and the working tree.
+
+    Returns None when a change cannot be mapped to nodes (a deleted module, a conftest.py,
+    resources or configuration files), which means every test is affected.
+    """
+    status = _git(graph.root, "diff", "--name-status", "--no-renames", ref, "--")
+    untracked = _git(graph.root, "ls-files", "--others", "--exclude-standard")
+    changes = [line.split("\t", 1) for line in status.splitlines() if line]
+    changes += [["A", path] for path in untracked.splitlines() if path]
+
+    nodes = set()
+    for state, path in changes:
+        if Path(path).suffix in IGNORED_SUFFIXES or Path(path).name in IGNORED_FILES:
+            continue
+        if path not in graph.files or state == "D" or Path(path).name == "conftest.py":
+            logger.info("Change to %s affects every test", path)
+            return None
+        if state == "A":
+            nodes.update(f"{path}::{qualname}" for qualname in graph.files[path]["nodes"])
+            continue
+        diff = _git(graph.root, "diff", "-U0", "--no-renames", ref, "--", path)
+        for line in diff.splitlines():
+            match = HUNK_HEADER.match(line)
+            if not match:
+                continue
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # A pure deletion is reported as the line before it, with a count of 0
+            for number in range(start, start + max(count, 1) + (count == 0)):
+                nodes.add(graph.node_at(path, number))
+    return nodes
+
+
+def verify_ref(root: Path, ref: str):
+    """
+    Raises ValueError when `ref` does not name a commit of the git repository at `root`.
+    """
+    try:
+        _git(root, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise ValueError(f"'{ref}' is not a commit of the git repository at {root}") from e
+
+
+def select_tests(graph: ImpactGraph, ref: str, tests: dict) -> set | None:
+    """
+    Returns the ids of the `tests` affected by the changes since `ref`, or None if every test is.
+
+    `tests` maps a test id to the nodes the test runs (its own function and its fixtures), or to None
+    when they cannot be told; such a test is always selected.
+    """
+    changed = changed_nodes(graph, ref)
+    if changed is None:
+        return None
+    affected = graph.affected_by(changed)
+    logger.info("%d node(s) changed since %s, %d affected", len(changed), ref, len(affected))
+    return {test_id for test_id, nodes in tests.items() if nodes is None or any(node in affected for node in nodes)}
+
+
+def item_nodes(item, graph: ImpactGraph) -> list[str] | None:
+    """
+    Returns the graph nodes a collected pytest item runs: its test function and the functions of its fixtures.
+
+    Fixtures requested with `request.getfixturevalue` are followed too. Returns None when one of these
+    functions requests a fixture whose name is not a literal.
+    """
+    root = graph.root.resolve()
+    manager = item.session._fixturemanager
+    nodes, functions, names, seen = [], [getattr(item, "obj", None)], list(item.fixturenames), set()
+    while functions or names:
+        for function in functions:
+            try:
+                path = Path(inspect.getsourcefile(function)).resolve().relative_to(root).as_posix()
+            except (TypeError, ValueError):
+                # Built-in or third-party fixtures are outside the graph
+                continue
+            key = f"{path}::{function.__qualname__}"
+            nodes.append(key)
+            requests = graph.files.get(path, {}).get("nodes", {}).get(function.__qualname__, {}).get("requests", [])
+            if "*" in requests:
+                return None
+            names.extend(requests)
+        functions = []
+        while names:
+            name = names.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            for definition in item._fixtureinfo.name2fixturedefs.get(name) or manager.getfixturedefs(name, item) or ():
+                functions.append(definition.func)
+                names.extend(definition.argnames)
+    return nodes
+
+
+def _python_files(root: Path):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIPPED_DIRS)
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                yield Path(directory, filename).relative_to(root).as_posix()
+
+
+def _module_name(path: str) -> str:
+    return path[:-len(".py")].replace("/", ".").removesuffix(".__init__")
+
+
+def _parse(source: bytes, path: str) -> dict:
+    """
+    Describes the module, classes and functions of one file: their lines, imports and used names.
+    """
+    tree = ast.parse(source, filename=path)
+    package = _module_name(path).rpartition(".")[0]
+    module_body = []
+    nodes = {}
+    for statement in tree.body:
+        names = _assigned_names(statement)
+        if not names:
+            module_body.append(statement)
+            continue
+        # Module-level constants (test data, scripts, registries) are nodes of their own
+        for name in names:
+            nodes[name] = _describe("variable", (statement.lineno, statement.end_lineno), [statement.value], package)
+            nodes[name]["results"] = [_expression(statement.value)]
+    nodes[MODULE] = _describe("module", (1, max(1, len(source.splitlines()))), module_body, package)
+
+    def visit(body, prefix: str):
+        for statement in body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{statement.name}"
+                start = min([statement.lineno] + [decorator.lineno for decorator in statement.decorator_list])
+                lines = (start, statement.end_lineno)
+                if isinstance(statement, ast.ClassDef):
+                    parts = statement.decorator_list + statement.bases + statement.keywords + statement.body
+                    nodes[qualname] = _describe("class", lines, parts, package)
+                    nodes[qualname]["class_attributes"] = sorted(
+                        name for member in statement.body for name in _assigned_names(member)
+                    )
+                    nodes[qualname]["bases"] = [base.id for base in statement.bases if isinstance(base, ast.Name)]
+                    visit(statement.body, f"{qualname}.")
+                else:
+                    returns = [statement.returns] if statement.returns is not None else []
+                    parts = statement.decorator_list + [statement.args] + returns + statement.body
+                    nodes[qualname] = _describe("function", lines, parts, package, nested=True)
+                    nodes[qualname]["results"] += [_expression(annotation) for annotation in returns]
+                    nodes[qualname]["fixture"] = any(_is_fixture(decorator) for decorator in statement.decorator_list)
+
+    visit(tree.body, "")
+    return nodes
+
+
+def _describe(kind: str, lines: tuple, parts: list, package: str, nested: bool = False) -> dict:
+    """
+    Describes one node from its AST parts: imports and used names, attributes with the expression of their
+    receiver, and what type inference needs (assignments, parameter annotations, results, fixture requests).
+    """
+    imports, names, attributes = {}, set(), {}
+    assigned, params, instance, results, requests, plugins = {}, {}, {}, [], set(), {}
+    stack = list(parts)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and not nested:
+            # Separate nodes; only what is evaluated in this scope belongs here
+            stack.extend(node.decorator_list)
+            continue
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports[alias.asname or alias.name.split(".")[0]] = (alias.name if alias.asname else alias.name.split(".")[0], None)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package.split(".")[:len(package.split(".")) - node.level + 1] if package else []
+                module = ".".join(filter(None, base + [module]))
+            for alias in node.names:
+                if alias.name != "*":
+                    imports[alias.asname or alias.name] = (module, alias.name)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            attribute = [_expression(node.value), node.attr]
+            attributes[json.dumps(attribute)] = attribute
+        elif isinstance(node, ast.arguments):
+            for argument in node.posonlyargs + node.args + node.kwonlyargs:
+                params[argument.arg] = _expression(argument.annotation)
+        elif isinstance(node, (ast.Return, ast.Yield)) and node.value is not None:
+            results.append(_expression(node.value))
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "getfixturevalue":
+            argument = node.args[0] if node.args else None
+            # A name that is not a literal could be any fixture
+            requests.add(argument.value if isinstance(argument, ast.Constant) and isinstance(argument.value, str) else "*")
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "register":
+            arguments = node.args + [keyword.value for keyword in node.keywords if keyword.arg == "name"]
+            if len(arguments) == 2 and isinstance(arguments[1], ast.Constant) and isinstance(arguments[1].value, str):
+                plugins.setdefault(arguments[1].value, []).append(_expression(arguments[0]))
+        if isinstance(node, (ast.Assign, ast.AnnAssign, ast.NamedExpr, ast.withitem)):
+            for target, value in _bindings(node):
+                if isinstance(target, ast.Name):
+                    assigned.setdefault(target.id, []).append(_expression(value))
+                elif isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self":
+                    instance.setdefault(target.attr, []).append(_expression(value))
+        stack.extend(ast.iter_child_nodes(node))
+    return {
+        "kind": kind,
+        "lines": list(lines),
+        "imports": imports,
+        "names": sorted(names),
+        "attributes": [attributes[key] for key in sorted(attributes)],
+        "assigned": assigned,
+        "params": params,
+        "instance": instance,
+        "results": results,
+        "requests": sorted(requests),
+        "plugins": plugins,
+    }
+
+
+def _expression(node):
+    """
+    Returns a JSON-friendly description of the expressions type inference can follow, otherwise None.
+
+    `["name", id]`, `["attr", receiver, attribute]`, `["call", function]`, `["either", *alternatives]` and the
+    fixture or plugin a literal name is looked up as (`["fixture", name]`, `["plugin", name]`). A string is read
+    as the annotation it may be.
+    """
+    if isinstance(node, ast.Name):
+        return ["name", node.id]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            return _expression(ast.parse(node.value, mode="eval").body)
+        except SyntaxError:
+            return None
+    if isinstance(node, ast.Attribute):
+        return ["attr", _expression(node.value), node.attr]
+    if isinstance(node, ast.Call):
+        name = node.args[0].value if node.args and isinstance(node.args[0], ast.Constant) else None
+        if isinstance(node.func, ast.Attribute) and node.func.attr in ("getfixturevalue", "get_plugin") and \
+                isinstance(name, str):
+            # `request.getfixturevalue("driver")` and `pluginmanager.get_plugin("browser_watchdog")`
+            return ["fixture" if node.func.attr == "getfixturevalue" else "plugin", name]
+        return ["call", _expression(node.func)]
+    if isinstance(node, ast.IfExp):
+        return ["either", _expression(node.body), _expression(node.orelse)]
+    if isinstance(node, ast.BoolOp):
+        return ["either", *(_expression(value) for value in node.values)]
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        # `Page | None`
+        return _expression(node.left)
+    if isinstance(node, ast.Await):
+        return _expression(node.value)
+    return None
+
+
+def _bindings(node) -> list:
+    """
+    Returns (target, value) pairs of an assignment, an annotated assignment (typed by its annotation) or a `with ... as`.
+    """
+    if isinstance(node, ast.Assign):
+        return [(target, node.value) for target in node.targets]
+    if isinstance(node, ast.AnnAssign):
+        return [(node.target, node.annotation)]
+    if isinstance(node, ast.NamedExpr):
+        return [(node.target, node.value)]
+    return [(node.optional_vars, node.context_expr)] if node.optional_vars is not None else []
+
+
+def _internal(types: set) -> set:
+    return {type_key for type_key in types if not type_key.startswith(EXTERNAL)}
+
+
+def _is_class_name(name: str) -> bool:
+    return name[:1].isupper() and not name.isupper()
+
+
+def _is_fixture(decorator) -> bool:
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    return (isinstance(decorator, ast.Attribute) and decorator.attr == "fixture") or \
+        (isinstance(decorator, ast.Name) and decorator.id == "fixture")
+
+
+def _assigned_names(statement) -> list:
+    """
+    Returns the names bound by a plain `NAME = value` or `NAME: type = value` statement.
+    """
+    if isinstance(statement, ast.Assign):
+        targets = statement.targets
+    elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+        targets = [statement.target]
+    else:
+        return []
+    return [target.id for target in targets] if all(isinstance(t, ast.Name) for t in targets) else []
+
+
+def _owner_class(nodes: dict, qualname: str):
+    """
+    Returns the qualified name of the class a method (or a nested function of a method) belongs to.
+    """
+    parts = qualname.split(".")
+    for end in range(len(parts) - 1, 0, -1):
+        candidate = ".".join(parts[:end])
+        if nodes.get(candidate, {}).get("kind") == "class":
+            return candidate
+    return None
+
+
+def _git(root: Path, *args) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=root, check=True, capture_output=True, text=True
+    ).stdout
@@ -0,0 +1,310 @@
+"""
+Browserless load generation with the flows of `utils/flows.py`.
+
+Browsers do not scale past a handful per machine, so this replays the flows at the HTTP
+level instead: every virtual user is an asyncio task that repeatedly runs a flow by loading
+its `paths` the way a browser would (the page, then the scripts and stylesheets it
+references) over a shared pool of keep-alive connections. The shop keeps the session and
+the cart in the browser, so the page loads are all the server sees of a flow.
+
+    python -m utils.load --users 2000 --ramp-up 20 --duration 60
+    python -m utils.load --url http://127.0.0.1:8000/ --flows login,checkout --connections 200
+"""
+import argparse
+import asyncio
+import logging
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+from utils.flows import FLOWS
+from utils.local_app import LocalAppServer
+from utils.logger import TEXT_FORMAT, get_logger
+from utils.tracing import percentile
+
+logger = get_logger(__name__)
+
+ASSET_PATTERN = re.compile(r"""<(?:script|link)\b[^>]*?\b(?:src|href)=["']([^"'#]+)["']""", re.IGNORECASE)
+DEFAULT_TIMEOUT = 10.0
+
+
+class HttpError(Exception):
+    """
+    A request that failed or was answered with an error status.
+    """
+
+
+@dataclass
+class FlowStats:
+    """
+    Outcomes of every run of one flow.
+    """
+    name: str
+    latencies_ms: list = field(default_factory=list)
+    errors: dict = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def runs(self) -> int:
+        return len(self.latencies_ms) + sum(self.errors.values())
+
+
+class ConnectionPool:
+    """
+    HTTP/1.1 keep-alive connections to one server, shared by all virtual users.
+
+    At most `size` connections are open at once; a user waits for a free one. A
+    connection the server closed is replaced transparently on the next request.
+    """
+
+    def __init__(self, base_url: str, size: int, timeout: float = DEFAULT_TIMEOUT):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only plain HTTP is supported, got '{base_url}'")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def get(self, path: str) -> bytes:
+        """
+        Sends a GET request and returns the body; raises HttpError for any status >= 400.
+        """
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = await self._open()
+                try:
+                    status, keep_alive, body = await asyncio.wait_for(self._request(connection, path), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The server closed the idle connection; retry once on a new one
+                    connection[1].close()
+                    connection = await self._open()
+                    status, keep_alive, body = await asyncio.wait_for(self._request(connection, path), self.timeout)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+                if connection is not None:
+                    connection[1].close()
+                raise HttpError(f"GET {path}: {e.__class__.__name__}") from e
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        if status >= 400:
+            raise HttpError(f"GET {path}: HTTP {status}")
+        return body
+
+    async def close(self):
+        """
+        Closes every idle connection.
+        """
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _open(self):
+        connection = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        self.opened += 1
+        return connection
+
+    async def _request(self, connection, path: str) -> tuple[int, bool, bytes]:
+        reader, writer = connection
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by the server")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return int(status), keep_alive, body
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        chunks = []
+        while size := int((await reader.readline()).split(b";", 1)[0], 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        await reader.readline()
+        return b"".join(chunks)
+
+
+class LoadRun:
+    """
+    Runs virtual users against a base URL and collects per-flow latencies and errors.
+    """
+
+    def __init__(self, base_url: str, flows: list[str], users: int, ramp_up: float, duration: float,
+                 connections: int, think_time: float = 0.0):
+        unknown = [name for name in flows if name not in FLOWS]
+        if unknown:
+            raise ValueError(f"Unknown flow(s) {unknown}; choose from {sorted(FLOWS)}")
+        self.base_url = base_url
+        self.flows = [FLOWS[name] for name in flows]
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.connections = connections
+        self.think_time = think_time
+        self.stats = {flow.name: FlowStats(flow.name) for flow in self.flows}
+        self.requests = 0
+        self.elapsed = 0.0
+        self._assets = {}
+        self._deadline = 0.0
+
+    async def run(self):
+        """
+        Ramps up to `users` virtual users over `ramp_up` seconds and stops them all after `duration` seconds.
+        """
+        pool = ConnectionPool(self.base_url, self.connections)
+        started = time.monotonic()
+        self._deadline = started + self.duration
+        logger.info("Starting %d virtual user(s) over %ss for %ss against %s",
+                    self.users, self.ramp_up, self.duration, self.base_url)
+        tasks = []
+        for index in range(self.users):
+            # Evenly spaced start times; each user starts on a different flow to spread the mix
+            delay = self.ramp_up * index / self.users
+            tasks.append(asyncio.create_task(self._user(pool, index, started + delay)))
+        await asyncio.gather(*tasks)
+        self.elapsed = time.monotonic() - started
+        await pool.close()
+        logger.info("Load run finished: %d request(s) over %d connection(s)", self.requests, pool.opened)
+        return self
+
+    async def _user(self, pool: ConnectionPool, index: int, start_at: float):
+        await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+        iteration = index
+        while time.monotonic() < self._deadline:
+            flow = self.flows[iteration % len(self.flows)]
+            iteration += 1
+            stats = self.stats[flow.name]
+            flow_started = time.perf_counter()
+            try:
+                for path in flow.paths:
+                    await self._load_page(pool, path)
+            except HttpError as e:
+                stats.errors[str(e)] += 1
+            else:
+                stats.latencies_ms.append((time.perf_counter() - flow_started) * 1000)
+            if self.think_time:
+                await asyncio.sleep(self.think_time)
+
+    async def _load_page(self, pool: ConnectionPool, path: str):
+        page = "/" + path.lstrip("/")
+        body = await self._get(pool, page)
+        if page not in self._assets:
+            self._assets[page] = self._same_origin_assets(page, body.decode("utf-8", "replace"))
+        # A browser fetches the scripts and stylesheets of a page in parallel
+        await asyncio.gather(*(self._get(pool, asset) for asset in self._assets[page]))
+
+    async def _get(self, pool: ConnectionPool, path: str) -> bytes:
+        self.requests += 1
+        return await pool.get(path)
+
+    def _same_origin_assets(self, page: str, html: str) -> list[str]:
+        base = urljoin(self.base_url, page)
+        origin = urlsplit(self.base_url).netloc
+        assets = []
+        for reference in ASSET_PATTERN.findall(html):
+            url = urlsplit(urljoin(base, reference))
+            if url.scheme in ("http", "https") and url.netloc == origin:
+                assets.append(url.path + (f"?{url.query}" if url.query else ""))
+        return assets
+
+    def summary(self) -> list[dict]:
+        """
+        Returns throughput, latency percentiles and the error rate of every flow.
+        """
+        rows = []
+        for name, stats in self.stats.items():
+            latencies = sorted(stats.latencies_ms)
+            errors = sum(stats.errors.values())
+            rows.append({
+                "flow": name,
+                "runs": stats.runs,
+                "per_second": round(stats.runs / self.elapsed, 2) if self.elapsed else 0.0,
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+                "error_rate": round(errors / stats.runs, 4) if stats.runs else 0.0,
+            })
+        return rows
+
+    def format_summary(self) -> str:
+        """
+        Renders `summary()` as a plain-text table followed by the most frequent errors.
+        """
+        lines = [f"{'flow':<16}  {'runs':>8}  {'runs/s':>8}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  "
+                 f"{'max ms':>9}  {'errors':>7}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['flow']:<16}  {row['runs']:>8}  {row['per_second']:>8.1f}  {row['p50_ms']:>9.2f}  "
+                f"{row['p95_ms']:>9.2f}  {row['p99_ms']:>9.2f}  {row['max_ms']:>9.2f}  {row['error_rate']:>7.2%}"
+            )
+        lines.append(f"{self.requests} request(s) in {self.elapsed:.1f}s ({self.requests / max(self.elapsed, 1e-9):.0f}/s)")
+        errors = defaultdict(int)
+        for stats in self.stats.values():
+            for error, count in stats.errors.items():
+                errors[error] += count
+        for error, count in sorted(errors.items(), key=lambda item: item[1], reverse=True)[:5]:
+            lines.append(f"  {count:>6} x {error}")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the shop's user flows with many browserless virtual users.")
+    parser.add_argument("--url", default=None,
+                        help="Base URL of the shop; defaults to starting the bundled local app.")
+    parser.add_argument("--flows", default=",".join(FLOWS),
+                        help=f"Comma-separated flows to run, in rotation (default: {','.join(FLOWS)}).")
+    parser.add_argument("--users", type=int, default=100, help="Number of virtual users (default: 100).")
+    parser.add_argument("--ramp-up", type=float, default=10.0,
+                        help="Seconds over which the users are started (default: 10).")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="Seconds from the start until every user stops (default: 30).")
+    parser.add_argument("--connections", type=int, default=100,
+                        help="Size of the shared keep-alive connection pool (default: 100).")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Seconds a user pauses between two flows (default: 0).")
+    args = parser.parse_args(argv)
+    logging.basicConfig(format=TEXT_FORMAT, stream=sys.stdout)
+
+    server = LocalAppServer().start() if args.url is None else None
+    try:
+        load_run = LoadRun(
+            args.url or server.url, args.flows.split(","), args.users, args.ramp_up, args.duration,
+            args.connections, args.think_time,
+        )
+        asyncio.run(load_run.run())
+    finally:
+        if server is not None:
+            server.stop()
+    print(load_run.format_summary())
+    return 1 if any(row["error_rate"] for row in load_run.summary()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+import argparse
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+APP_ROOT = Path(__file__).resolve().parent.parent / "resources" / "saucedemo"
+
+# Client-side routes of the shop; they all serve the single-page app shell
+APP_ROUTES = {
+    "/",
+    "/inventory.html",
+    "/inventory-item.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+}
+
+
+class _AppRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_head(self):
+        if self.path.split("?", 1)[0] in APP_ROUTES:
+            self.path = "/index.html"
+        return super().send_head()
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _AppHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 refuses connections when many clients connect at once
+    request_queue_size = 128
+
+
+class LocalAppServer:
+    """
+    Serves the bundled replica of Sauce Demo over HTTP on a background thread.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, root: Path = APP_ROOT):
+        """
+        Initializes the server. Port 0 picks a free ephemeral port on `start()`.
+        """
+        self.host = host
+        self.port = port
+        self.root = root
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the running server, ending with a slash.
+        """
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """
+        Binds the socket and starts serving requests.
+        """
+        handler = partial(_AppRequestHandler, directory=str(self.root))
+        self._httpd = _AppHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-app", daemon=True)
+        self._thread.start()
+        logger.info("Local Sauce Demo app is serving at %s", self.url)
+        return self
+
+    def stop(self):
+        """
+        Stops serving and releases the port.
+        """
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            logger.info("Local Sauce Demo app stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the bundled Sauce Demo replica.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    arguments = parser.parse_args()
+    server = LocalAppServer(arguments.host, arguments.port).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,18 +1,116 @@
+import atexit
+import json
 import logging
-import sys
+import os
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL_ENV = "SAUCEDEMO_LOG_LEVEL"
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_queue = queue.SimpleQueue()
+_loggers = []
+_context = {"test_id": None}
+_state = {"level": os.environ.get(LOG_LEVEL_ENV, "INFO").upper(), "json_file": None, "listener": None}
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Puts records on the log queue without formatting them on the calling thread.
+    """
+
+    def prepare(self, record):
+        record.test_id = _context["test_id"]
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line, including the test, page class and locator.
+    """
+
+    def format(self, record):
+        locator = getattr(record, "locator", None)
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "test_id": getattr(record, "test_id", None),
+            "page": getattr(record, "page", None),
+            "locator": f"{locator[0]}={locator[1]}" if locator else None,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+_handler = _ContextQueueHandler(_queue)
 
 
 def get_logger(name):
     """
     Configures and returns a logger.
+
+    Records propagate to the root logger, where pytest captures them per test (and `caplog` sees them);
+    while a JSON lines file is configured, they are also handed to the background log listener.
     """
     logger = logging.getLogger(name)
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+    if logger not in _loggers:
+        logger.setLevel(_state["level"])
+        if _state["listener"] is not None:
+            logger.addHandler(_handler)
+        _loggers.append(logger)
     return logger
+
+
+def configure_logging(level: str | None = None, json_file=None):
+    """
+    Sets the level of all project loggers and, optionally, a JSON lines file to log to.
+    """
+    if level:
+        _state["level"] = level.upper()
+        for logger in _loggers:
+            logger.setLevel(_state["level"])
+    if json_file is not None:
+        _state["json_file"] = json_file
+        stop_logging()
+        _start_listener()
+        for logger in _loggers:
+            logger.addHandler(_handler)
+
+
+def set_log_context(test_id: str | None):
+    """
+    Sets the id of the running test, added to every record logged from now on.
+    """
+    _context["test_id"] = test_id
+
+
+def stop_logging():
+    """
+    Writes all queued records and stops the background listener.
+    """
+    for logger in _loggers:
+        logger.removeHandler(_handler)
+    listener = _state["listener"]
+    if listener is not None:
+        _state["listener"] = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _start_listener():
+    os.makedirs(os.path.dirname(os.path.abspath(_state["json_file"])), exist_ok=True)
+    json_handler = logging.FileHandler(_state["json_file"], mode="w", encoding="utf-8", delay=True)
+    json_handler.setFormatter(JsonLinesFormatter())
+    listener = QueueListener(_queue, json_handler, respect_handler_level=True)
+    listener.start()
+    _state["listener"] = listener
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,144 @@
+"""
+Browser-side performance metrics of the pages the tests open.
+
+When enabled, every full page load done through a page object (`BasePage.navigate` or
+the `SessionSeeder`) records Navigation Timing, paint and Largest Contentful Paint times
+and the number and size of the loaded resources. Network and CPU throttling profiles are
+applied through the Chrome DevTools Protocol, and tests can declare latency budgets:
+
+    @pytest.mark.latency_budget("InventoryPage", throttling="fast_3g", dom_interactive=1500)
+"""
+from dataclasses import dataclass
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ThrottlingProfile:
+    """
+    Network and CPU conditions emulated by Chrome.
+    """
+    name: str
+    latency_ms: float = 0
+    download_bytes_per_second: float = -1
+    upload_bytes_per_second: float = -1
+    cpu_slowdown: float = 1
+
+
+# The presets of Chrome DevTools
+NO_THROTTLING = ThrottlingProfile("none")
+THROTTLING_PROFILES = {
+    profile.name: profile
+    for profile in (
+        NO_THROTTLING,
+        ThrottlingProfile("fast_3g", 562.5, 1.6 * 1024 * 1024 / 8 * 0.9, 750 * 1024 / 8 * 0.9, cpu_slowdown=4),
+        ThrottlingProfile("slow_3g", 2000, 500 * 1024 / 8 * 0.8, 500 * 1024 / 8 * 0.8, cpu_slowdown=6),
+        ThrottlingProfile("regular_4g", 20, 4 * 1024 * 1024 / 8, 3 * 1024 * 1024 / 8),
+    )
+}
+
+METRICS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var paints = {};
+performance.getEntriesByType('paint').forEach(function (entry) { paints[entry.name] = entry.startTime; });
+var result = {
+    ttfb: nav ? nav.responseStart : null,
+    dom_interactive: nav ? nav.domInteractive : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    first_paint: paints['first-paint'] || null,
+    first_contentful_paint: paints['first-contentful-paint'] || null,
+    largest_contentful_paint: null,
+    resources: resources.length,
+    transfer_bytes: (nav ? nav.transferSize : 0) + resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0)
+};
+try {
+    var observer = new PerformanceObserver(function () {});
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+    var entries = observer.takeRecords();
+    observer.disconnect();
+    if (entries.length) result.largest_contentful_paint = entries[entries.length - 1].startTime;
+} catch (e) {
+    // Largest Contentful Paint is not supported by this browser
+}
+done(result);
+"""
+
+
+def apply_throttling(driver: WebDriver, profile: ThrottlingProfile):
+    """
+    Emulates the profile's network and CPU conditions in the browser (NO_THROTTLING restores them).
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile.latency_ms,
+        "downloadThroughput": profile.download_bytes_per_second,
+        "uploadThroughput": profile.upload_bytes_per_second,
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_slowdown})
+    if profile is not NO_THROTTLING:
+        logger.info("Throttling the browser to the '%s' profile", profile.name)
+
+
+def check_budgets(measurements: list[dict], page: str, budgets: dict) -> list[str]:
+    """
+    Describes every budget of `page` (metric name to milliseconds) that a measurement exceeded.
+    """
+    page_measurements = [m for m in measurements if m["page"] == page]
+    if not page_measurements:
+        return [f"no performance metrics were collected for {page}"]
+    violations = []
+    for measurement in page_measurements:
+        for metric, limit in budgets.items():
+            value = measurement["metrics"].get(metric)
+            if value is None:
+                violations.append(f"{page} did not report '{metric}' ({measurement['url']})")
+            elif value > limit:
+                violations.append(f"{page} {metric} {value:.0f} ms > budget {limit:.0f} ms ({measurement['url']})")
+    return violations
+
+
+class PageMetricsRecorder:
+    """
+    Collects the metrics of the current test's page loads while enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.throttling = NO_THROTTLING
+        self.measurements = []
+
+    def start_test(self, enabled: bool, throttling: ThrottlingProfile):
+        """
+        Clears the measurements of the previous test and sets up collection for the next one.
+        """
+        self.enabled = enabled
+        self.throttling = throttling
+        self.measurements = []
+
+    def record(self, driver: WebDriver, page: str):
+        """
+        Collects the metrics of the document currently loaded in `driver` on behalf of `page`.
+        """
+        if not self.enabled:
+            return
+        try:
+            metrics = driver.execute_async_script(METRICS_SCRIPT)
+            url = driver.current_url
+        except WebDriverException as e:
+            logger.warning("Could not collect performance metrics for %s: %s", page, e)
+            return
+        metrics = {name: round(value, 1) if isinstance(value, float) else value for name, value in metrics.items()}
+        self.measurements.append({"page": page, "url": url, "throttling": self.throttling.name, "metrics": metrics})
+        logger.info("Performance metrics for %s: %s", page, metrics)
+
+
+page_metrics = PageMetricsRecorder()
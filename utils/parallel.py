@@ -0,0 +1,179 @@
+import filecmp
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DURATIONS_FILE = ".test_durations.json"
+DEFAULT_DURATION = 10.0
+WORKER_ENV = "SAUCEDEMO_WORKER_ID"
+
+
+def load_durations(path: Path) -> dict:
+    """
+    Loads the per-test durations recorded by previous runs.
+    """
+    return _read_json(path)
+
+
+def save_durations(path: Path, durations: dict):
+    """
+    Merges `durations` into the durations file, keeping the most recent value per test.
+    """
+    merged = load_durations(path)
+    merged.update(durations)
+    Path(path).write_text(json.dumps(merged, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def lpt_shards(nodeids: list[str], durations: dict, workers: int) -> list[list[str]]:
+    """
+    Splits tests into `workers` shards using the longest-processing-time-first heuristic.
+
+    Tests without a recorded duration are assumed to take as long as the average known test.
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    weighted = sorted(nodeids, key=lambda nodeid: durations.get(nodeid, fallback), reverse=True)
+
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in weighted:
+        lightest = loads.index(min(loads))
+        shards[lightest].append(nodeid)
+        loads[lightest] += durations.get(nodeid, fallback)
+    logger.info("Planned %s shard(s) with estimated loads: %s", workers, ', '.join(f'{load:.1f}s' for load in loads))
+    return [shard for shard in shards if shard]
+
+
+class DurationRecorder:
+    """
+    Pytest plugin that records the duration and outcome of every test, and which tests needed step retries.
+
+    Durations are merged into the durations file at the end of a normal run. A worker
+    process instead hands its reports, made serializable by `serialize`, to its parent
+    through `shard_result`; the parent replays them, so they reach this plugin there.
+    """
+
+    def __init__(self, durations_file: Path, shard_result: str | None = None, serialize=None):
+        self.durations_file = durations_file
+        self.shard_result = shard_result
+        self.serialize = serialize
+        self.durations = {}
+        self.outcomes = {}
+        self.retried = set()
+        self.reports = []
+
+    def pytest_runtest_logreport(self, report):
+        if self.shard_result:
+            self.reports.append(self.serialize(report=report))
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if dict(report.user_properties).get("step_retries"):
+            self.retried.add(report.nodeid)
+        if report.failed or report.when == "call" or (report.when == "setup" and report.skipped):
+            if self.outcomes.get(report.nodeid) != "failed":
+                self.outcomes[report.nodeid] = report.outcome
+
+    def pytest_sessionfinish(self, session):
+        if self.shard_result:
+            write_shard_result(self.shard_result, self.reports)
+        elif self.durations:
+            save_durations(self.durations_file, self.durations)
+
+
+def strip_option(args: list[str], option: str, takes_value: bool = True) -> list[str]:
+    """
+    Removes `option` and its value (`--opt=value` or `--opt value`) from a list of arguments.
+
+    Flags without a value are stripped with `takes_value=False`.
+    """
+    stripped = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+        elif arg == option:
+            skip_next = takes_value
+        elif not arg.startswith(f"{option}="):
+            stripped.append(arg)
+    return stripped
+
+
+def run_shards(shards: list[list[str]], args: list[str], invocation_dir: Path, alluredir: str | None) -> list[dict]:
+    """
+    Runs every shard in its own pytest worker process and waits for all of them.
+
+    Returns the result of every worker: its exit code, log file and serialized test reports.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="pytest-shards-"))
+    processes = []
+    for index, shard in enumerate(shards):
+        shard_file = workdir / f"shard-{index}.json"
+        result_file = workdir / f"result-{index}.json"
+        log_file = workdir / f"worker-{index}.log"
+        shard_file.write_text(json.dumps(shard), encoding="utf-8")
+
+        command = [sys.executable, "-m", "pytest", *args, f"--shard-file={shard_file}", f"--shard-result={result_file}"]
+        if alluredir:
+            command.append(f"--alluredir={workdir / f'allure-{index}'}")
+        env = dict(os.environ, **{WORKER_ENV: str(index)})
+        log = open(log_file, "w", encoding="utf-8")
+        logger.info("Starting worker %s with %s test(s)", index, len(shard))
+        process = subprocess.Popen(command, cwd=invocation_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        processes.append((index, process, log, result_file, log_file))
+
+    reports = []
+    for index, process, log, result_file, log_file in processes:
+        exit_code = process.wait()
+        log.close()
+        result = _read_json(result_file)
+        reports.append({
+            "worker": index,
+            "exit_code": exit_code,
+            "log": str(log_file),
+            "reports": result.get("reports", []),
+        })
+
+    if alluredir:
+        for index in range(len(shards)):
+            merge_allure_results(workdir / f"allure-{index}", Path(invocation_dir) / alluredir, suffix=f"w{index}")
+    return reports
+
+
+def merge_allure_results(source: Path, destination: Path, suffix: str):
+    """
+    Moves a worker's Allure results into the shared results directory without overwriting files.
+
+    Result and attachment files are uuid-named and never collide; shared files such as
+    `environment.properties` are kept once if identical and renamed with `suffix` otherwise.
+    """
+    if not source.is_dir():
+        return
+    destination.mkdir(parents=True, exist_ok=True)
+    for path in source.iterdir():
+        target = destination / path.name
+        if target.exists():
+            if filecmp.cmp(path, target, shallow=False):
+                continue
+            target = destination / f"{path.stem}-{suffix}{path.suffix}"
+        shutil.move(str(path), target)
+
+
+def write_shard_result(path: Path, reports: list):
+    """
+    Writes a worker's serialized test reports for the parent process.
+    """
+    Path(path).write_text(json.dumps({"reports": reports}), encoding="utf-8")
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,264 @@
+"""
+A content-addressed store for Allure results.
+
+Result files and attachments are written as objects named by the sha256 of their content,
+so identical screenshots or page sources are stored once however often they are attached.
+Large text payloads are gzip-compressed. Every file Allure writes is recorded as one line
+in an append-only manifest, written by a single background thread.
+
+`export` turns the store back into a regular Allure results directory. It only writes
+the files that are new or changed since the previous export (uncompressed objects are
+hard-linked, not copied), so the report can be regenerated without rewriting everything:
+
+    python -m utils.results_store export .allure-store allure-results
+    python -m utils.results_store gc .allure-store
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import queue
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import allure_commons
+from allure_commons import hookimpl
+from allure_commons.logger import AllureFileLogger
+from attr import asdict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = "manifest.jsonl"
+EXPORT_STATE_FILE = ".store-export.json"
+COMPRESS_THRESHOLD = 32 * 1024
+# Images and videos are compressed already; gzip would only cost time
+COMPRESSIBLE_SUFFIXES = {".json", ".html", ".txt", ".xml", ".csv", ".tsv", ".uri", ".yaml", ".svg", ".properties"}
+
+
+class ResultsStore:
+    """
+    Objects by content hash plus a manifest mapping Allure file names to objects.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.manifest = self.root / MANIFEST_FILE
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._pending = []
+
+    def reset_manifest(self):
+        """
+        Starts a new set of results; objects are kept so later runs still deduplicate against them.
+        """
+        self.manifest.write_text("", encoding="utf-8")
+
+    def put(self, name: str, data: bytes) -> dict:
+        """
+        Stores `data` as Allure file `name` and returns its manifest entry.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        compress = len(data) >= COMPRESS_THRESHOLD and Path(name).suffix in COMPRESSIBLE_SUFFIXES
+        path = self._object_path(digest, compress)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_file = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_file.write_bytes(gzip.compress(data, compresslevel=6, mtime=0) if compress else data)
+            os.replace(tmp_file, path)
+        entry = {"name": name, "sha256": digest, "size": len(data), "gzip": compress}
+        self._pending.append(json.dumps(entry) + "\n")
+        return entry
+
+    def flush(self):
+        """
+        Appends the pending manifest lines with a single write.
+        """
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode("utf-8")
+        self._pending = []
+        # O_APPEND with one write() keeps lines whole when several worker processes share the store
+        fd = os.open(self.manifest, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def entries(self) -> dict:
+        """
+        Returns the latest manifest entry per Allure file name.
+        """
+        entries = {}
+        try:
+            with open(self.manifest, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["name"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def export(self, destination: Path, clean: bool = False) -> tuple[int, int]:
+        """
+        Writes the stored results to an Allure results directory, skipping files exported before.
+
+        Returns the number of files written and skipped.
+        """
+        destination = Path(destination)
+        if clean and destination.is_dir():
+            shutil.rmtree(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        state_file = destination / EXPORT_STATE_FILE
+        try:
+            exported = json.loads(state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            exported = {}
+
+        written = skipped = 0
+        for name, entry in self.entries().items():
+            target = destination / name
+            if exported.get(name) == entry["sha256"] and target.exists():
+                skipped += 1
+                continue
+            source = self._object_path(entry["sha256"], entry["gzip"])
+            if target.exists():
+                target.unlink()
+            if entry["gzip"]:
+                with gzip.open(source, "rb") as compressed, open(target, "wb") as f:
+                    shutil.copyfileobj(compressed, f)
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    # Different file system; fall back to a copy
+                    shutil.copyfile(source, target)
+            exported[name] = entry["sha256"]
+            written += 1
+        state_file.write_text(json.dumps(exported), encoding="utf-8")
+        logger.info("Exported %d new or changed file(s) to %s, %d unchanged", written, destination, skipped)
+        return written, skipped
+
+    def gc(self) -> int:
+        """
+        Deletes the objects no manifest entry refers to and returns how many were deleted.
+        """
+        referenced = {self._object_path(e["sha256"], e["gzip"]) for e in self.entries().values()}
+        removed = 0
+        for path in self.objects.glob("*/*"):
+            if path not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def _object_path(self, digest: str, compressed: bool) -> Path:
+        return self.objects / digest[:2] / (f"{digest}.gz" if compressed else digest)
+
+
+class StoreFileLogger:
+    """
+    Allure reporter plugin that writes results and attachments into a ResultsStore.
+
+    It replaces allure's own file logger. The hooks only queue the data; one background
+    thread serializes, hashes, compresses and writes it.
+    """
+
+    def __init__(self, store: ResultsStore):
+        self.store = store
+        self._replaced = []
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write, name="allure-store", daemon=True)
+        self._thread.start()
+
+    def install(self):
+        """
+        Registers this logger in place of allure's file loggers.
+        """
+        self._replaced = [
+            plugin for plugin in allure_commons.plugin_manager.get_plugins() if isinstance(plugin, AllureFileLogger)
+        ]
+        for plugin in self._replaced:
+            allure_commons.plugin_manager.unregister(plugin)
+        allure_commons.plugin_manager.register(self)
+        return self
+
+    def uninstall(self):
+        """
+        Writes everything still queued and puts allure's file loggers back for allure's own cleanup.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        allure_commons.plugin_manager.unregister(self)
+        for plugin in self._replaced:
+            allure_commons.plugin_manager.register(plugin)
+
+    @hookimpl
+    def report_result(self, result):
+        self._report_item(result)
+
+    @hookimpl
+    def report_container(self, container):
+        self._report_item(container)
+
+    def add_file(self, file_name: str, data: bytes):
+        """
+        Queues an Allure file written elsewhere, e.g. by a distributed worker.
+        """
+        self._queue.put((file_name, data))
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        self.add_file(file_name, Path(source).read_bytes())
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        self.add_file(file_name, body.encode("utf-8") if isinstance(body, str) else body)
+
+    def _report_item(self, item):
+        # asdict copies the item on the calling thread; encoding happens on the writer thread
+        data = asdict(item, filter=lambda _, value: value or value is False)
+        self._queue.put((item.file_pattern.format(prefix=uuid.uuid4()), data))
+
+    def _write(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self.store.flush()
+                return
+            file_name, data = task
+            if isinstance(data, dict):
+                data = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            try:
+                self.store.put(file_name, data)
+            except OSError as e:
+                logger.error("Failed to store Allure file %s: %s", file_name, e)
+            if self._queue.empty():
+                self.store.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or clean up a content-addressed Allure results store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write new or changed results to an Allure results directory.")
+    export.add_argument("store", type=Path)
+    export.add_argument("destination", type=Path)
+    export.add_argument("--clean", action="store_true", help="Empty the destination first.")
+    gc = commands.add_parser("gc", help="Delete objects that are no longer referenced.")
+    gc.add_argument("store", type=Path)
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.store)
+    if args.command == "export":
+        written, skipped = store.export(args.destination, clean=args.clean)
+        print(f"{written} file(s) written, {skipped} unchanged")
+    else:
+        print(f"{store.gc()} unreferenced object(s) deleted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+In-place retries of idempotent page object steps.
+
+A step decorated with `retry_step` that fails with a transient WebDriver error (a wait
+timing out, a stale element, a click landing on an overlay) is run again after a short,
+growing pause, instead of failing the whole test. Only steps that can safely run twice
+may be decorated. Retries are counted per test, so the flaky-test tracker can tell a
+clean pass from a pass that needed retries.
+"""
+import functools
+import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRANSIENT_ERRORS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+# Errors after which another attempt cannot succeed
+FATAL_ERRORS = (InvalidSessionIdException, NoSuchWindowException)
+
+
+class StepRetries:
+    """
+    Counts the retried steps of the current test.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.steps = []
+
+    def reset(self):
+        self.count = 0
+        self.steps = []
+
+    def record(self, step: str):
+        self.count += 1
+        self.steps.append(step)
+
+
+step_retries = StepRetries()
+
+
+def retry_step(func=None, *, attempts: int = 3, backoff: float = 0.25, factor: float = 2.0,
+               exceptions: tuple = TRANSIENT_ERRORS):
+    """
+    Decorator that retries an idempotent step up to `attempts` times on `exceptions`.
+
+    The pause before the n-th retry is `backoff * factor ** (n - 1)` seconds. The element
+    cache and catalog index of the page are dropped before every retry, so no stale handle
+    or snapshot is reused.
+    """
+    if func is None:
+        return functools.partial(retry_step, attempts=attempts, backoff=backoff, factor=factor, exceptions=exceptions)
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except FATAL_ERRORS:
+                raise
+            except exceptions as e:
+                if attempt == attempts:
+                    logger.error("Step %s failed after %d attempt(s): %s", name, attempts, e.__class__.__name__)
+                    raise
+                delay = backoff * factor ** (attempt - 1)
+                logger.warning("Step %s failed with %s (attempt %d of %d), retrying in %.2fs",
+                               name, e.__class__.__name__, attempt, attempts, delay)
+                step_retries.record(name)
+                cache = getattr(args[0], "element_cache", None) if args else None
+                if cache is not None:
+                    cache.clear()
+                catalog = getattr(args[0], "catalog", None) if args else None
+                if catalog is not None:
+                    catalog.invalidate()
+                time.sleep(delay)
+
+    return wrapper
@@ -0,0 +1,122 @@
+import json
+import time
+from urllib.parse import urljoin, urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sauce Demo keeps the logged-in user in a cookie and the cart in localStorage
+SESSION_COOKIE = "session-username"
+CART_STORAGE_KEY = "cart-contents"
+SESSION_LIFETIME = 10 * 60
+
+INVENTORY_ITEM_IDS = {
+    "Sauce Labs Backpack": 4,
+    "Sauce Labs Bike Light": 0,
+    "Sauce Labs Bolt T-Shirt": 1,
+    "Sauce Labs Fleece Jacket": 5,
+    "Sauce Labs Onesie": 2,
+    "Test.allTheThings() T-Shirt (Red)": 3,
+}
+
+
+class SessionSeeder:
+    """
+    Puts the browser directly into a logged-in state with a prepared cart.
+
+    Instead of going through the login form and the inventory buttons, the session
+    cookie and the cart localStorage entry are injected and the target page is
+    opened with a single navigation.
+    """
+
+    def __init__(self, driver: WebDriver, base_url: str):
+        """
+        Initializes the seeder for the application served at `base_url`.
+        """
+        self.driver = driver
+        self.base_url = base_url
+
+    def open_inventory(self, username: str, items: list[str] = ()):
+        """
+        Opens the inventory page as `username` with `items` already in the cart.
+        """
+        from pages.inventory_page import InventoryPage
+        self._open("inventory.html", username, items)
+        page = InventoryPage(self.driver)
+        page.record_page_metrics()
+        return page
+
+    def open_cart(self, username: str, items: list[str] = ()):
+        """
+        Opens the cart page as `username` with `items` already in the cart.
+        """
+        from pages.cart_page import CartPage
+        self._open("cart.html", username, items)
+        page = CartPage(self.driver)
+        page.record_page_metrics()
+        return page
+
+    def open_checkout_step_one(self, username: str, items: list[str] = ()):
+        """
+        Opens the checkout information page as `username` with `items` already in the cart.
+        """
+        from pages.checkout_step_one_page import CheckoutStepOnePage
+        self._open("checkout-step-one.html", username, items)
+        page = CheckoutStepOnePage(self.driver)
+        page.record_page_metrics()
+        return page
+
+    def _open(self, path: str, username: str, items: list[str]):
+        url = urljoin(self.base_url, path)
+        cart = json.dumps([cart_item_id(name) for name in items])
+        logger.info("Seeding session for '%s' with cart %s and opening %s", username, cart, url)
+        try:
+            self._seed_with_cdp(url, username, cart)
+        except (AttributeError, WebDriverException) as e:
+            logger.info("CDP seeding unavailable (%s), falling back to two navigations", e.__class__.__name__)
+            self._seed_with_navigation(url, username, cart)
+
+    def _seed_with_cdp(self, url: str, username: str, cart: str):
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(self.base_url))
+        self.driver.execute_cdp_cmd("Network.setCookie", {
+            "name": SESSION_COOKIE,
+            "value": username,
+            "url": self.base_url,
+            "expires": time.time() + SESSION_LIFETIME,
+        })
+        # Runs before the app's own scripts on the next document, so the cart is in place when it renders
+        script = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            "source": f"if (location.origin === {json.dumps(origin)}) "
+                      f"localStorage.setItem({json.dumps(CART_STORAGE_KEY)}, {json.dumps(cart)});"
+        })
+        try:
+            self.driver.get(url)
+        finally:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]}
+            )
+
+    def _seed_with_navigation(self, url: str, username: str, cart: str):
+        self.driver.get(self.base_url)
+        self.driver.add_cookie({
+            "name": SESSION_COOKIE,
+            "value": username,
+            "path": "/",
+            "expiry": int(time.time() + SESSION_LIFETIME),
+        })
+        self.driver.execute_script("localStorage.setItem(arguments[0], arguments[1]);", CART_STORAGE_KEY, cart)
+        self.driver.get(url)
+
+
+def cart_item_id(item_name: str) -> int:
+    """
+    Returns the id Sauce Demo uses for `item_name` in the cart localStorage entry.
+    """
+    try:
+        return INVENTORY_ITEM_IDS[item_name]
+    except KeyError:
+        raise ValueError(f"Unknown inventory item: '{item_name}'") from None
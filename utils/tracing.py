@@ -0,0 +1,235 @@
+"""
+Timed spans around page object actions.
+
+`traced` wraps a method in a span named after it (e.g. `LoginPage.login`). Spans nest,
+count the WebDriver commands sent while they are open and keep the time spent in
+explicit waits apart from the rest of the action. When tracing is enabled the spans
+are exported as Chrome trace-event JSON (open it in chrome://tracing or Perfetto) and
+summarized per method as p50/p95/max.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Span:
+    """
+    A finished or running timed section of a test.
+    """
+    name: str
+    category: str
+    start: int
+    test_id: str | None = None
+    duration: int = 0
+    commands: int = 0
+    wait: int = 0
+    thread_id: int = field(default_factory=threading.get_ident)
+
+    @property
+    def action(self) -> int:
+        """
+        Time spent outside explicit waits, in nanoseconds.
+        """
+        return max(0, self.duration - self.wait)
+
+
+class Tracer:
+    """
+    Collects spans for the whole session. Disabled (and nearly free) until `enable()` is called.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.test_id = None
+        self.spans = []
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        """
+        Starts recording spans and counting WebDriver commands.
+        """
+        if not self.enabled:
+            self.enabled = True
+            _install_command_counter()
+        return self
+
+    def span(self, name: str, category: str = "page"):
+        """
+        Returns a context manager timing the code inside it as a span.
+        """
+        return _SpanContext(self, name, category)
+
+    def count_command(self):
+        """
+        Adds one WebDriver command to every span open on the current thread.
+        """
+        for span in self._stack():
+            span.commands += 1
+
+    def current_action(self) -> str | None:
+        """
+        Returns the name of the innermost page object method running on the current thread, if any.
+        """
+        for span in reversed(self._stack()):
+            if span.category == "page":
+                return span.name
+        return None
+
+    def summary(self) -> list[dict]:
+        """
+        Returns count, p50, p95, max (ms), mean WebDriver commands and wait share per span name.
+        """
+        by_name = {}
+        for span in self.spans:
+            if span.category != "wait":
+                by_name.setdefault(span.name, []).append(span)
+        rows = []
+        for name, spans in sorted(by_name.items()):
+            durations = sorted(span.duration / 1e6 for span in spans)
+            total = sum(span.duration for span in spans)
+            rows.append({
+                "name": name,
+                "count": len(spans),
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p95_ms": round(percentile(durations, 95), 2),
+                "max_ms": round(durations[-1], 2),
+                "commands": round(sum(span.commands for span in spans) / len(spans), 1),
+                "wait_share": round(sum(span.wait for span in spans) / total, 2) if total else 0.0,
+            })
+        return rows
+
+    def format_summary(self) -> str:
+        """
+        Renders `summary()` as a plain-text table, slowest p95 first.
+        """
+        rows = sorted(self.summary(), key=lambda row: row["p95_ms"], reverse=True)
+        width = max([len(row["name"]) for row in rows] + [len("span")])
+        lines = [f"{'span':<{width}}  {'count':>5}  {'p50 ms':>9}  {'p95 ms':>9}  {'max ms':>9}  {'cmds':>6}  {'wait':>5}"]
+        for row in rows:
+            lines.append(
+                f"{row['name']:<{width}}  {row['count']:>5}  {row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}  "
+                f"{row['max_ms']:>9.2f}  {row['commands']:>6.1f}  {row['wait_share']:>5.0%}"
+            )
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """
+        Writes all spans to `path` in the Chrome trace-event format.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self._origin) / 1000,
+                "dur": span.duration / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    "test": span.test_id,
+                    "commands": span.commands,
+                    "wait_ms": round(span.wait / 1e6, 3),
+                    "action_ms": round(span.action / 1e6, 3),
+                },
+            }
+            for span in self.spans
+        ]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info("Wrote %d span(s) to %s", len(events), path)
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class _SpanContext:
+
+    def __init__(self, tracer: Tracer, name: str, category: str):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.span = None
+
+    def __enter__(self):
+        if self.tracer.enabled:
+            self.span = Span(self.name, self.category, time.perf_counter_ns(), self.tracer.test_id)
+            self.tracer._stack().append(self.span)
+        return self.span
+
+    def __exit__(self, *exc_info):
+        span = self.span
+        if span is None:
+            return False
+        span.duration = time.perf_counter_ns() - span.start
+        stack = self.tracer._stack()
+        stack.remove(span)
+        if span.category == "wait":
+            for parent in stack:
+                parent.wait += span.duration
+        self.tracer.spans.append(span)
+        return False
+
+
+tracer = Tracer()
+
+
+def traced(func=None, *, category: str = "page"):
+    """
+    Decorator that records every call of `func` as a span named after its qualified name.
+    """
+    if func is None:
+        return functools.partial(traced, category=category)
+    if getattr(func, "__traced__", False):
+        return func
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+        with tracer.span(name, category):
+            return func(*args, **kwargs)
+
+    wrapper.__traced__ = True
+    return wrapper
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """
+    Returns the nearest-rank `q`th percentile of an ascending list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _install_command_counter():
+    execute = WebDriver.execute
+    if getattr(execute, "__traced__", False):
+        return
+
+    @functools.wraps(execute)
+    def counting_execute(self, driver_command, params=None):
+        tracer.count_command()
+        return execute(self, driver_command, params)
+
+    counting_execute.__traced__ = True
+    WebDriver.execute = counting_execute
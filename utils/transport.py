@@ -0,0 +1,159 @@
+"""
+The HTTP transport between the page objects and chromedriver.
+
+Every WebDriver command is one HTTP request to chromedriver. `tune_transport` replaces
+selenium's default connection manager with a keep-alive pool sized for the suite (the
+test thread plus the background threads that capture artifacts or reset pooled sessions)
+that never retries a command whose request may have reached the driver. The pool also
+counts the commands, the bytes sent and received and the round-trip time per test and,
+when page object spans are being traced, per page object method.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+import urllib3
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+from utils.tracing import tracer
+
+logger = get_logger(__name__)
+
+POOL_SIZE = 4
+
+
+@dataclass
+class CommandCounters:
+    """
+    WebDriver commands, bytes and round-trip time of one test or page object method.
+    """
+    commands: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    round_trip_ms: float = 0.0
+
+    def add(self, sent: int, received: int, seconds: float):
+        self.commands += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.round_trip_ms += seconds * 1000
+
+    def as_dict(self) -> dict:
+        counters = asdict(self)
+        counters["round_trip_ms"] = round(self.round_trip_ms, 2)
+        return counters
+
+
+class TransportStats:
+    """
+    Counts the WebDriver commands of the current test and of every traced page object method.
+
+    Commands sent by other threads than the test's (pool warm-up, session resets) are
+    counted as background traffic instead of being charged to the test.
+    """
+
+    def __init__(self):
+        self.test = CommandCounters()
+        self.background = CommandCounters()
+        self.by_test = {}
+        self.by_method = {}
+        self._test_thread = None
+        self._lock = threading.Lock()
+
+    def start_test(self, nodeid: str):
+        """
+        Starts charging the commands of the calling thread to test `nodeid`.
+        """
+        with self._lock:
+            self.test = self.by_test[nodeid] = CommandCounters()
+            self._test_thread = threading.get_ident()
+
+    def stop_test(self):
+        with self._lock:
+            self.test = CommandCounters()
+            self._test_thread = None
+
+    def record(self, sent: int, received: int, seconds: float):
+        """
+        Adds one command to the counters of its test and page object method.
+        """
+        action = tracer.current_action() if tracer.enabled else None
+        with self._lock:
+            if threading.get_ident() != self._test_thread:
+                self.background.add(sent, received, seconds)
+                return
+            self.test.add(sent, received, seconds)
+            if action is not None:
+                self.by_method.setdefault(action, CommandCounters()).add(sent, received, seconds)
+
+    def format_summary(self, limit: int = 10) -> str:
+        """
+        Renders the chattiest page object methods and tests as plain-text tables.
+        """
+        lines = []
+        if self.by_method:
+            rows = sorted(self.by_method.items(), key=lambda item: item[1].commands, reverse=True)[:limit]
+            width = max(len(name) for name, _ in rows)
+            lines.append(f"{'page object method':<{width}}  {'cmds':>6}  {'sent KiB':>9}  {'recv KiB':>9}  {'rtt ms':>9}")
+            for name, counters in rows:
+                lines.append(self._row(name, width, counters))
+        if self.by_test:
+            rows = sorted(self.by_test.items(), key=lambda item: item[1].commands, reverse=True)[:limit]
+            width = max(len(nodeid) for nodeid, _ in rows)
+            lines.append(f"{'test':<{width}}  {'cmds':>6}  {'sent KiB':>9}  {'recv KiB':>9}  {'rtt ms':>9}")
+            for nodeid, counters in rows:
+                lines.append(self._row(nodeid, width, counters))
+        if self.background.commands:
+            lines.append(f"background (pool warm-up and session resets): {self.background.commands} command(s), "
+                         f"{self.background.round_trip_ms:.0f} ms")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _row(name: str, width: int, counters: CommandCounters) -> str:
+        return (f"{name:<{width}}  {counters.commands:>6}  {counters.bytes_sent / 1024:>9.1f}  "
+                f"{counters.bytes_received / 1024:>9.1f}  {counters.round_trip_ms:>9.1f}")
+
+
+transport_stats = TransportStats()
+
+
+class CountingPoolManager(urllib3.PoolManager):
+    """
+    A keep-alive connection pool that reports every request to `transport_stats`.
+    """
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        body = kw.get("body")
+        started = time.perf_counter()
+        response = super().urlopen(method, url, redirect=redirect, **kw)
+        # selenium reads the whole body anyway; preloading it here makes the round trip complete
+        received = len(response.data or b"")
+        sent = len(body.encode("utf-8") if isinstance(body, str) else body or b"")
+        transport_stats.record(sent, received, time.perf_counter() - started)
+        return response
+
+
+def tune_transport(driver: WebDriver, pool_size: int = POOL_SIZE) -> WebDriver:
+    """
+    Puts the driver's commands on a counting keep-alive pool of `pool_size` connections.
+
+    Drivers that talk to chromedriver through a proxy keep selenium's own connection manager.
+    """
+    executor = driver.command_executor
+    if getattr(executor, "_proxy_url", None):
+        logger.info("Keeping selenium's connection manager for the proxied driver connection")
+        return driver
+    previous = getattr(executor, "_conn", None)
+    executor._conn = CountingPoolManager(
+        num_pools=1,
+        maxsize=pool_size,
+        block=True,
+        timeout=executor.get_timeout(),
+        # Reconnecting is safe, re-sending a command that may have been executed is not
+        retries=urllib3.Retry(total=2, connect=2, read=0, status=0, other=0, redirect=2),
+    )
+    executor.keep_alive = True
+    if previous is not None:
+        previous.clear()
+    return driver
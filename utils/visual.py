@@ -0,0 +1,245 @@
+"""
+Visual regression checks of pages and elements against stored baseline screenshots.
+
+Screenshots are decoded into NumPy arrays and compared in one vectorized pass: the
+difference of every pixel is measured in the YIQ color space (luma weighted highest, as
+in pixelmatch), so changes the eye barely sees stay under `pixel_threshold` while real
+changes count. Regions with dynamic content are masked out by locator. A check fails
+when more than `max_diff_ratio` of the compared pixels changed; the expected, actual and
+diff images are then attached to Allure. A missing baseline fails the check: baselines are
+only written when the run is asked to record them.
+
+NumPy and Pillow are optional; without them visual checks are skipped with a warning.
+"""
+import io
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import allure
+from allure_commons.types import AttachmentType
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.logger import get_logger
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # Visual checks are optional
+    np = None
+    Image = None
+
+logger = get_logger(__name__)
+
+BASELINE_DIR = "visual_baselines"
+# Largest possible YIQ distance between two colors
+MAX_YIQ_DELTA = 35215.0
+
+# Returns the device pixel ratio, the clip origin and the rectangles (CSS pixels) of all masked elements
+MASK_SCRIPT = """
+var locators = arguments[0], clip = arguments[1];
+function find(by, value) {
+    if (by === 'xpath') {
+        var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+        return nodes;
+    }
+    var selector = {
+        'id': '[id="' + value + '"]',
+        'name': '[name="' + value + '"]',
+        'class name': '.' + (window.CSS && CSS.escape ? CSS.escape(value) : value),
+        'tag name': value,
+        'css selector': value
+    }[by];
+    return Array.prototype.slice.call(document.querySelectorAll(selector));
+}
+var origin = clip ? clip.getBoundingClientRect() : {left: 0, top: 0};
+var rects = [];
+locators.forEach(function (locator) {
+    find(locator[0], locator[1]).forEach(function (el) {
+        var r = el.getBoundingClientRect();
+        rects.push([r.left - origin.left, r.top - origin.top, r.width, r.height]);
+    });
+});
+return {ratio: window.devicePixelRatio || 1, rects: rects};
+"""
+
+
+@dataclass
+class VisualDiff:
+    """
+    The outcome of comparing a screenshot with its baseline.
+    """
+    changed_pixels: int
+    compared_pixels: int
+    diff_png: bytes | None = None
+
+    @property
+    def ratio(self) -> float:
+        return self.changed_pixels / self.compared_pixels if self.compared_pixels else 0.0
+
+
+if np is not None:
+    YIQ = np.array([
+        [0.29889531, 0.58662247, 0.11448223],
+        [0.59597799, -0.27417610, -0.32180189],
+        [0.21147017, -0.52261711, 0.31114694],
+    ], dtype=np.float32)
+    YIQ_WEIGHTS = np.array([0.5053, 0.299, 0.1957], dtype=np.float32)
+
+
+def decode_png(data: bytes):
+    """
+    Decodes PNG bytes into an RGBA array of shape (height, width, 4).
+
+    Four bytes per pixel let `compare` test whole pixels for equality as 32-bit integers.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        return np.ascontiguousarray(image.convert("RGBA"))
+
+
+def encode_png(pixels) -> bytes:
+    """
+    Encodes an RGB or RGBA array as PNG, favouring speed over size.
+    """
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def mask_array(shape: tuple, rects: list, scale: float):
+    """
+    Returns a boolean (height, width) array that is True inside the CSS pixel rectangles.
+    """
+    mask = np.zeros(shape[:2], dtype=bool)
+    for left, top, width, height in rects:
+        x0, y0 = max(0, int(left * scale)), max(0, int(top * scale))
+        x1, y1 = int(np.ceil((left + width) * scale)), int(np.ceil((top + height) * scale))
+        mask[y0:y1, x0:x1] = True
+    return mask
+
+
+def compare(actual, expected, mask=None, pixel_threshold: float = 0.1, with_diff: bool = True) -> VisualDiff:
+    """
+    Counts the pixels whose perceptual difference exceeds `pixel_threshold` (0..1), ignoring masked pixels.
+
+    Both images are RGBA arrays as returned by `decode_png`.
+    """
+    if actual.shape != expected.shape:
+        pixels = max(actual.shape[0] * actual.shape[1], expected.shape[0] * expected.shape[1])
+        return VisualDiff(pixels, pixels, encode_png(actual) if with_diff else None)
+    # Only the pixels that differ at all are converted, which is usually a small fraction of the frame
+    changed = actual.view(np.uint32)[..., 0] != expected.view(np.uint32)[..., 0]
+    rows, columns = np.nonzero(changed)
+    delta = actual[rows, columns, :3].astype(np.float32) - expected[rows, columns, :3].astype(np.float32)
+    # RGB -> YIQ of the difference; the conversion is linear, so it can be applied to the delta
+    yiq = delta @ YIQ.T
+    distance = yiq * yiq @ YIQ_WEIGHTS
+    changed[rows, columns] = distance > MAX_YIQ_DELTA * pixel_threshold * pixel_threshold
+    compared = changed.size
+    if mask is not None:
+        changed &= ~mask
+        compared -= int(mask.sum())
+    changed_pixels = int(changed.sum())
+    diff_png = None
+    if with_diff and changed_pixels:
+        # Faded grayscale baseline with the changed pixels in red and the masked regions in blue
+        gray = (expected[..., :3].astype(np.uint16) @ np.array([77, 150, 29], dtype=np.uint16) >> 8).astype(np.uint8)
+        faded = (255 - (255 - gray) // 4)[..., None].repeat(3, axis=2)
+        if mask is not None:
+            faded[mask] = (200, 200, 255)
+        faded[changed] = (255, 0, 0)
+        diff_png = encode_png(faded)
+    return VisualDiff(changed_pixels, compared, diff_png)
+
+
+class VisualChecker:
+    """
+    Compares screenshots with the baselines in `baseline_dir`, or records them when `update` is set.
+    """
+
+    def __init__(self, baseline_dir: Path = Path(BASELINE_DIR), update: bool = False,
+                 pixel_threshold: float = 0.1, max_diff_ratio: float = 0.001):
+        self.configure(baseline_dir, update, pixel_threshold, max_diff_ratio)
+        self._warned = False
+
+    def configure(self, baseline_dir: Path, update: bool, pixel_threshold: float, max_diff_ratio: float):
+        """
+        Sets where baselines live, whether to overwrite them, and the default tolerances.
+        """
+        self.baseline_dir = Path(baseline_dir)
+        self.update = update
+        self.pixel_threshold = pixel_threshold
+        self.max_diff_ratio = max_diff_ratio
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def check(self, driver: WebDriver, name: str, element: WebElement | None = None, masks=(),
+              max_diff_ratio: float | None = None):
+        """
+        Compares the page (or `element`) with baseline `name` and raises AssertionError if it changed.
+
+        `masks` are locators of dynamic regions to ignore.
+        """
+        if not self.available:
+            if not self._warned:
+                logger.warning("NumPy or Pillow is not installed, skipping visual checks")
+                self._warned = True
+            return None
+        max_diff_ratio = self.max_diff_ratio if max_diff_ratio is None else max_diff_ratio
+        png = element.screenshot_as_png if element is not None else driver.get_screenshot_as_png()
+        baseline_file = self.baseline_dir / f"{_file_name(name)}.png"
+        if self.update:
+            self._save_baseline(baseline_file, png)
+            logger.info("Recorded visual baseline '%s'", baseline_file)
+            allure.attach(png, name=f"{name} (new baseline)", attachment_type=AttachmentType.PNG)
+            return None
+        if not baseline_file.exists():
+            allure.attach(png, name=f"{name} (actual)", attachment_type=AttachmentType.PNG)
+            raise AssertionError(
+                f"Visual check '{name}' has no baseline at {baseline_file}; record it with "
+                f"--update-visual-baselines and commit it"
+            )
+        baseline_png = baseline_file.read_bytes()
+        if png == baseline_png:
+            # Chrome encodes identical frames identically, so nothing needs to be decoded
+            logger.info("Visual check '%s': identical to the baseline", name)
+            return VisualDiff(0, 0)
+
+        actual, expected = decode_png(png), decode_png(baseline_png)
+        mask = None
+        if masks:
+            layout = driver.execute_script(MASK_SCRIPT, [list(locator) for locator in masks], element)
+            mask = mask_array(actual.shape, layout["rects"], layout["ratio"])
+        diff = compare(actual, expected, mask, self.pixel_threshold, with_diff=False)
+        logger.info("Visual check '%s': %d of %d pixel(s) changed (%.4f%%)",
+                    name, diff.changed_pixels, diff.compared_pixels, diff.ratio * 100)
+        if diff.ratio > max_diff_ratio:
+            allure.attach(baseline_png, name=f"{name} (expected)", attachment_type=AttachmentType.PNG)
+            allure.attach(png, name=f"{name} (actual)", attachment_type=AttachmentType.PNG)
+            diff = compare(actual, expected, mask, self.pixel_threshold)
+            if diff.diff_png is not None:
+                allure.attach(diff.diff_png, name=f"{name} (diff)", attachment_type=AttachmentType.PNG)
+            raise AssertionError(
+                f"Visual check '{name}' failed: {diff.ratio:.3%} of the pixels changed "
+                f"(allowed {max_diff_ratio:.3%}); see the diff attached to the report"
+            )
+        return diff
+
+    @staticmethod
+    def _save_baseline(path: Path, png: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(png)
+        os.replace(tmp_file, path)
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+visual = VisualChecker()
@@ -0,0 +1,416 @@
+"""
+A watchdog for the browser processes started by the suite.
+
+chromedriver is launched with the owning pytest process and a session id in its
+environment, which Chrome and every renderer inherit, so the processes of a run and of
+each session can be told apart from anything else on the machine, even after the run
+died or Chrome was reparented because chromedriver died. The watchdog:
+
+- reaps orphans: at session start it kills tagged processes whose run is gone (a crash or
+  an interrupted run never reached `driver.quit()`), at session end whatever its own run
+  left behind;
+- samples the RSS and CPU time of every tracked session's processes in the background
+  and flags a session that exceeds `max_rss_mb`, or `max_cpu_percent` for several samples
+  in a row, so the driver pool recycles it instead of handing it out again;
+- logs the peak RSS of the browser during every test.
+
+Process data is read from /proc, or through psutil (install it separately) where there is
+no /proc.
+"""
+import functools
+import os
+import signal
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.logger import get_logger
+
+try:
+    import psutil
+except ImportError:  # Only needed where there is no /proc
+    psutil = None
+
+logger = get_logger(__name__)
+
+OWNER_ENV = "TMSQA_BROWSER_OWNER"
+SESSION_ENV = "TMSQA_BROWSER_SESSION"
+PROC_DIR = Path("/proc")
+# Consecutive samples above the CPU cap before a session is flagged; page loads spike briefly
+CPU_SAMPLES = 5
+MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """
+    One process: parent, resident memory in bytes, CPU time in seconds and an opaque start time.
+    """
+    ppid: int
+    rss: int
+    cpu: float
+    started: float
+
+
+@dataclass
+class SessionUsage:
+    """
+    The resource usage of one browser session: chromedriver, everything below it and every process tagged with it.
+    """
+    root: int
+    tag: str | None = None
+    rss: int = 0
+    peak_rss: int = 0
+    cpu_percent: float = 0.0
+    busy_samples: int = 0
+    exceeded: str | None = None
+    _cpu: float | None = None
+    _sampled_at: float | None = None
+
+
+def available() -> bool:
+    """
+    Tells whether process data can be read on this machine.
+    """
+    return PROC_DIR.joinpath("self").is_dir() or psutil is not None
+
+
+def read_process(pid: int) -> ProcessInfo | None:
+    """
+    Returns the current state of process `pid`, or None if it is gone or not readable.
+    """
+    if PROC_DIR.joinpath("self").is_dir():
+        try:
+            stat = (PROC_DIR / str(pid) / "stat").read_text()
+        except OSError:
+            return None
+        # The command name in parentheses may contain spaces; the numeric fields follow it
+        fields = stat[stat.rindex(")") + 2:].split()
+        return ProcessInfo(
+            ppid=int(fields[1]),
+            rss=int(fields[21]) * _page_size(),
+            cpu=(int(fields[11]) + int(fields[12])) / _clock_ticks(),
+            started=float(fields[19]),
+        )
+    try:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            cpu = process.cpu_times()
+            return ProcessInfo(process.ppid(), process.memory_info().rss, cpu.user + cpu.system, process.create_time())
+    except psutil.Error:
+        return None
+
+
+def process_table() -> dict[int, ProcessInfo]:
+    """
+    Returns every readable process by pid.
+    """
+    if PROC_DIR.joinpath("self").is_dir():
+        pids = [int(entry.name) for entry in os.scandir(PROC_DIR) if entry.name.isdigit()]
+    else:
+        pids = psutil.pids()
+    table = {}
+    for pid in pids:
+        info = read_process(pid)
+        if info is not None:
+            table[pid] = info
+    return table
+
+
+def process_tags(pid: int) -> tuple[str | None, str | None]:
+    """
+    Returns the run (see `owner_tag`) and the browser session that started process `pid`.
+
+    Both are None for processes of other origins.
+    """
+    if PROC_DIR.joinpath("self").is_dir():
+        try:
+            variables = (PROC_DIR / str(pid) / "environ").read_bytes().split(b"\0")
+        except OSError:
+            return None, None
+        environment = dict(variable.decode(errors="replace").partition("=")[::2] for variable in variables
+                           if variable.startswith(b"TMSQA_"))
+    else:
+        try:
+            environment = psutil.Process(pid).environ()
+        except psutil.Error:
+            return None, None
+    return environment.get(OWNER_ENV), environment.get(SESSION_ENV)
+
+
+@functools.lru_cache(maxsize=None)
+def owner_tag() -> str:
+    """
+    Identifies this pytest process by pid and start time, so a reused pid is not mistaken for it.
+    """
+    info = read_process(os.getpid()) if available() else None
+    return f"{os.getpid()}:{info.started if info else 0}"
+
+
+def owner_environment() -> dict:
+    """
+    The environment to launch chromedriver with, tagged with the owning run and a new session id.
+    """
+    return {**os.environ, OWNER_ENV: owner_tag(), SESSION_ENV: uuid.uuid4().hex}
+
+
+def _owner_alive(tag: str, table: dict[int, ProcessInfo]) -> bool:
+    pid, _, started = tag.partition(":")
+    info = table.get(int(pid)) if pid.isdigit() else None
+    return info is not None and str(info.started) == started
+
+
+def _descendants(root: int, children: dict[int, list[int]]) -> list[int]:
+    pids, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, ()))
+    return pids
+
+
+def _kill(pid: int):
+    if psutil is not None:
+        try:
+            psutil.Process(pid).kill()
+        except psutil.Error:
+            pass
+        return
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        # Already gone
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _page_size() -> int:
+    return os.sysconf("SC_PAGE_SIZE")
+
+
+@functools.lru_cache(maxsize=None)
+def _clock_ticks() -> int:
+    return os.sysconf("SC_CLK_TCK")
+
+
+class BrowserWatchdog:
+    """
+    Pytest plugin that watches the process trees of the tracked browser sessions.
+
+    `max_rss_mb` and `max_cpu_percent` (of one core, summed over the tree) of 0 disable that cap.
+    """
+
+    def __init__(self, max_rss_mb: int = 2048, max_cpu_percent: float = 200, interval: float = 1.0):
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.interval = interval
+        self.peaks = {}
+        self.recycled = 0
+        self.reaped = 0
+        self._sessions = {}
+        # pid -> (start time, session tag), so the environment of a process is read only once
+        self._tags = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def available(self) -> bool:
+        return available()
+
+    def track(self, driver: WebDriver):
+        """
+        Starts watching the processes of a local chromedriver session.
+        """
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is None or not self.available:
+            return
+        tag = (getattr(service, "env", None) or {}).get(SESSION_ENV)
+        with self._lock:
+            self._sessions[id(driver)] = SessionUsage(root=process.pid, tag=tag)
+
+    def untrack(self, driver: WebDriver):
+        """
+        Stops watching a session that has been quit, killing whatever of it survived the quit.
+        """
+        with self._lock:
+            usage = self._sessions.pop(id(driver), None)
+        if usage is None or usage.tag is None:
+            return
+        leftovers = [pid for pid in process_table() if process_tags(pid)[1] == usage.tag]
+        for pid in leftovers:
+            _kill(pid)
+        if leftovers:
+            logger.warning("Killed %d process(es) that outlived their browser session", len(leftovers))
+            self.reaped += len(leftovers)
+
+    def exceeded(self, driver: WebDriver) -> str | None:
+        """
+        Returns why the session went over its caps, or None if it did not (or is not tracked).
+        """
+        with self._lock:
+            usage = self._sessions.get(id(driver))
+            return usage.exceeded if usage else None
+
+    def rss(self, driver: WebDriver) -> int | None:
+        """
+        Measures the session now and returns the RSS of its processes in bytes, or None if it is not tracked.
+        """
+        if id(driver) not in self._sessions:
+            return None
+        self.sample()
+        with self._lock:
+            usage = self._sessions.get(id(driver))
+            return usage.rss if usage else None
+
+    def start_test(self, driver: WebDriver):
+        """
+        Starts measuring the browser's peak memory for the current test.
+        """
+        with self._lock:
+            usage = self._sessions.get(id(driver))
+            if usage is not None:
+                usage.peak_rss = usage.rss
+
+    def stop_test(self, nodeid: str, driver: WebDriver):
+        """
+        Records and logs the browser's peak memory during test `nodeid`.
+        """
+        if id(driver) not in self._sessions:
+            return
+        self.sample()
+        with self._lock:
+            usage = self._sessions.get(id(driver))
+            if usage is None:
+                return
+            peak = self.peaks[nodeid] = usage.peak_rss
+        logger.info("Browser peak RSS during %s: %.0f MiB", nodeid, peak / MIB)
+
+    def record_recycle(self, reason: str):
+        self.recycled += 1
+        logger.warning("Recycling browser session: %s", reason)
+
+    def sample(self):
+        """
+        Measures every tracked session once and flags the ones over their caps.
+        """
+        with self._lock:
+            if not self._sessions:
+                return
+        table = process_table()
+        children = {}
+        for pid, info in table.items():
+            children.setdefault(info.ppid, []).append(pid)
+        tags = self._session_tags(table)
+        now = time.monotonic()
+        with self._lock:
+            for usage in self._sessions.values():
+                pids = set(_descendants(usage.root, children))
+                # Chrome is reparented when chromedriver dies, but keeps the session tag
+                pids.update(pid for pid, tag in tags.items() if tag is not None and tag == usage.tag)
+                tree = [table[pid] for pid in pids if pid in table]
+                usage.rss = sum(info.rss for info in tree)
+                usage.peak_rss = max(usage.peak_rss, usage.rss)
+                cpu = sum(info.cpu for info in tree)
+                if usage._cpu is not None and now > usage._sampled_at:
+                    # Exited children take their CPU time with them, so the delta can be negative
+                    usage.cpu_percent = max(0.0, cpu - usage._cpu) / (now - usage._sampled_at) * 100
+                usage._cpu, usage._sampled_at = cpu, now
+                self._check_caps(usage)
+
+    def reap_orphans(self, include_own: bool = False) -> int:
+        """
+        Kills tagged browser processes whose run is gone and, with `include_own`, those of this run.
+        """
+        if not self.available:
+            return 0
+        table = process_table()
+        own = owner_tag()
+        victims = []
+        for pid in table:
+            if pid == os.getpid():
+                continue
+            owner, _ = process_tags(pid)
+            if owner is None:
+                continue
+            if (owner == own and include_own) or (owner != own and not _owner_alive(owner, table)):
+                victims.append(pid)
+        for pid in victims:
+            _kill(pid)
+        if victims:
+            logger.warning("Reaped %d leftover browser process(es)", len(victims))
+        self.reaped += len(victims)
+        return len(victims)
+
+    def start(self):
+        """
+        Starts sampling in the background every `interval` seconds.
+        """
+        if not self.available:
+            logger.warning("Neither /proc nor psutil is available, the browser watchdog is disabled")
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="browser-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def pytest_sessionstart(self):
+        self.reap_orphans()
+        self.start()
+
+    def pytest_sessionfinish(self):
+        # Session fixtures, including the driver pool, have been torn down by now
+        self.stop()
+        self.reap_orphans(include_own=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.peaks and not self.recycled and not self.reaped:
+            return
+        terminalreporter.section("browser processes")
+        for nodeid, peak in sorted(self.peaks.items(), key=lambda item: item[1], reverse=True)[:10]:
+            terminalreporter.write_line(f"{nodeid}: peak {peak / MIB:.0f} MiB")
+        terminalreporter.write_line(
+            f"{self.recycled} session(s) recycled over their caps, {self.reaped} orphaned process(es) reaped"
+        )
+
+    def _session_tags(self, table: dict[int, ProcessInfo]) -> dict[int, str | None]:
+        tags = {}
+        for pid, info in table.items():
+            cached = self._tags.get(pid)
+            if cached is None or cached[0] != info.started:
+                cached = self._tags[pid] = (info.started, process_tags(pid)[1])
+            tags[pid] = cached[1]
+        for pid in self._tags.keys() - table.keys():
+            del self._tags[pid]
+        return tags
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("Browser watchdog sample failed: %s", e)
+
+    def _check_caps(self, usage: SessionUsage):
+        if usage.exceeded is not None:
+            return
+        if self.max_rss_mb and usage.rss > self.max_rss_mb * MIB:
+            usage.exceeded = f"RSS {usage.rss / MIB:.0f} MiB over the {self.max_rss_mb} MiB cap"
+        if self.max_cpu_percent:
+            usage.busy_samples = usage.busy_samples + 1 if usage.cpu_percent > self.max_cpu_percent else 0
+            if usage.busy_samples >= CPU_SAMPLES:
+                usage.exceeded = (f"CPU above {self.max_cpu_percent:.0f}% for {usage.busy_samples} samples "
+                                  f"(now {usage.cpu_percent:.0f}%)")
+        if usage.exceeded is not None:
+            logger.warning("Browser session %d exceeded its caps: %s", usage.root, usage.exceeded)